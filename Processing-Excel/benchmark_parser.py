@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+单元格解析微基准测试
+对随附的工作簿中所有文本单元格，比较旧的逐项正则解析与合并词法分析器的吞吐量（单元格/秒）
+
+用法: python benchmark_parser.py [xlsx文件 ...]
+"""
+
+import re
+import sys
+import time
+import openpyxl
+
+from schedule_processor import tokenize_cell
+
+DEFAULT_WORKBOOKS = [
+    'ITsTiM_Raspisanie_2_polugodie_25-26_bak__pechat.xlsx',
+    '../make-excel/ITsTiM_Raspisanie_2_polugodie_25-26_mag__pechat.xlsx',
+]
+
+
+def legacy_parse(cell_value):
+    """旧实现: 每个单元格分别执行教师/姓名/教室正则并多次lower()"""
+    names = re.findall(r'[А-Яа-яЁё]+\s+[А-Я]\.[А-Й]\.', cell_value)
+
+    teacher_match = re.search(r'([А-Яа-яЁё]+\s+[А-Я]\.[А-Й]\.)', cell_value)
+    teacher = teacher_match.group(1) if teacher_match else ''
+
+    room_match = re.search(r'(\d+-\d+[а-я]?)', cell_value)
+    room = room_match.group(1) if room_match else ''
+    if not room:
+        room_match = re.search(r'([А-Я]+-\d+[а-я]?)', cell_value)
+        room = room_match.group(1) if room_match else ''
+
+    activity_type = ''
+    if '(лк)' in cell_value or '(лекция)' in cell_value.lower():
+        activity_type = 'лекция'
+    elif '(пз)' in cell_value or '(практическое)' in cell_value.lower():
+        activity_type = 'практическое'
+    elif '(лб)' in cell_value or '(лабораторная)' in cell_value.lower():
+        activity_type = 'лабораторная'
+
+    subject = cell_value
+    if activity_type:
+        subject = subject.split('(')[0].strip()
+
+    return tuple(names), {
+        'teacher': teacher,
+        'room': room,
+        'subject': subject,
+        'activity_type': activity_type
+    }
+
+
+def collect_cells(paths):
+    """读取所有工作簿中的文本单元格"""
+    cells = []
+    for path in paths:
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        for row in workbook.active.iter_rows(values_only=True):
+            cells.extend(cell for cell in row if cell and isinstance(cell, str))
+        workbook.close()
+    return cells
+
+
+def measure(name, func, cells, repeat=5, setup=None):
+    """返回最佳一轮的单元格/秒；setup 在每轮计时之前调用（不计入耗时）"""
+    best = float('inf')
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for cell in cells:
+            func(cell)
+        best = min(best, time.perf_counter() - start)
+    rate = len(cells) / best
+    print(f"  {name:<28} {rate:>12,.0f} 单元格/秒")
+    return rate
+
+
+def main():
+    paths = sys.argv[1:] or DEFAULT_WORKBOOKS
+    cells = collect_cells(paths)
+    print(f"{len(cells)} 个文本单元格，其中 {len(set(cells))} 个不同内容")
+
+    # 确认新旧实现结果一致
+    mismatches = [cell for cell in set(cells) if legacy_parse(cell) != tokenize_cell.__wrapped__(cell)]
+    if mismatches:
+        print(f"警告: {len(mismatches)} 个单元格解析结果不一致，例如: {mismatches[0]!r}")
+
+    before = measure('旧实现 (逐项正则)', legacy_parse, cells)
+    uncached = measure('合并词法分析 (无缓存)', tokenize_cell.__wrapped__, cells)
+    # 冷缓存: 每轮之前清空缓存，相当于进程中第一次解析工作簿（重复内容在本轮内命中）
+    cold = measure('合并词法分析 (冷缓存)', tokenize_cell, cells, setup=tokenize_cell.cache_clear)
+    # 热缓存: 缓存中已有全部内容，只反映同一进程内重复解析时的查表开销
+    warm = measure('合并词法分析 (热缓存，重复解析)', tokenize_cell, cells)
+    print(f"加速比: 无缓存 {uncached / before:.1f}x, 冷缓存 {cold / before:.1f}x "
+          f"(热缓存 {warm / before:.1f}x，仅适用于重复解析)")
+
+
+if __name__ == '__main__':
+    main()
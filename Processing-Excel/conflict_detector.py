@@ -0,0 +1,88 @@
+"""
+课程冲突检测模块
+在解析得到的课程表上查找同一时间被重复占用的教室和教师
+"""
+
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List
+
+from schedule_processor import ExcelReader, ScheduleEntry, WEEK_NUMERATOR, WEEK_DENOMINATOR
+
+WEEKS = (WEEK_NUMERATOR, WEEK_DENOMINATOR)
+
+
+@dataclass
+class Conflict:
+    """一次冲突：同一时间段内占用同一教室（或同一教师）的不同课程"""
+    kind: str  # 'room' 或 'teacher'
+    day: str
+    time: str
+    key: str  # 教室号或教师姓名
+    entries: List[ScheduleEntry] = field(default_factory=list)
+    week: str = ''  # 发生冲突的周（分子周或分母周）
+
+    def to_dict(self) -> dict:
+        """转换为可序列化为JSON的字典"""
+        return asdict(self)
+
+
+def _slot_time(time: str) -> str:
+    """
+    时间段的比较键：取节次（如 '3-4'），不同工作簿中空白和开始时间写法不同的同一时间段相同
+    """
+    match = ExcelReader.TIME_PATTERN.search(time)
+    return match.group() if match else ' '.join(time.split())
+
+
+def _collect(index, kind, make_lesson) -> List[Conflict]:
+    """从哈希索引中找出包含多个不同课程的时间段"""
+    conflicts = []
+    for (day, _, week, key), entries in index.items():
+        if len(entries) < 2:
+            continue
+        # 同一课程的多个组别或多位授课教师不算冲突，每个课程保留一条代表记录
+        lessons = {}
+        for entry in entries:
+            lessons.setdefault(make_lesson(entry), entry)
+        if len(lessons) > 1:
+            time = ' '.join(entries[0].time.split())
+            conflicts.append(Conflict(kind, day, time, key, list(lessons.values()), week))
+    return conflicts
+
+
+def find_conflicts(schedules: Dict[str, List[ScheduleEntry]]) -> List[Conflict]:
+    """
+    查找教室和教师的时间冲突
+
+    对所有课程建立 (星期, 节次, 周, 教室) 与 (星期, 节次, 周, 教师) 两个哈希索引，
+    一次遍历即可完成，总耗时与课程数量成线性关系。
+    分子周和分母周的课程互不冲突；每周都上的课程同时计入两种周。
+    - 教室冲突: 同一教室同一时间有不同科目的课程
+    - 教师冲突: 同一教师同一时间在不同教室或讲授不同科目
+    """
+    by_room = defaultdict(list)
+    by_teacher = defaultdict(list)
+    for entries in schedules.values():
+        for entry in entries:
+            time = _slot_time(entry.time)
+            for week in (entry.week,) if entry.week else WEEKS:
+                if entry.room:
+                    by_room[(entry.day, time, week, entry.room)].append(entry)
+                by_teacher[(entry.day, time, week, entry.teacher)].append(entry)
+
+    conflicts = _merge_weeks(_collect(by_room, 'room', lambda entry: entry.subject))
+    conflicts.extend(_merge_weeks(_collect(by_teacher, 'teacher', lambda entry: (entry.room, entry.subject))))
+    return conflicts
+
+
+def _merge_weeks(conflicts: List[Conflict]) -> List[Conflict]:
+    """两种周中涉及完全相同课程的冲突（每周都上的课程之间）只报告一次，周记为空"""
+    merged = {}
+    for conflict in conflicts:
+        key = (conflict.day, conflict.time, conflict.key, tuple(id(entry) for entry in conflict.entries))
+        if key in merged:
+            merged[key].week = ''
+        else:
+            merged[key] = conflict
+    return list(merged.values())
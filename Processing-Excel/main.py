@@ -4,10 +4,88 @@
 从Excel文件读取教师课程信息，并生成PDF格式的教师时间表
 """
 
+import os
 import sys
+import glob
+import json
 import argparse
-from schedule_processor import ExcelReader
-from pdf_generator import PDFGenerator
+from schedule_processor import ExcelReader, load_workbooks
+from conflict_detector import find_conflicts
+from pdf_generator import PDFGenerator, create_teacher_pdfs, concatenate_pdfs, teacher_pdf_name, font_registry
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'teacher_schedules')
+
+
+def expand_inputs(patterns):
+    """展开文件路径和通配符，保持顺序并去重"""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def format_entry(entry):
+    """课程条目的单行描述"""
+    text = f"{entry.day} {entry.time} {entry.week} {entry.subject} {entry.room} {entry.group} {entry.activity_type}"
+    return ' '.join(text.split())
+
+
+def print_conflicts(conflicts):
+    """打印教室和教师冲突"""
+    if not conflicts:
+        print("\n没有发现教室或教师冲突")
+        return
+
+    labels = {'room': '教室', 'teacher': '教师'}
+    print(f"\n发现 {len(conflicts)} 处冲突:")
+    for conflict in conflicts:
+        slot = ' '.join(f"{conflict.day} {conflict.time} {conflict.week}".split())
+        print(f"\n[{labels[conflict.kind]}] {conflict.key} - {slot}")
+        for entry in conflict.entries:
+            print(f"  {format_entry(entry)} ({entry.teacher})")
+
+
+def print_table_stats(table):
+    """打印基于列式表格的统计信息"""
+    print(f"\n统计信息:")
+    print(f"  教师数量: {table.teacher_count()}")
+    print(f"  课程总数: {len(table)}")
+
+    occupancy = sorted(table.room_occupancy().items(), key=lambda item: (-item[1], item[0]))
+    print(f"\n教室占用（时间段数量）:")
+    for room, count in occupancy:
+        print(f"  {room:<10} {count}")
+
+    # 按星期顺序排列列
+    order = [i for day in ExcelReader.DAYS_MAP.values()
+             for i, name in enumerate(table.categories['day']) if name == day]
+    days = [table.categories['day'][i] for i in order]
+    load = table.teacher_load_by_day()[:, order]
+    print(f"\n教师每日课时:")
+    print(f"  {'':<20}" + ''.join(f"{day[:3]:>6}" for day in days))
+    for teacher, row in zip(table.categories['teacher'], load.tolist()):
+        print(f"  {teacher:<20}" + ''.join(f"{count:>6}" for count in row))
+
+
+def print_diff(diffs):
+    """打印两个版本之间每位教师的课程变化"""
+    if not diffs:
+        print("两个版本之间没有课程变化")
+        return
+
+    print(f"\n{len(diffs)} 位教师的课程有变化:")
+    for teacher, diff in diffs.items():
+        print(f"\n{teacher}: 增加 {len(diff.added)}, 删除 {len(diff.removed)}, 修改 {len(diff.changed)}")
+        for entry in diff.added:
+            print(f"  + {format_entry(entry)}")
+        for entry in diff.removed:
+            print(f"  - {format_entry(entry)}")
+        for old_entry, new_entry in diff.changed:
+            print(f"  ~ {format_entry(old_entry)}")
+            print(f"    -> {format_entry(new_entry)}")
 
 
 def main():
@@ -17,6 +95,67 @@ def main():
         default='ITsTiM_Raspisanie_2_polugodie_25-26_bak__pechat.xlsx',
         help='Excel输入文件路径'
     )
+    parser.add_argument(
+        '--inputs',
+        nargs='+',
+        help='批量模式: 多个Excel文件或通配符（如 "data/*.xlsx"），按教师合并所有文件的课程'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='批量模式下的并行进程数（默认为CPU核心数）'
+    )
+    parser.add_argument(
+        '--split-dir',
+        help='为每位教师生成单独的PDF到该目录（并行渲染）'
+    )
+    parser.add_argument(
+        '--combine',
+        action='store_true',
+        help='与 --split-dir 一起使用: 另外把所有教师的PDF合并到 --output'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='与 --split-dir 一起使用: 只重新生成课程有变化的教师'
+    )
+    parser.add_argument(
+        '--export',
+        help='把课程表导出为列式表格（.npz，或安装pyarrow后的 .parquet），不生成PDF'
+    )
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='打印教室占用和教师每日课时统计，不生成PDF'
+    )
+    parser.add_argument(
+        '--conflicts',
+        action='store_true',
+        help='检查教室和教师的时间冲突，不生成PDF'
+    )
+    parser.add_argument(
+        '--conflicts-json',
+        help='把冲突检查结果以JSON格式写入该文件（可与 --conflicts 一起使用）'
+    )
+    parser.add_argument(
+        '--diff-against',
+        help='与工作簿的旧版本比较，报告每位教师增加、删除和修改的课程'
+    )
+    parser.add_argument(
+        '--diff-cached',
+        action='store_true',
+        help='与该文件上一次缓存的解析结果比较（需要启用缓存）'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        default=DEFAULT_CACHE_DIR,
+        help='解析结果缓存目录，按文件内容哈希索引（默认: ~/.cache/teacher_schedules）'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='不使用解析结果缓存'
+    )
     parser.add_argument(
         '--output',
         default='teacher_schedules.pdf',
@@ -33,22 +172,45 @@ def main():
     )
 
     args = parser.parse_args()
+    cache_dir = None if args.no_cache else args.cache_dir
+    # 字体路径与解析结果缓存在同一目录
+    font_registry.configure(cache_dir)
 
-    # 读取Excel文件
-    print(f"正在读取文件: {args.input}")
-    reader = ExcelReader(args.input)
+    if args.inputs:
+        # 批量模式：并行解析所有工作簿并合并教师视图
+        paths = expand_inputs(args.inputs)
+        if not paths:
+            print(f"错误: 没有匹配的输入文件 {' '.join(args.inputs)}")
+            sys.exit(1)
 
-    try:
-        reader.load()
-    except FileNotFoundError:
-        print(f"错误: 找不到文件 {args.input}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"错误: 读取文件失败 - {e}")
-        sys.exit(1)
+        print(f"正在并行读取 {len(paths)} 个文件:")
+        for path in paths:
+            print(f"  - {path}")
+        try:
+            teachers, all_schedules = load_workbooks(paths, args.workers, cache_dir)
+        except FileNotFoundError as e:
+            print(f"错误: 找不到文件 {e.filename}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"错误: 读取文件失败 - {e}")
+            sys.exit(1)
+        reader = None
+    else:
+        # 读取Excel文件
+        print(f"正在读取文件: {args.input}")
+        reader = ExcelReader(args.input, cache_dir)
 
-    # 列出所有教师
-    teachers = reader.get_all_teachers()
+        try:
+            reader.load()
+        except FileNotFoundError:
+            print(f"错误: 找不到文件 {args.input}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"错误: 读取文件失败 - {e}")
+            sys.exit(1)
+
+        # 列出所有教师
+        teachers = reader.get_all_teachers()
 
     if args.list_teachers:
         print(f"\n找到 {len(teachers)} 位教师:")
@@ -56,6 +218,42 @@ def main():
             print(f"  {i:2d}. {teacher}")
         return
 
+    # 版本比较：报告变化，并且只重新生成受影响教师的PDF
+    if args.diff_against or args.diff_cached:
+        if not reader:
+            print("错误: 版本比较只支持单个 --input 文件")
+            sys.exit(1)
+
+        if args.diff_against:
+            previous = ExcelReader(args.diff_against, cache_dir)
+            try:
+                previous.load()
+            except FileNotFoundError:
+                print(f"错误: 找不到文件 {args.diff_against}")
+                sys.exit(1)
+        else:
+            previous = None
+            if cache_dir and reader.previous_hash:
+                previous = ExcelReader.from_cache(cache_dir, reader.previous_hash)
+            if previous is None:
+                print("错误: 没有该文件上一个版本的缓存")
+                sys.exit(1)
+
+        diffs = reader.diff(previous)
+        print_diff(diffs)
+
+        if args.split_dir and diffs:
+            schedules = reader.get_all_schedules()
+            print(f"\n正在重新生成有变化的教师PDF: {args.split_dir}")
+            create_teacher_pdfs(schedules, args.split_dir, args.workers, only=diffs, cache_dir=cache_dir)
+            # 新版本中已没有课程的教师，删除其旧的PDF
+            for teacher in diffs:
+                stale_path = os.path.join(args.split_dir, teacher_pdf_name(teacher))
+                if teacher not in schedules and os.path.exists(stale_path):
+                    os.remove(stale_path)
+                    print(f"已删除: {stale_path}")
+        return
+
     # 处理指定教师或所有教师
     if args.teacher:
         if args.teacher not in teachers:
@@ -64,17 +262,58 @@ def main():
             sys.exit(1)
 
         print(f"正在生成 {args.teacher} 的课程表...")
-        schedules = {args.teacher: reader.get_teacher_schedule(args.teacher)}
+        if reader:
+            schedules = {args.teacher: reader.get_teacher_schedule(args.teacher)}
+        else:
+            schedules = {args.teacher: all_schedules.get(args.teacher, [])}
     else:
         print(f"正在生成 {len(teachers)} 位教师的课程表...")
-        schedules = reader.get_all_schedules()
+        schedules = reader.get_all_schedules() if reader else all_schedules
+
+    # 冲突检测
+    if args.conflicts or args.conflicts_json:
+        conflicts = find_conflicts(schedules)
+        print_conflicts(conflicts)
+        if args.conflicts_json:
+            with open(args.conflicts_json, 'w', encoding='utf-8') as f:
+                json.dump([conflict.to_dict() for conflict in conflicts], f, ensure_ascii=False, indent=2)
+            print(f"冲突检查结果已保存到: {args.conflicts_json}")
+        if conflicts:
+            sys.exit(2)
+        return
+
+    # 统计与导出：基于列式表格的向量化计算，不生成PDF
+    if args.export or args.stats:
+        from schedule_table import ScheduleTable
+
+        table = ScheduleTable.from_schedules(schedules)
+        if args.export:
+            table.save(args.export)
+            print(f"已导出 {len(table)} 条课程到: {args.export}")
+        if args.stats:
+            print_table_stats(table)
+        return
 
     # 生成PDF
-    print(f"正在生成PDF文件: {args.output}")
-    generator = PDFGenerator(args.output)
-    generator.create_schedule_pdf(schedules)
+    if args.split_dir:
+        print(f"正在为每位教师生成PDF文件: {args.split_dir}")
+        # 只生成指定教师时课程表不完整，不删除其他教师的PDF
+        pdf_paths = create_teacher_pdfs(schedules, args.split_dir, args.workers, args.incremental,
+                                        cache_dir=cache_dir, prune=not args.teacher)
+        print(f"完成! {len(pdf_paths)} 个PDF文件已保存到: {args.split_dir}")
+
+        if args.combine:
+            print(f"正在合并PDF文件: {args.output}")
+            if not concatenate_pdfs(list(pdf_paths.values()), args.output):
+                print("未安装pypdf/PyPDF2，改为整体生成合并文件")
+                PDFGenerator(args.output).create_schedule_pdf(schedules)
+            print(f"完成! 合并的PDF文件已保存到: {args.output}")
+    else:
+        print(f"正在生成PDF文件: {args.output}")
+        generator = PDFGenerator(args.output)
+        generator.create_schedule_pdf(schedules)
 
-    print(f"完成! PDF文件已保存到: {args.output}")
+        print(f"完成! PDF文件已保存到: {args.output}")
 
     # 显示统计信息
     total_lessons = sum(len(entries) for entries in schedules.values())
@@ -11,77 +11,155 @@ from reportlab.lib.units import cm
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from typing import List, Dict
+from typing import List, Dict, Iterable, Optional
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import astuple
 import os
+import re
+import json
+import hashlib
 
 from schedule_processor import ScheduleEntry
 
+# 增量模式下记录每位教师课程哈希的清单文件
+MANIFEST_NAME = '.schedule_manifest.json'
 
-class PDFGenerator:
-    """PDF时间表生成器"""
 
-    # 星期顺序
-    DAY_ORDER = ['Понедельник', 'Вторник', 'Среда', 'Четверг', 'Пятница', 'Суббота']
+class FontRegistry:
+    """
+    进程级字体与样式注册表
 
-    def __init__(self, output_path: str):
-        self.output_path = output_path
-        self.doc = None
-        self.story = []
-        self.styles = getSampleStyleSheet()
+    字体只在每个进程第一次使用时查找和注册一次，找到的字体路径缓存在
+    configure() 指定的缓存目录中（未指定时不写磁盘）；
+    已注册的TTFont在同一进程内被所有文档复用，字体文件只解析一次，
+    每个文档只需生成自己的字形子集。样式表同样只构建一次。
+    """
 
-        # 设置支持俄语的字体
-        self._setup_fonts()
+    FONT_NAME = 'ArialUnicode'
+    FONT_PATHS = [
+        '/System/Library/Fonts/Supplemental/Arial Unicode.ttf',  # macOS - 支持俄语
+        '/System/Library/Fonts/Supplemental/Arial.ttf',  # macOS
+        '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',  # Linux
+        'C:\\Windows\\Fonts\\arial.ttf',  # Windows
+    ]
+    CACHE_NAME = 'font.json'
 
-    def _setup_fonts(self):
-        """设置字体以支持俄语"""
-        # 尝试使用系统字体
-        font_paths = [
-            '/System/Library/Fonts/Supplemental/Arial Unicode.ttf',  # macOS - 支持俄语
-            '/System/Library/Fonts/Supplemental/Arial.ttf',  # macOS
-            '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',  # Linux
-            'C:\\Windows\\Fonts\\arial.ttf',  # Windows
-        ]
+    def __init__(self):
+        self.font_name = None
+        self.styles = None
+        self.cache_file = None
+
+    def configure(self, cache_dir: Optional[str]):
+        """设置字体路径缓存所在的目录，None表示不使用磁盘缓存"""
+        self.cache_file = os.path.join(cache_dir, self.CACHE_NAME) if cache_dir else None
+
+    def get(self):
+        """返回 (字体名称, 样式表)，首次调用时完成注册"""
+        if self.styles is None:
+            self.font_name = self._register_font()
+            self.styles = self._build_styles(self.font_name)
+        return self.font_name, self.styles
 
-        self.font_name = 'Helvetica'  # 默认字体
-        font_registered = False
+    def _cached_font_path(self):
+        """读取磁盘上缓存的字体路径，文件已变化时视为无效"""
+        if not self.cache_file:
+            return None
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            stat = os.stat(cached['path'])
+            if stat.st_size == cached['size'] and stat.st_mtime == cached['mtime']:
+                return cached['path']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _save_font_path(self, font_path):
+        """缓存找到的字体路径"""
+        if not self.cache_file:
+            return
+        try:
+            stat = os.stat(font_path)
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'path': font_path, 'size': stat.st_size, 'mtime': stat.st_mtime}, f)
+        except OSError:
+            pass
+
+    def _register_font(self):
+        """设置字体以支持俄语"""
+        font_paths = self.FONT_PATHS
+        cached_path = self._cached_font_path()
+        if cached_path:
+            # 优先使用缓存的字体，失败时再按默认列表查找
+            font_paths = [cached_path] + [path for path in self.FONT_PATHS if path != cached_path]
 
         for font_path in font_paths:
             if os.path.exists(font_path):
                 try:
                     # 注册字体
-                    pdfmetrics.registerFont(TTFont('ArialUnicode', font_path))
-                    self.font_name = 'ArialUnicode'
-                    font_registered = True
+                    pdfmetrics.registerFont(TTFont(self.FONT_NAME, font_path))
                     print(f"已注册字体: {font_path}")
-                    break
+                    if font_path != cached_path:
+                        self._save_font_path(font_path)
+                    return self.FONT_NAME
                 except Exception as e:
                     print(f"字体注册失败 {font_path}: {e}")
                     continue
 
-        if not font_registered:
-            print("警告: 未找到支持俄语的字体，PDF可能显示为方框")
+        print("警告: 未找到支持俄语的字体，PDF可能显示为方框")
+        return 'Helvetica'  # 默认字体
 
-        # 创建自定义样式
-        self.styles.add(ParagraphStyle(
+    @staticmethod
+    def _build_styles(font_name):
+        """创建自定义样式"""
+        styles = getSampleStyleSheet()
+        styles.add(ParagraphStyle(
             name='RussianHeader',
-            parent=self.styles['Heading1'],
-            fontName=self.font_name,
+            parent=styles['Heading1'],
+            fontName=font_name,
             fontSize=16,
             alignment=TA_CENTER,
             spaceAfter=12,
         ))
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='RussianNormal',
-            parent=self.styles['Normal'],
-            fontName=self.font_name,
+            parent=styles['Normal'],
+            fontName=font_name,
             fontSize=10,
         ))
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='RussianSmall',
-            parent=self.styles['Normal'],
-            fontName=self.font_name,
+            parent=styles['Normal'],
+            fontName=font_name,
             fontSize=9,
         ))
+        return styles
+
+
+# 每个进程一个注册表实例
+font_registry = FontRegistry()
+
+
+def _init_worker(cache_dir: Optional[str]):
+    """工作进程初始化：使用与主进程相同的字体缓存目录并注册字体"""
+    font_registry.configure(cache_dir)
+    font_registry.get()
+
+
+class PDFGenerator:
+    """PDF时间表生成器"""
+
+    # 星期顺序
+    DAY_ORDER = ['Понедельник', 'Вторник', 'Среда', 'Четверг', 'Пятница', 'Суббота']
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.doc = None
+        self.story = []
+
+        # 设置支持俄语的字体（进程内共享，样式表只读）
+        self.font_name, self.styles = font_registry.get()
 
     def create_schedule_pdf(self, schedules: Dict[str, List[ScheduleEntry]]):
         """创建包含所有教师时间表的PDF"""
@@ -138,9 +216,11 @@ class PDFGenerator:
                     else:
                         day_cell = ''
 
+                    # 只在分子周或分母周上的课程在时间下注明
+                    time_cell = f"{entry.time}\n{entry.week}" if entry.week else entry.time
                     table_data.append([
                         day_cell,
-                        entry.time,
+                        time_cell,
                         entry.subject[:40] + '...' if len(entry.subject) > 40 else entry.subject,
                         entry.room,
                         entry.group,
@@ -188,6 +268,122 @@ class PDFGenerator:
         self.doc.build(self.story)
 
 
+def teacher_pdf_name(teacher_name: str) -> str:
+    """教师姓名转换为文件名，例如 Иванов И.И. -> Иванов_И.И.pdf"""
+    return re.sub(r'[^\w.-]+', '_', teacher_name).strip('._') + '.pdf'
+
+
+def schedule_hash(entries: List[ScheduleEntry]) -> str:
+    """教师课程内容的哈希，用于判断是否需要重新生成"""
+    digest = hashlib.sha256()
+    for entry in entries:
+        digest.update(repr(astuple(entry)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _render_teacher_pdf(job):
+    """进程池任务: 生成单个教师的PDF"""
+    teacher_name, entries, output_path = job
+    PDFGenerator(output_path).create_single_teacher_pdf(teacher_name, entries)
+    return output_path
+
+
+def create_teacher_pdfs(schedules: Dict[str, List[ScheduleEntry]], output_dir: str,
+                        workers: Optional[int] = None, incremental: bool = False,
+                        only: Optional[Iterable[str]] = None,
+                        cache_dir: Optional[str] = None, prune: bool = False) -> Dict[str, str]:
+    """
+    在进程池中为每位教师生成独立的PDF文件
+
+    Args:
+        schedules: 教师 -> 课程列表
+        output_dir: 输出目录
+        workers: 并行进程数，默认为CPU核心数
+        incremental: 只重新生成课程与上次运行相比有变化的教师
+        only: 只生成这些教师（例如版本比较得到的有变化的教师），其余教师的PDF保持不变
+        cache_dir: 字体路径缓存目录，None表示不使用磁盘缓存
+        prune: 增量模式下删除上次清单中有、但已不在schedules中的教师的PDF和清单记录
+            （schedules为完整课程表时使用；只生成部分教师时保留其他教师的记录）
+
+    Returns:
+        Dict[str, str]: 教师 -> PDF文件路径（按schedules的顺序）
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+
+    previous = {}
+    if incremental and os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+
+    if only is not None:
+        only = set(only)
+
+    paths = {}
+    manifest = {}
+    jobs = []
+    for teacher, entries in schedules.items():
+        path = os.path.join(output_dir, teacher_pdf_name(teacher))
+        digest = schedule_hash(entries)
+        paths[teacher] = path
+        manifest[teacher] = digest
+        if only is not None and teacher not in only and os.path.exists(path):
+            continue
+        if incremental and previous.get(teacher) == digest and os.path.exists(path):
+            continue
+        jobs.append((teacher, entries, path))
+
+    # 不在本次课程表中的教师
+    current_paths = set(paths.values())
+    for teacher in sorted(previous.keys() - schedules.keys()):
+        stale_path = os.path.join(output_dir, teacher_pdf_name(teacher))
+        if not prune:
+            manifest[teacher] = previous[teacher]
+        elif stale_path not in current_paths and os.path.exists(stale_path):
+            os.remove(stale_path)
+            print(f"已删除: {stale_path}")
+
+    print(f"需要生成 {len(jobs)} 个PDF，跳过 {len(schedules) - len(jobs)} 个未变化的教师")
+
+    font_registry.configure(cache_dir)
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        for job in jobs:
+            _render_teacher_pdf(job)
+    elif jobs:
+        # 工作进程启动时即注册字体，之后的每个PDF都直接复用
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(cache_dir,)) as executor:
+            list(executor.map(_render_teacher_pdf, jobs))
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    return paths
+
+
+def concatenate_pdfs(pdf_paths: List[str], output_path: str) -> bool:
+    """
+    将多个PDF按顺序合并为一个文件
+
+    需要 pypdf 或 PyPDF2，均未安装时返回False，由调用方改用整体渲染
+    """
+    try:
+        from pypdf import PdfWriter
+    except ImportError:
+        try:
+            from PyPDF2 import PdfWriter
+        except ImportError:
+            return False
+
+    writer = PdfWriter()
+    for path in pdf_paths:
+        writer.append(path)
+    with open(output_path, 'wb') as f:
+        writer.write(f)
+    return True
+
+
 if __name__ == '__main__':
     # 测试代码
     from schedule_processor import ExcelReader
@@ -3,10 +3,20 @@
 从Excel文件读取教师课程信息，并生成PDF格式的教师时间表
 """
 
+import os
 import re
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+import bisect
+import gzip
+import json
+import pickle
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import astuple, dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import openpyxl
+from openpyxl.utils.cell import range_boundaries
 from datetime import datetime
 
 
@@ -20,6 +30,76 @@ class ScheduleEntry:
     room: str
     group: str
     activity_type: str  # лк (лекция), пз (практическое), лб (лабораторная)
+    week: str = ''  # WEEK_NUMERATOR / WEEK_DENOMINATOR，空字符串表示每周
+
+
+# 每个时间段占两行：第一行为分子周（числитель），第二行为分母周（знаменатель），
+# 上下合并两行的课程每周都上
+WEEK_NUMERATOR = 'числитель'
+WEEK_DENOMINATOR = 'знаменатель'
+
+
+# 单元格词法分析: 一次扫描同时识别教师、教室和课程类型
+CELL_TOKEN_PATTERN = re.compile(
+    r'(?P<teacher>[А-Яа-яЁё]+\s+[А-Я]\.[А-Й]\.)'
+    r'|(?P<room>\d+-\d+[а-я]?)'
+    # 字母教室只消耗前缀，数字部分放在前瞻中，以免遮住其后的数字教室
+    r'|(?P<alt_room>[А-Я]+-)(?=(?P<alt_room_number>\d+[а-я]?))'
+    r'|\((?P<short_type>лк|пз|лб)\)'
+    r'|\((?P<long_type>(?i:лекция|практическое|лабораторная))\)'
+)
+
+# 课程类型及其优先级（同一单元格出现多种类型时取靠前的）
+ACTIVITY_TYPES = {
+    'лк': 'лекция', 'лекция': 'лекция',
+    'пз': 'практическое', 'практическое': 'практическое',
+    'лб': 'лабораторная', 'лабораторная': 'лабораторная',
+}
+ACTIVITY_PRIORITY = ('лекция', 'практическое', 'лабораторная')
+
+
+@lru_cache(maxsize=1 << 16)
+def tokenize_cell(cell_value: str) -> Tuple[Tuple[str, ...], dict]:
+    """
+    单次扫描解析单元格，返回 (单元格中所有教师姓名, 课程信息)
+
+    同样的单元格内容在不同组别之间大量重复，因此结果按字符串缓存；
+    返回的字典为共享对象，调用方不应修改。
+    """
+    teachers = []
+    room = ''
+    alt_room = ''
+    activities = set()
+
+    for match in CELL_TOKEN_PATTERN.finditer(cell_value):
+        kind = match.lastgroup
+        if kind == 'teacher':
+            teachers.append(match.group('teacher'))
+        elif kind == 'room':
+            if not room:
+                room = match.group('room')
+        elif kind == 'short_type':
+            activities.add(ACTIVITY_TYPES[match.group('short_type')])
+        elif kind == 'long_type':
+            activities.add(ACTIVITY_TYPES[match.group('long_type').lower()])
+        elif not alt_room:
+            alt_room = match.group('alt_room') + match.group('alt_room_number')
+
+    activity_type = ''
+    for candidate in ACTIVITY_PRIORITY:
+        if candidate in activities:
+            activity_type = candidate
+            break
+
+    # 提取科目名称（在活动类型之前的部分）
+    subject = cell_value.partition('(')[0].strip() if activity_type else cell_value
+
+    return tuple(teachers), {
+        'teacher': teachers[0] if teachers else '',
+        'room': room or alt_room,
+        'subject': subject,
+        'activity_type': activity_type
+    }
 
 
 class ExcelReader:
@@ -34,83 +114,212 @@ class ExcelReader:
         'СУББОТА': 'Суббота'
     }
 
-    def __init__(self, file_path: str):
+    TIME_PATTERN = re.compile(r'\d+-\d+')
+    MERGE_PATTERN = re.compile(rb'<(?:\w+:)?mergeCell\s[^>]*?ref="([A-Z]+\d+:[A-Z]+\d+)"')
+    # 解析逻辑变化时递增，使旧的缓存失效
+    PARSER_VERSION = 4
+    # 组别表头所在行；表头中这些列不是组别
+    GROUP_ROW = 3
+    NON_GROUP_HEADERS = ('День', 'Время')
+    # 缓存目录中记录每个工作簿路径当前和上一个版本哈希的文件
+    REVISIONS_FILE = 'revisions.json'
+
+    def __init__(self, file_path: str, cache_dir: Optional[str] = None):
         self.file_path = file_path
+        self.cache_dir = cache_dir
         self.workbook = None
         self.worksheet = None
+        self.read_only = True
+        self._cache_path = None
+        self.file_hash = None
+        self.previous_hash = None
+        # 单次扫描建立的索引（见 _build_index）
+        self._cells = None
+        self._teacher_index = None
+
+    def load(self, read_only: bool = True, record_revision: bool = True):
+        """
+        加载Excel文件
 
-    def load(self):
-        """加载Excel文件"""
-        self.workbook = openpyxl.load_workbook(self.file_path, data_only=True)
+        read_only=True 时使用openpyxl只读流式模式：不为每个单元格建立对象，
+        行在建立索引时逐行读取，内存占用不随工作簿大小增长。
+        read_only=False 时按原方式完整加载到内存。
+        record_revision=False 时不写版本记录，由调用方在主进程中统一记录（见 load_workbooks）。
+        """
+        self.read_only = read_only
+        self._cells = None
+        self._teacher_index = None
+
+        # 工作簿内容未变化时直接使用缓存的解析结果，不再打开openpyxl
+        if self.cache_dir:
+            self.file_hash = self._file_hash()
+            if record_revision:
+                self.previous_hash = self._record_revision()
+            self._cache_path = self._cache_file(self.cache_dir, self.file_hash)
+            if self._load_cache():
+                return
+
+        self.workbook = openpyxl.load_workbook(self.file_path, read_only=read_only, data_only=True)
         self.worksheet = self.workbook.active
+        if read_only and self.worksheet.max_column is None:
+            # 部分生成工具不写dimension，需要按实际内容重新计算
+            self.worksheet.reset_dimensions()
 
-    def get_all_teachers(self) -> List[str]:
-        """获取所有教师姓名"""
-        teachers = set()
-        for row in self.worksheet.iter_rows(values_only=True):
-            for cell in row:
-                if cell and isinstance(cell, str):
-                    # 匹配格式: Фамилия И.О.
-                    matches = re.findall(r'[А-Яа-яЁё]+\s+[А-Я]\.[А-Й]\.', cell)
-                    teachers.update(matches)
-        # 排除一些误匹配
-        teachers = {t for t in teachers if 'наследие' not in t and len(t.split()) <= 3}
-        return sorted(teachers)
+    @classmethod
+    def _cache_file(cls, cache_dir: str, file_hash: str) -> str:
+        """缓存文件路径"""
+        return os.path.join(cache_dir, f'{file_hash}-v{cls.PARSER_VERSION}.pickle.gz')
 
-    def parse_cell(self, cell_value: str) -> Optional[dict]:
-        """解析单元格内容，提取课程信息"""
-        if not cell_value or not isinstance(cell_value, str):
-            return None
+    @classmethod
+    def from_cache(cls, cache_dir: str, file_hash: str) -> Optional['ExcelReader']:
+        """直接从缓存的解析结果创建读取器（例如工作簿的上一个版本），缓存不存在时返回None"""
+        reader = cls('', cache_dir)
+        reader.file_hash = file_hash
+        reader._cache_path = cls._cache_file(cache_dir, file_hash)
+        return reader if reader._load_cache() else None
 
-        # 提取教师姓名
-        teacher_match = re.search(r'([А-Яа-яЁё]+\s+[А-Я]\.[А-Й]\.)', cell_value)
-        teacher = teacher_match.group(1) if teacher_match else ''
-
-        # 提取教室
-        room_match = re.search(r'(\d+-\d+[а-я]?)', cell_value)
-        room = room_match.group(1) if room_match else ''
-        if not room:
-            room_match = re.search(r'([А-Я]+-\d+[а-я]?)', cell_value)
-            room = room_match.group(1) if room_match else ''
-
-        # 提取活动类型
-        activity_type = ''
-        if '(лк)' in cell_value or '(лекция)' in cell_value.lower():
-            activity_type = 'лекция'
-        elif '(пз)' in cell_value or '(практическое)' in cell_value.lower():
-            activity_type = 'практическое'
-        elif '(лб)' in cell_value or '(лабораторная)' in cell_value.lower():
-            activity_type = 'лабораторная'
-
-        # 提取科目名称（在活动类型之前的部分）
-        subject = cell_value
-        if activity_type:
-            subject = subject.split('(')[0].strip()
-
-        return {
-            'teacher': teacher,
-            'room': room,
-            'subject': subject,
-            'activity_type': activity_type
-        }
+    def _record_revision(self) -> Optional[str]:
+        """
+        在缓存目录中记录该路径的当前版本哈希，返回该路径上一个不同版本的哈希
+        """
+        return record_revisions(self.cache_dir, {self.file_path: self.file_hash})[self.file_path]
 
-    def get_teacher_schedule(self, teacher_name: str) -> List[ScheduleEntry]:
-        """获取指定教师的课程表"""
-        schedule = []
+    def _file_hash(self) -> str:
+        """计算工作簿文件内容的SHA-256"""
+        digest = hashlib.sha256()
+        with open(self.file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _load_cache(self) -> bool:
+        """从缓存恢复索引，成功返回True"""
+        if not os.path.exists(self._cache_path):
+            return False
+        try:
+            with gzip.open(self._cache_path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception as e:
+            print(f"警告: 缓存读取失败 {self._cache_path}: {e}")
+            return False
+        if data[0] != self.PARSER_VERSION:
+            return False
+        _, cells, teacher_index = data
+        self._cells = cells
+        self._teacher_index = teacher_index
+        return True
+
+    def _save_cache(self):
+        """将索引写入缓存（先写临时文件再替换，避免并发读到半个文件）"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f'{self._cache_path}.{os.getpid()}.tmp'
+            with gzip.open(temp_path, 'wb', compresslevel=6) as f:
+                pickle.dump(
+                    (self.PARSER_VERSION, self._cells, self._teacher_index),
+                    f, protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(temp_path, self._cache_path)
+        except Exception as e:
+            print(f"警告: 缓存写入失败 {self._cache_path}: {e}")
+
+    def _merged_ranges(self) -> List[tuple]:
+        """
+        工作表的合并区域 (min_col, min_row, max_col, max_row)，列和行均从1开始
+        """
+        if self.read_only:
+            # 只读模式依赖openpyxl的私有属性读取工作表XML，属性不存在时退回完整加载
+            if hasattr(self.workbook, '_archive') and hasattr(self.worksheet, '_worksheet_path'):
+                return self._read_merged_ranges()
+            print("警告: 当前openpyxl版本无法在只读模式下读取合并单元格，改为完整加载")
+            self.workbook.close()
+            self.read_only = False
+            self.workbook = openpyxl.load_workbook(self.file_path, data_only=True)
+            self.worksheet = self.workbook.active
+        return [merged.bounds for merged in self.worksheet.merged_cells.ranges]
+
+    @staticmethod
+    def _merged_blanks(ranges: List[tuple]) -> Dict[int, List[tuple]]:
+        """
+        行号 -> [(起始列下标, 结束列下标)]，即每行中需要置空的非左上角单元格
+        （与完整加载模式的行为一致）
+        """
+        blanks = defaultdict(list)
+        for min_col, min_row, max_col, max_row in ranges:
+            for row in range(min_row, max_row + 1):
+                # 左上角单元格保留原值
+                start = min_col if row == min_row else min_col - 1
+                if start < max_col:
+                    blanks[row].append((start, max_col))
+        return blanks
+
+    def _read_merged_ranges(self) -> List[tuple]:
+        """
+        只读模式下openpyxl不提供合并单元格信息，这里直接从工作表XML中读取 mergeCell 区域
+        """
+        ranges = []
+        archive = self.workbook._archive
+        tail = b''
+        with archive.open(self.worksheet._worksheet_path) as sheet_xml:
+            while True:
+                chunk = sheet_xml.read(1 << 20)
+                if not chunk:
+                    break
+                data = tail + chunk
+                last = 0
+                for match in self.MERGE_PATTERN.finditer(data):
+                    ranges.append(range_boundaries(match.group(1).decode()))
+                    last = match.end()
+                # 保留可能被截断的标签，留给下一块继续匹配
+                tail = data[max(last, len(data) - 256):]
+        return ranges
+
+    def _iter_rows(self, ranges: List[tuple]):
+        """逐行产出单元格值，只读模式下按合并区域置空"""
+        if not self.read_only:
+            yield from self.worksheet.iter_rows(values_only=True)
+            return
+
+        blanks = self._merged_blanks(ranges)
+        for row_idx, row in enumerate(self.worksheet.iter_rows(values_only=True), 1):
+            spans = blanks.get(row_idx)
+            if spans:
+                row = list(row)
+                for start, end in spans:
+                    row[start:end] = [None] * len(row[start:end])
+            yield row
+
+    def _build_index(self):
+        """
+        单次遍历工作表，建立按教师的倒排索引
+
+        每个非空单元格只解析一次：
+          _cells         - 课程区内的单元格记录 (day, time, week, group, value, parsed)
+          _teacher_index - 教师姓名 -> _cells 中的记录下标（按行顺序）
+
+        week 由单元格在时间段中的行决定（见 WEEK_NUMERATOR），group 为该列上方的组别表头。
+        """
+        group_columns = []  # 组别表头的列下标（升序）
+        group_names = []    # 对应的组别（日期、时间列为空字符串）
+        cells = []
+        teacher_index = {}
         current_day = None
         current_time = None
-        current_groups = []
+        slot_row = None
 
-        # 首先获取所有组别
-        for col in self.worksheet.iter_cols(min_row=3, max_row=3, values_only=True):
-            if col[0] and isinstance(col[0], str):
-                if 'ПМ-' in col[0] or 'ИиВТ-' in col[0]:
-                    current_groups.append(col[0].strip())
+        ranges = self._merged_ranges()
+        # 合并区域左上角 (行号, 列下标) -> 合并的行数
+        row_spans = {(min_row, min_col - 1): max_row - min_row + 1
+                     for min_col, min_row, max_col, max_row in ranges if max_row > min_row}
 
-        # 用于去重的集合，基于 (day, time, subject, room, group, activity_type)
-        seen_entries = set()
+        for row_idx, row in enumerate(self._iter_rows(ranges), 1):
+            # 第3行为组别表头
+            if row_idx == self.GROUP_ROW:
+                for col_idx, cell in enumerate(row):
+                    if cell and isinstance(cell, str):
+                        group_columns.append(col_idx)
+                        group_names.append('' if cell.strip() in self.NON_GROUP_HEADERS else cell.strip())
 
-        for row_idx, row in enumerate(self.worksheet.iter_rows(values_only=True), 1):
             # 检查是否是星期行
             for cell in row[:3]:
                 if cell and isinstance(cell, str):
@@ -124,41 +333,112 @@ class ExcelReader:
             # 检查时间列（通常是第二列）
             if len(row) > 1 and row[1]:
                 time_cell = str(row[1])
-                if re.match(r'\d+-\d+', time_cell):
+                if self.TIME_PATTERN.match(time_cell):
                     current_time = time_cell
+                    slot_row = row_idx
+
+            in_schedule = bool(current_day and current_time)
+            for col_idx, cell in enumerate(row):
+                if not cell or not isinstance(cell, str):
+                    continue
+                names, parsed = tokenize_cell(cell)
+                if col_idx < 2 or not in_schedule:
+                    # 课程区外的单元格只用于收集教师姓名
+                    for name in names:
+                        teacher_index.setdefault(name, [])
+                    continue
+
+                offset = row_idx - slot_row
+                if offset == 0:
+                    week = '' if row_spans.get((row_idx, col_idx), 1) >= 2 else WEEK_NUMERATOR
+                else:
+                    week = WEEK_DENOMINATOR if offset == 1 else ''
+                position = bisect.bisect_right(group_columns, col_idx) - 1
+                group = group_names[position] if position >= 0 else ''
+
+                cell_id = len(cells)
+                cells.append((current_day, current_time, week, group, cell, parsed))
+                for name in names:
+                    refs = teacher_index.setdefault(name, [])
+                    if not refs or refs[-1] != cell_id:
+                        refs.append(cell_id)
+
+        self._cells = cells
+        self._teacher_index = teacher_index
+
+        if self.read_only:
+            # 索引建立后不再需要工作表，释放只读模式占用的文件句柄
+            self.workbook.close()
+
+        if self._cache_path:
+            self._save_cache()
 
-            # 搜索教师的所有单元格
-            if current_day and current_time:
-                for col_idx, cell in enumerate(row[2:], 2):
-                    if cell and isinstance(cell, str) and teacher_name in cell:
-                        parsed = self.parse_cell(cell)
-                        if parsed:
-                            # 获取组别（从表头或列索引推断）
-                            group = current_groups[0] if current_groups else ''
-
-                            # 创建去重键
-                            entry_key = (
-                                current_day,
-                                current_time,
-                                parsed['subject'],
-                                parsed['room'],
-                                group,
-                                parsed['activity_type']
-                            )
-
-                            # 只添加未重复的条目
-                            if entry_key not in seen_entries:
-                                seen_entries.add(entry_key)
-                                entry = ScheduleEntry(
-                                    day=current_day,
-                                    time=current_time,
-                                    subject=parsed['subject'],
-                                    teacher=teacher_name,
-                                    room=parsed['room'],
-                                    group=group,
-                                    activity_type=parsed['activity_type']
-                                )
-                                schedule.append(entry)
+    def _ensure_index(self):
+        """按需建立索引"""
+        if self._teacher_index is None:
+            self._build_index()
+
+    def get_all_teachers(self) -> List[str]:
+        """获取所有教师姓名"""
+        self._ensure_index()
+        # 排除一些误匹配
+        teachers = {t for t in self._teacher_index if 'наследие' not in t and len(t.split()) <= 3}
+        return sorted(teachers)
+
+    def parse_cell(self, cell_value: str) -> Optional[dict]:
+        """解析单元格内容，提取课程信息"""
+        if not cell_value or not isinstance(cell_value, str):
+            return None
+        return dict(tokenize_cell(cell_value)[1])
+
+    def get_teacher_schedule(self, teacher_name: str) -> List[ScheduleEntry]:
+        """获取指定教师的课程表"""
+        self._ensure_index()
+        schedule = []
+
+        if teacher_name in self._teacher_index:
+            cell_ids = self._teacher_index[teacher_name]
+        else:
+            # 不是完整姓名时，退回到对已索引单元格的子串匹配
+            cell_ids = [i for i, record in enumerate(self._cells) if teacher_name in record[4]]
+
+        # 同一节课（day, time, week, subject, room, activity_type）在多个组别列中出现时
+        # 合并为一个条目，组别用逗号连接
+        entries_by_key = {}
+        groups_by_key = {}
+
+        for cell_id in cell_ids:
+            day, time, week, group, _, parsed = self._cells[cell_id]
+
+            # 创建去重键
+            entry_key = (
+                day,
+                time,
+                week,
+                parsed['subject'],
+                parsed['room'],
+                parsed['activity_type']
+            )
+
+            # 只添加未重复的条目
+            if entry_key not in entries_by_key:
+                groups_by_key[entry_key] = []
+                entries_by_key[entry_key] = ScheduleEntry(
+                    day=day,
+                    time=time,
+                    subject=parsed['subject'],
+                    teacher=teacher_name,
+                    room=parsed['room'],
+                    group=group,
+                    activity_type=parsed['activity_type'],
+                    week=week
+                )
+                schedule.append(entries_by_key[entry_key])
+            if group and group not in groups_by_key[entry_key]:
+                groups_by_key[entry_key].append(group)
+
+        for entry_key, entry in entries_by_key.items():
+            entry.group = ', '.join(groups_by_key[entry_key])
 
         return schedule
 
@@ -174,6 +454,154 @@ class ExcelReader:
 
         return schedules
 
+    def diff(self, previous: 'ExcelReader') -> Dict[str, 'TeacherDiff']:
+        """
+        与工作簿的上一个版本比较，返回有变化的教师及其增加、删除和修改的课程
+        """
+        return diff_schedules(previous.get_all_schedules(), self.get_all_schedules())
+
+
+@dataclass
+class TeacherDiff:
+    """单个教师在两个版本之间的课程变化"""
+    added: List[ScheduleEntry] = field(default_factory=list)
+    removed: List[ScheduleEntry] = field(default_factory=list)
+    changed: List[Tuple[ScheduleEntry, ScheduleEntry]] = field(default_factory=list)  # (旧, 新)
+
+
+def diff_schedules(old: Dict[str, List[ScheduleEntry]], new: Dict[str, List[ScheduleEntry]]
+                   ) -> Dict[str, TeacherDiff]:
+    """
+    按 ScheduleEntry 比较两个版本的课程表
+
+    同一时间段（星期、时间、单双周、组别）中被删除又被增加的课程视为修改，
+    只返回有变化的教师，按姓名排序。
+    """
+    diffs = {}
+    for teacher in sorted(set(old) | set(new)):
+        old_entries = old.get(teacher, [])
+        new_entries = new.get(teacher, [])
+        old_keys = {astuple(entry) for entry in old_entries}
+        new_keys = {astuple(entry) for entry in new_entries}
+        removed = [entry for entry in old_entries if astuple(entry) not in new_keys]
+        added = [entry for entry in new_entries if astuple(entry) not in old_keys]
+        if not removed and not added:
+            continue
+
+        # 同一时间段的删除与增加配对为修改
+        removed_by_slot = defaultdict(list)
+        for entry in removed:
+            removed_by_slot[(entry.day, entry.time, entry.week, entry.group)].append(entry)
+
+        teacher_diff = TeacherDiff()
+        for entry in added:
+            slot = removed_by_slot.get((entry.day, entry.time, entry.week, entry.group))
+            if slot:
+                teacher_diff.changed.append((slot.pop(0), entry))
+            else:
+                teacher_diff.added.append(entry)
+        unpaired = {id(entry) for entries in removed_by_slot.values() for entry in entries}
+        teacher_diff.removed = [entry for entry in removed if id(entry) in unpaired]
+        diffs[teacher] = teacher_diff
+
+    return diffs
+
+
+def record_revisions(cache_dir: str, file_hashes: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """
+    在缓存目录的版本记录中一次写入多个工作簿的当前版本哈希
+
+    读取、修改、写回整个记录文件，只应在主进程中调用（工作进程中同时写会丢失记录）；
+    先写临时文件再替换，避免读到半个文件。
+
+    Args:
+        cache_dir: 缓存目录
+        file_hashes: 工作簿路径 -> 当前内容哈希
+
+    Returns:
+        Dict: 工作簿路径 -> 该路径上一个不同版本的哈希（没有时为None）
+    """
+    revisions_path = os.path.join(cache_dir, ExcelReader.REVISIONS_FILE)
+    try:
+        with open(revisions_path, 'r', encoding='utf-8') as f:
+            revisions = json.load(f)
+    except (OSError, ValueError):
+        revisions = {}
+
+    previous = {}
+    changed = False
+    for file_path, file_hash in file_hashes.items():
+        key = os.path.abspath(file_path)
+        record = revisions.get(key, {})
+        if record.get('current') != file_hash:
+            record = {'current': file_hash, 'previous': record.get('current')}
+            revisions[key] = record
+            changed = True
+        previous[file_path] = record.get('previous')
+
+    if changed:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            temp_path = f'{revisions_path}.{os.getpid()}.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(revisions, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, revisions_path)
+        except OSError as e:
+            print(f"警告: 版本记录写入失败 {revisions_path}: {e}")
+    return previous
+
+
+def parse_workbook(file_path: str, cache_dir: Optional[str] = None
+                   ) -> Tuple[List[str], Dict[str, List[ScheduleEntry]], Optional[str]]:
+    """
+    读取单个工作簿，返回 (教师列表, 教师课程表, 文件内容哈希)，供进程池调用
+
+    不写版本记录，由 load_workbooks 在所有工作簿解析完成后在主进程中统一记录。
+    """
+    reader = ExcelReader(file_path, cache_dir)
+    reader.load(record_revision=False)
+    return reader.get_all_teachers(), reader.get_all_schedules(), reader.file_hash
+
+
+def merge_schedules(results: List[Dict[str, List[ScheduleEntry]]]) -> Dict[str, List[ScheduleEntry]]:
+    """按教师合并多个工作簿的课程表，去除完全相同的条目"""
+    merged = {}
+    seen = {}
+    for schedules in results:
+        for teacher, entries in schedules.items():
+            teacher_entries = merged.setdefault(teacher, [])
+            teacher_seen = seen.setdefault(teacher, set())
+            for entry in entries:
+                key = astuple(entry)
+                if key not in teacher_seen:
+                    teacher_seen.add(key)
+                    teacher_entries.append(entry)
+    return {teacher: merged[teacher] for teacher in sorted(merged)}
+
+
+def load_workbooks(file_paths: List[str], workers: Optional[int] = None,
+                   cache_dir: Optional[str] = None
+                   ) -> Tuple[List[str], Dict[str, List[ScheduleEntry]]]:
+    """
+    并行读取多个工作簿并合并教师视图
+
+    每个文件在独立进程中解析，结果按输入顺序合并，
+    因此同一位教师在所有专业中的课程会出现在同一份课程表中。
+    """
+    workers = min(workers or os.cpu_count() or 1, len(file_paths))
+    if workers <= 1:
+        results = [parse_workbook(path, cache_dir) for path in file_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(parse_workbook, file_paths, [cache_dir] * len(file_paths)))
+
+    if cache_dir:
+        record_revisions(cache_dir, {path: file_hash for path, (_, _, file_hash) in zip(file_paths, results)})
+
+    teachers = sorted({teacher for file_teachers, _, _ in results for teacher in file_teachers})
+    schedules = merge_schedules([file_schedules for _, file_schedules, _ in results])
+    return teachers, schedules
+
 
 if __name__ == '__main__':
     reader = ExcelReader('ITsTiM_Raspisanie_2_polugodie_25-26_mag__pechat.xlsx')
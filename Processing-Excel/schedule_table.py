@@ -0,0 +1,122 @@
+"""
+课程表列式存储模块
+将解析得到的课程表转换为字典编码的列式表格（NumPy），用于批量统计分析
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from schedule_processor import ScheduleEntry
+
+# 列顺序与 ScheduleEntry 字段一致
+COLUMNS = ('day', 'time', 'subject', 'teacher', 'room', 'group', 'activity_type', 'week')
+
+
+class ScheduleTable:
+    """
+    字典编码的课程表
+
+    每一列保存为 int32 编码数组 codes[列名]，对应的取值列表为 categories[列名]，
+    一行对应一个 ScheduleEntry。
+    """
+
+    def __init__(self, codes: Dict[str, np.ndarray], categories: Dict[str, List[str]]):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.codes['teacher'])
+
+    @classmethod
+    def from_schedules(cls, schedules: Dict[str, List[ScheduleEntry]]) -> 'ScheduleTable':
+        """由 get_all_schedules() / load_workbooks() 的结果构建"""
+        lookups = {column: {} for column in COLUMNS}
+        columns = {column: [] for column in COLUMNS}
+        for entries in schedules.values():
+            for entry in entries:
+                for column in COLUMNS:
+                    value = getattr(entry, column)
+                    lookup = lookups[column]
+                    code = lookup.get(value)
+                    if code is None:
+                        code = lookup[value] = len(lookup)
+                    columns[column].append(code)
+
+        codes = {column: np.asarray(columns[column], dtype=np.int32) for column in COLUMNS}
+        categories = {column: list(lookups[column]) for column in COLUMNS}
+        return cls(codes, categories)
+
+    def to_structured(self) -> np.ndarray:
+        """导出为NumPy结构化数组（编码列），取值列表见 categories"""
+        array = np.empty(len(self), dtype=[(column, np.int32) for column in COLUMNS])
+        for column in COLUMNS:
+            array[column] = self.codes[column]
+        return array
+
+    def decode(self, column: str) -> np.ndarray:
+        """将某一列还原为字符串数组"""
+        return np.asarray(self.categories[column], dtype=object)[self.codes[column]]
+
+    def save(self, path: str):
+        """
+        保存表格：.parquet 使用pyarrow的字典编码列（需要安装pyarrow），
+        其他扩展名保存为 .npz（编码列 + 取值列表）
+        """
+        if path.lower().endswith('.parquet'):
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("导出Parquet需要安装pyarrow: pip install pyarrow")
+            arrays = [
+                pa.DictionaryArray.from_arrays(self.codes[column], pa.array(self.categories[column], pa.string()))
+                for column in COLUMNS
+            ]
+            pq.write_table(pa.Table.from_arrays(arrays, names=list(COLUMNS)), path)
+        else:
+            payload = {f'{column}_codes': self.codes[column] for column in COLUMNS}
+            payload.update({
+                f'{column}_categories': np.asarray(self.categories[column], dtype=str)
+                for column in COLUMNS
+            })
+            np.savez_compressed(path, **payload)
+
+    @classmethod
+    def load(cls, path: str) -> 'ScheduleTable':
+        """读取 save() 保存的 .npz 文件"""
+        with np.load(path) as data:
+            codes = {column: data[f'{column}_codes'] for column in COLUMNS if f'{column}_codes' in data}
+            categories = {column: data[f'{column}_categories'].tolist() for column in codes}
+        # 较早版本导出的文件没有 week 列，视为每周都上
+        if 'week' not in codes:
+            codes['week'] = np.zeros(len(codes['teacher']), dtype=np.int32)
+            categories['week'] = ['']
+        return cls(codes, categories)
+
+    # ---- 向量化统计 ----
+
+    def teacher_count(self) -> int:
+        """有课程的教师数量"""
+        return int(np.count_nonzero(np.bincount(self.codes['teacher'], minlength=1)))
+
+    def lessons_per_teacher(self) -> Dict[str, int]:
+        """每位教师的课程数量"""
+        counts = np.bincount(self.codes['teacher'], minlength=len(self.categories['teacher']))
+        return dict(zip(self.categories['teacher'], counts.tolist()))
+
+    def teacher_load_by_day(self) -> np.ndarray:
+        """教师 x 星期 的课程数量矩阵，行列顺序见 categories['teacher'] / categories['day']"""
+        n_teachers = len(self.categories['teacher'])
+        n_days = len(self.categories['day'])
+        flat = self.codes['teacher'].astype(np.int64) * n_days + self.codes['day']
+        return np.bincount(flat, minlength=n_teachers * n_days).reshape(n_teachers, n_days)
+
+    def room_occupancy(self) -> Dict[str, int]:
+        """每个教室被占用的不同时间段（星期+时间）数量，不含未识别教室"""
+        n_days = len(self.categories['day'])
+        n_times = len(self.categories['time'])
+        slots = (self.codes['room'].astype(np.int64) * n_days + self.codes['day']) * n_times + self.codes['time']
+        rooms = np.unique(slots) // (n_days * n_times)
+        counts = np.bincount(rooms, minlength=len(self.categories['room']))
+        return {room: count for room, count in zip(self.categories['room'], counts.tolist()) if room}
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用的工作簿和课程条目
+"""
+
+import os
+import sys
+
+import openpyxl
+
+# 添加项目根目录到Python路径
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_DIR)
+
+from schedule_processor import ScheduleEntry
+
+BAK_WORKBOOK = os.path.join(PROJECT_DIR, 'ITsTiM_Raspisanie_2_polugodie_25-26_bak__pechat.xlsx')
+MAG_WORKBOOK = os.path.join(PROJECT_DIR, '..', 'make-excel',
+                            'ITsTiM_Raspisanie_2_polugodie_25-26_mag__pechat.xlsx')
+BUNDLED_WORKBOOKS = [path for path in (BAK_WORKBOOK, MAG_WORKBOOK) if os.path.exists(path)]
+
+
+def build_workbook(path, cells, merges=()):
+    """
+    生成一个结构与真实课程表相同的小工作簿：
+    第3行为组别表头（C列 ПМ-11，D列 ИиВТ-11），A列为星期，B列为时间，
+    每个时间段两行（分子周、分母周）
+    """
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet['C3'] = 'ПМ-11'
+    sheet['D3'] = 'ИиВТ-11'
+    sheet['E3'] = 'День'
+    sheet['A5'] = 'П О Н Е Д Е Л Ь Н И К'
+    for row, time in ((5, '1-2\nс 8.30'), (7, '3-4\nс 10.15'), (9, '5-6\nс 12.30')):
+        sheet.cell(row, 2, time)
+        sheet.merge_cells(start_row=row, start_column=2, end_row=row + 1, end_column=2)
+    for ref, value in cells.items():
+        sheet[ref] = value
+    for ref in merges:
+        sheet.merge_cells(ref)
+    workbook.save(path)
+
+
+def entry(day='Понедельник', time='1-2', subject='Физика', teacher='Иванов И.И.', room='4-27',
+          group='ПМ-11', activity_type='лекция', week=''):
+    """测试用课程条目"""
+    return ScheduleEntry(day, time, subject, teacher, room, group, activity_type, week)
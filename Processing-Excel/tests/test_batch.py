@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多工作簿并行处理测试用例
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from schedule_fixtures import build_workbook, entry
+from schedule_processor import load_workbooks, merge_schedules
+
+
+class TestMergeSchedules(unittest.TestCase):
+    """教师视图合并测试"""
+
+    def test_same_teacher_across_workbooks(self):
+        """同一位教师在不同工作簿中的课程合并到一起，完全相同的条目只保留一次"""
+        first = {'Иванов И.И.': [entry(), entry(time='3-4')]}
+        second = {
+            'Иванов И.И.': [entry(), entry(day='Вторник', group='ИиВТ-11')],
+            'Петров А.Б.': [entry(teacher='Петров А.Б.')],
+        }
+        merged = merge_schedules([first, second])
+        self.assertEqual(list(merged), ['Иванов И.И.', 'Петров А.Б.'])
+        self.assertEqual(merged['Иванов И.И.'],
+                         [entry(), entry(time='3-4'), entry(day='Вторник', group='ИиВТ-11')])
+
+
+class TestLoadWorkbooks(unittest.TestCase):
+    """并行读取测试"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.paths = [os.path.join(self.temp_dir, name) for name in ('bak.xlsx', 'mag.xlsx')]
+        build_workbook(self.paths[0], {
+            'C5': 'Физика (лк)\nИванов И.И. 4-27',
+            'D7': 'Химия (лб)\nПетров А.Б. 4-15',
+        })
+        build_workbook(self.paths[1], {
+            'C5': 'Физика (лк)\nИванов И.И. 4-27',
+            'C9': 'История (пз)\nСидоров В.Г. 4-23',
+        })
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_parallel_matches_serial(self):
+        """进程池解析的结果与逐个解析相同，教师为所有工作簿的并集"""
+        serial = load_workbooks(self.paths, workers=1)
+        parallel = load_workbooks(self.paths, workers=2)
+        self.assertEqual(parallel, serial)
+        teachers, schedules = parallel
+        self.assertEqual(teachers, ['Иванов И.И.', 'Петров А.Б.', 'Сидоров В.Г.'])
+        self.assertEqual(len(schedules['Иванов И.И.']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+冲突检测测试用例
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from schedule_fixtures import MAG_WORKBOOK, build_workbook, entry
+from schedule_processor import ExcelReader, WEEK_NUMERATOR, WEEK_DENOMINATOR
+from conflict_detector import find_conflicts
+
+
+class TestConflicts(unittest.TestCase):
+    """冲突检测测试"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'schedule.xlsx')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def schedules(self, cells, merges=()):
+        build_workbook(self.path, cells, merges)
+        reader = ExcelReader(self.path)
+        reader.load()
+        return reader.get_all_schedules()
+
+    def test_week_and_group_recorded(self):
+        """单元格所在的行决定分子周/分母周，列上方的表头决定组别"""
+        schedules = self.schedules({
+            'C5': 'Физика (лк)\nИванов И.И. 4-27',
+            'D6': 'История (пз)\nПетров А.Б. 4-27',
+            'C7': 'Химия (лк)\nСидоров В.Г. 4-15',
+        }, merges=['C7:C8'])
+        ivanov, = schedules['Иванов И.И.']
+        petrov, = schedules['Петров А.Б.']
+        sidorov, = schedules['Сидоров В.Г.']
+        self.assertEqual((ivanov.week, ivanov.group), (WEEK_NUMERATOR, 'ПМ-11'))
+        self.assertEqual((petrov.week, petrov.group), (WEEK_DENOMINATOR, 'ИиВТ-11'))
+        self.assertEqual((sidorov.week, sidorov.group), ('', 'ПМ-11'))
+
+    def test_double_booking_found(self):
+        """同一周同一时间同一教室的两门课程是冲突"""
+        schedules = self.schedules({
+            'C5': 'Физика (лк)\nИванов И.И. 4-27',
+            'D5': 'История (лк)\nПетров А.Б. 4-27',
+        })
+        conflicts = find_conflicts(schedules)
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual((conflicts[0].kind, conflicts[0].key, conflicts[0].week), ('room', '4-27', WEEK_NUMERATOR))
+        self.assertEqual({entry.teacher for entry in conflicts[0].entries}, {'Иванов И.И.', 'Петров А.Б.'})
+
+    def test_numerator_denominator_pair_not_conflict(self):
+        """分子周和分母周交替使用同一教室不是冲突"""
+        schedules = self.schedules({
+            'C7': 'Математика (лк)\nСидоров В.Г. 4-15',
+            'D8': 'Химия (лк)\nКузнецов Д.В. 4-15',
+        })
+        self.assertEqual(find_conflicts(schedules), [])
+
+    def test_every_week_lesson_conflicts_with_both_weeks(self):
+        """每周都上的课程与只在分母周上的课程在分母周冲突"""
+        schedules = self.schedules({
+            'C9': 'Математика (лк)\nСидоров В.Г. 4-15',
+            'D10': 'Химия (лк)\nКузнецов Д.В. 4-15',
+        }, merges=['C9:C10'])
+        conflicts = find_conflicts(schedules)
+        self.assertEqual([(conflict.kind, conflict.week) for conflict in conflicts], [('room', WEEK_DENOMINATOR)])
+
+    def test_same_slot_written_differently_across_workbooks(self):
+        """不同工作簿中空白写法不同的同一时间段按节次匹配"""
+        schedules = {
+            'Иванов И.И.': [entry(time='3-4 \nс 10.15')],
+            'Петров А.Б.': [entry(teacher='Петров А.Б.', subject='История', time='3-4\nс 10.15')],
+            'Сидоров В.Г.': [entry(teacher='Сидоров В.Г.', subject='Химия', time='5-6\nс 12.30')],
+        }
+        conflicts = find_conflicts(schedules)
+        self.assertEqual([(conflict.kind, conflict.time) for conflict in conflicts], [('room', '3-4 с 10.15')])
+        self.assertEqual({e.teacher for e in conflicts[0].entries}, {'Иванов И.И.', 'Петров А.Б.'})
+
+    @unittest.skipUnless(os.path.exists(MAG_WORKBOOK), '缺少示例工作簿')
+    def test_bundled_alternating_lessons_not_conflict(self):
+        """示例工作簿中周二9-10节4-15教室的分子周、分母周课程不是冲突"""
+        reader = ExcelReader(MAG_WORKBOOK)
+        reader.load()
+        conflicts = find_conflicts(reader.get_all_schedules())
+        for conflict in conflicts:
+            teachers = {entry.teacher for entry in conflict.entries}
+            self.assertFalse({'Алмазова И.Г.', 'Саввина О.А.'} <= teachers, conflict)
+
+
+if __name__ == '__main__':
+    unittest.main()
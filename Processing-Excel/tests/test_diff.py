@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+版本比较测试用例
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from schedule_fixtures import build_workbook, entry
+from schedule_processor import (ExcelReader, diff_schedules, load_workbooks,
+                                WEEK_NUMERATOR, WEEK_DENOMINATOR)
+
+
+class TestDiff(unittest.TestCase):
+    """版本比较测试"""
+
+    def test_added_removed_and_changed(self):
+        """同一时间段的删除与增加配对为修改，其余为增加或删除"""
+        old = {
+            'Иванов И.И.': [entry(), entry(time='3-4', subject='Химия')],
+            'Петров А.Б.': [entry(teacher='Петров А.Б.')],
+        }
+        new = {
+            'Иванов И.И.': [entry(room='4-15'), entry(time='5-6', subject='Биология')],
+            'Петров А.Б.': [entry(teacher='Петров А.Б.')],
+            'Сидоров В.Г.': [entry(teacher='Сидоров В.Г.')],
+        }
+        diffs = diff_schedules(old, new)
+        self.assertEqual(list(diffs), ['Иванов И.И.', 'Сидоров В.Г.'])
+        ivanov = diffs['Иванов И.И.']
+        self.assertEqual(ivanov.changed, [(entry(), entry(room='4-15'))])
+        self.assertEqual(ivanov.added, [entry(time='5-6', subject='Биология')])
+        self.assertEqual(ivanov.removed, [entry(time='3-4', subject='Химия')])
+        self.assertEqual(diffs['Сидоров В.Г.'].added, [entry(teacher='Сидоров В.Г.')])
+
+    def test_different_weeks_not_paired(self):
+        """分子周的课程被删除、分母周的课程被增加时不配对为修改"""
+        diffs = diff_schedules({'Иванов И.И.': [entry(week=WEEK_NUMERATOR)]},
+                               {'Иванов И.И.': [entry(week=WEEK_DENOMINATOR)]})
+        self.assertEqual(diffs['Иванов И.И.'].changed, [])
+        self.assertEqual(len(diffs['Иванов И.И.'].added), 1)
+        self.assertEqual(len(diffs['Иванов И.И.'].removed), 1)
+
+
+class TestRevisions(unittest.TestCase):
+    """版本记录测试"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_parallel_load_records_every_workbook(self):
+        """并行解析多个工作簿时，每个工作簿的版本都记录下来，上一个版本可以从缓存读取"""
+        paths = [os.path.join(self.temp_dir, f'schedule{i}.xlsx') for i in range(4)]
+        for i, path in enumerate(paths):
+            build_workbook(path, {'C5': f'Физика (лк)\nИванов И.И. 4-2{i}'})
+        load_workbooks(paths, workers=4, cache_dir=self.cache_dir)
+
+        build_workbook(paths[0], {'C5': 'Физика (лк)\nИванов И.И. 4-99'})
+        load_workbooks(paths, workers=4, cache_dir=self.cache_dir)
+
+        readers = []
+        for path in paths:
+            reader = ExcelReader(path, self.cache_dir)
+            reader.load()
+            readers.append(reader)
+        self.assertIsNotNone(readers[0].previous_hash)
+        self.assertEqual([reader.previous_hash for reader in readers[1:]], [None] * 3)
+        previous = ExcelReader.from_cache(self.cache_dir, readers[0].previous_hash)
+        self.assertEqual(previous.get_all_schedules()['Иванов И.И.'][0].room, '4-20')
+
+
+if __name__ == '__main__':
+    unittest.main()
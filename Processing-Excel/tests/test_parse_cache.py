@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解析缓存测试用例
+"""
+
+import gzip
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from schedule_fixtures import build_workbook
+from schedule_processor import ExcelReader
+
+
+class TestParseCache(unittest.TestCase):
+    """解析缓存测试"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, 'cache')
+        self.path = os.path.join(self.temp_dir, 'schedule.xlsx')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def load(self):
+        reader = ExcelReader(self.path, self.cache_dir)
+        reader.load()
+        return reader
+
+    def test_unchanged_workbook_loaded_from_cache(self):
+        """内容未变化时直接使用缓存，不再打开工作簿"""
+        build_workbook(self.path, {'C5': 'Физика (лк)\nИванов И.И. 4-27'})
+        first = self.load()
+        schedules = first.get_all_schedules()
+
+        second = self.load()
+        self.assertIsNone(second.workbook)
+        self.assertEqual(second.get_all_schedules(), schedules)
+
+    def test_changed_workbook_parsed_again(self):
+        """内容变化后按新的哈希重新解析"""
+        build_workbook(self.path, {'C5': 'Физика (лк)\nИванов И.И. 4-27'})
+        first_hash = self.load().file_hash
+        build_workbook(self.path, {'C5': 'Физика (лк)\nИванов И.И. 4-15'})
+        reader = self.load()
+        self.assertIsNotNone(reader.workbook)
+        self.assertNotEqual(reader.file_hash, first_hash)
+        self.assertEqual(reader.previous_hash, first_hash)
+        self.assertEqual(reader.get_all_schedules()['Иванов И.И.'][0].room, '4-15')
+
+
+    def test_stale_cache_ignored(self):
+        """缓存版本号不符或文件损坏时重新解析工作簿"""
+        build_workbook(self.path, {'C5': 'Физика (лк)\nИванов И.И. 4-27'})
+        cache_path = self.load()._cache_path
+        with gzip.open(cache_path, 'wb') as f:
+            pickle.dump((ExcelReader.PARSER_VERSION - 1, [], {}), f)
+        reader = self.load()
+        self.assertIsNotNone(reader.workbook)
+        self.assertEqual(reader.get_all_teachers(), ['Иванов И.И.'])
+
+        with open(cache_path, 'wb') as f:
+            f.write(b'broken')
+        reader = self.load()
+        self.assertIsNotNone(reader.workbook)
+        self.assertEqual(reader.get_all_teachers(), ['Иванов И.И.'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PDF生成测试用例
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pdf_generator import (FontRegistry, MANIFEST_NAME, PDFGenerator, create_teacher_pdfs,
+                           teacher_pdf_name)
+from schedule_processor import ScheduleEntry
+
+
+class TestFontRegistry(unittest.TestCase):
+    """字体注册表测试"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_font_path_cached_in_configured_dir(self):
+        """字体路径缓存写入指定的缓存目录，未指定目录时不写磁盘"""
+        registry = FontRegistry()
+        registry.configure(None)
+        self.assertIsNone(registry._cached_font_path())
+        registry._save_font_path(__file__)
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+        registry.configure(self.temp_dir)
+        registry._save_font_path(__file__)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, FontRegistry.CACHE_NAME)))
+        self.assertEqual(registry._cached_font_path(), __file__)
+
+    def test_styles_built_once_and_shared(self):
+        """样式表只构建一次，所有PDFGenerator实例共用同一份"""
+        registry = FontRegistry()
+        font_name, styles = registry.get()
+        self.assertIs(registry.get()[1], styles)
+        self.assertEqual(registry.get()[0], font_name)
+
+        first = PDFGenerator(os.path.join(self.temp_dir, 'a.pdf'))
+        second = PDFGenerator(os.path.join(self.temp_dir, 'b.pdf'))
+        self.assertIs(first.styles, second.styles)
+        self.assertEqual(first.font_name, second.font_name)
+
+
+class TestIncrementalPdfs(unittest.TestCase):
+    """按教师增量生成PDF测试"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.schedules = {
+            teacher: [ScheduleEntry('Понедельник', '1-2', 'Физика', teacher, '4-27', 'ПМ-11', 'лекция')]
+            for teacher in ('Иванов И.И.', 'Петров А.Б.')
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def manifest(self):
+        with open(os.path.join(self.temp_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_only_changed_teachers_rendered(self):
+        """增量模式只在进程池中重新生成课程哈希变化的教师"""
+        schedules = dict(self.schedules)
+        schedules['Сидоров В.Г.'] = [ScheduleEntry('Среда', '3-4', 'Химия', 'Сидоров В.Г.', '4-15', 'ИБ-11', 'лекция')]
+        paths = create_teacher_pdfs(schedules, self.temp_dir, workers=2, incremental=True)
+        self.assertEqual(list(paths), list(schedules))
+        # 把已生成文件的修改时间调早，便于判断是否被重写
+        for path in paths.values():
+            self.assertTrue(os.path.getsize(path) > 0)
+            os.utime(path, (0, 0))
+
+        changed = ('Иванов И.И.', 'Сидоров В.Г.')
+        for teacher in changed:
+            entry = schedules[teacher][0]
+            schedules[teacher] = [ScheduleEntry(entry.day, entry.time, entry.subject, teacher,
+                                                '4-99', entry.group, entry.activity_type)]
+        create_teacher_pdfs(schedules, self.temp_dir, workers=2, incremental=True)
+
+        rewritten = {teacher for teacher, path in paths.items() if os.path.getmtime(path) > 0}
+        self.assertEqual(rewritten, set(changed))
+
+    def test_removed_teacher_pruned(self):
+        """已不在课程表中的教师，其PDF和清单记录被删除"""
+        create_teacher_pdfs(self.schedules, self.temp_dir, workers=1, incremental=True, prune=True)
+        stale = os.path.join(self.temp_dir, teacher_pdf_name('Петров А.Б.'))
+        self.assertTrue(os.path.exists(stale))
+
+        remaining = {'Иванов И.И.': self.schedules['Иванов И.И.']}
+        create_teacher_pdfs(remaining, self.temp_dir, workers=1, incremental=True, prune=True)
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, teacher_pdf_name('Иванов И.И.'))))
+        self.assertEqual(list(self.manifest()), ['Иванов И.И.'])
+
+    def test_partial_run_keeps_other_teachers(self):
+        """只生成部分教师时（prune=False）保留其他教师的PDF和清单记录"""
+        create_teacher_pdfs(self.schedules, self.temp_dir, workers=1, incremental=True, prune=True)
+        create_teacher_pdfs({'Иванов И.И.': self.schedules['Иванов И.И.']}, self.temp_dir,
+                            workers=1, incremental=True)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, teacher_pdf_name('Петров А.Б.'))))
+        self.assertEqual(sorted(self.manifest()), sorted(self.schedules))
+
+
+if __name__ == '__main__':
+    unittest.main()
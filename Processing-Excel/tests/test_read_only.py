@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+只读流式解析测试用例
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from schedule_fixtures import BUNDLED_WORKBOOKS, build_workbook
+from schedule_processor import ExcelReader
+
+
+@unittest.skipUnless(BUNDLED_WORKBOOKS, '缺少示例工作簿')
+class TestReadModes(unittest.TestCase):
+    """只读流式模式与完整加载模式的解析结果一致"""
+
+    @classmethod
+    def setUpClass(cls):
+        # 完整加载较慢，每个工作簿只解析一次
+        cls.full = {path: cls.parse(path, False) for path in BUNDLED_WORKBOOKS}
+
+    @staticmethod
+    def parse(path, read_only):
+        reader = ExcelReader(path)
+        reader.load(read_only=read_only)
+        return reader.get_all_teachers(), reader.get_all_schedules()
+
+    def test_read_only_matches_full_load(self):
+        for path in BUNDLED_WORKBOOKS:
+            with self.subTest(path=os.path.basename(path)):
+                teachers, schedules = self.parse(path, True)
+                self.assertTrue(schedules)
+                self.assertEqual((teachers, schedules), self.full[path])
+
+    def test_fallback_without_private_attributes(self):
+        """openpyxl没有只读模式依赖的私有属性时退回完整加载，结果不变"""
+        path = BUNDLED_WORKBOOKS[0]
+        reader = ExcelReader(path)
+        reader.load()
+        del reader.worksheet._worksheet_path
+        schedules = reader.get_all_schedules()
+        self.assertFalse(reader.read_only)
+        self.assertEqual(schedules, self.full[path][1])
+
+
+class TestMergedRanges(unittest.TestCase):
+    """只读模式从工作表XML读取合并区域"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'schedule.xlsx')
+        build_workbook(self.path, {
+            'C5': 'Физика (лк)\nИванов И.И. 4-27',
+            'C7': 'Химия (лк)\nПетров А.Б. 4-15',
+        }, merges=['C5:D5', 'C7:D8'])
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_rows_match_full_load(self):
+        """合并区域中非左上角的单元格与完整加载模式一样为空"""
+        readers = []
+        for read_only in (True, False):
+            reader = ExcelReader(self.path)
+            reader.load(read_only=read_only)
+            readers.append(reader)
+        read_only, full = readers
+        self.assertEqual(sorted(read_only._merged_ranges()), sorted(full._merged_ranges()))
+        ranges = read_only._merged_ranges()
+        rows = [list(row) for row in read_only._iter_rows(ranges)]
+        expected = [list(row) for row in full._iter_rows(full._merged_ranges())]
+        self.assertEqual(rows, expected)
+        self.assertEqual(rows[6][2:4], ['Химия (лк)\nПетров А.Б. 4-15', None])
+        self.assertEqual(rows[7][2:4], [None, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
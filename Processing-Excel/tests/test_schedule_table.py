@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列式课程表测试用例
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from schedule_fixtures import entry
+from schedule_processor import WEEK_NUMERATOR, WEEK_DENOMINATOR
+from schedule_table import ScheduleTable
+
+
+class TestScheduleTable(unittest.TestCase):
+    """列式课程表测试"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.schedules = {
+            'Иванов И.И.': [entry(), entry(day='Вторник', room='4-15'),
+                            entry(time='3-4', week=WEEK_NUMERATOR)],
+            'Петров А.Б.': [entry(teacher='Петров А.Б.', time='3-4', week=WEEK_DENOMINATOR)],
+        }
+        self.table = ScheduleTable.from_schedules(self.schedules)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_statistics(self):
+        self.assertEqual(len(self.table), 4)
+        self.assertEqual(self.table.teacher_count(), 2)
+        self.assertEqual(self.table.lessons_per_teacher(), {'Иванов И.И.': 3, 'Петров А.Б.': 1})
+        load = self.table.teacher_load_by_day()
+        self.assertEqual(self.table.categories['day'], ['Понедельник', 'Вторник'])
+        self.assertEqual(load.tolist(), [[2, 1], [1, 0]])
+        # 4-27 教室在周一1-2节和3-4节被占用（分子周、分母周算同一时间段）
+        self.assertEqual(self.table.room_occupancy(), {'4-27': 2, '4-15': 1})
+
+    def test_npz_round_trip(self):
+        path = os.path.join(self.temp_dir, 'table.npz')
+        self.table.save(path)
+        loaded = ScheduleTable.load(path)
+        self.assertEqual(loaded.categories, self.table.categories)
+        for column, codes in self.table.codes.items():
+            np.testing.assert_array_equal(loaded.codes[column], codes)
+        self.assertEqual(list(loaded.decode('week')), ['', '', WEEK_NUMERATOR, WEEK_DENOMINATOR])
+
+    def test_load_file_without_week_column(self):
+        """较早版本导出的文件没有 week 列"""
+        path = os.path.join(self.temp_dir, 'old.npz')
+        payload = {}
+        for column in ('day', 'time', 'subject', 'teacher', 'room', 'group', 'activity_type'):
+            payload[f'{column}_codes'] = self.table.codes[column]
+            payload[f'{column}_categories'] = np.asarray(self.table.categories[column], dtype=str)
+        np.savez_compressed(path, **payload)
+        loaded = ScheduleTable.load(path)
+        self.assertEqual(list(loaded.decode('week')), [''] * 4)
+        self.assertEqual(loaded.lessons_per_teacher(), self.table.lessons_per_teacher())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单次扫描教师索引测试用例
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from schedule_fixtures import BUNDLED_WORKBOOKS, build_workbook
+from schedule_processor import ExcelReader
+
+
+class TestTeacherIndex(unittest.TestCase):
+    """教师倒排索引测试"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'schedule.xlsx')
+        build_workbook(self.path, {
+            'C5': 'Физика (лк)\nИванов И.И. 4-27',
+            'D5': 'Физика (лк)\nИванов И.И. 4-27',
+            'C7': 'Химия (пз)\nИванов И.И., Петров А.Б. 4-15',
+            'D9': 'История (лб)\nПетров А.Б. ГК-300',
+        })
+        self.reader = ExcelReader(self.path)
+        self.reader.load()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_each_cell_parsed_once(self):
+        """每个课程单元格只记录一次，教师索引指向其所在的单元格"""
+        self.assertEqual(self.reader.get_all_teachers(), ['Иванов И.И.', 'Петров А.Б.'])
+        self.assertEqual(len(self.reader._cells), 4)
+        self.assertEqual(self.reader._teacher_index['Иванов И.И.'], [0, 1, 2])
+        self.assertEqual(self.reader._teacher_index['Петров А.Б.'], [2, 3])
+
+    def test_same_lesson_in_several_groups_merged(self):
+        """同一节课出现在多个组别列中时合并为一个条目"""
+        physics, chemistry = self.reader.get_teacher_schedule('Иванов И.И.')
+        self.assertEqual((physics.subject, physics.group), ('Физика', 'ПМ-11, ИиВТ-11'))
+        self.assertEqual((chemistry.subject, chemistry.room, chemistry.activity_type),
+                         ('Химия', '4-15', 'практическое'))
+
+    def test_shared_cell_in_every_teacher_schedule(self):
+        """多位教师共同授课的单元格出现在每位教师的课程表中"""
+        schedules = self.reader.get_all_schedules()
+        self.assertEqual([e.subject for e in schedules['Петров А.Б.']], ['Химия', 'История'])
+        self.assertEqual(schedules['Петров А.Б.'][1].room, 'ГК-300')
+
+    def test_partial_name_falls_back_to_substring(self):
+        """不是完整姓名时按子串匹配已索引的单元格"""
+        self.assertEqual([e.subject for e in self.reader.get_teacher_schedule('Петров')], ['Химия', 'История'])
+        self.assertEqual(self.reader.get_teacher_schedule('Сидоров'), [])
+
+    @unittest.skipUnless(BUNDLED_WORKBOOKS, '缺少示例工作簿')
+    def test_index_matches_substring_scan(self):
+        """示例工作簿中按索引得到的课程与逐个单元格查找教师姓名的结果一致"""
+        reader = ExcelReader(BUNDLED_WORKBOOKS[0])
+        reader.load()
+        schedules = reader.get_all_schedules()
+        self.assertTrue(schedules)
+        for teacher, entries in schedules.items():
+            cell_ids = [i for i, record in enumerate(reader._cells) if teacher in record[4]]
+            self.assertEqual(reader._teacher_index[teacher], cell_ids, teacher)
+
+
+if __name__ == '__main__':
+    unittest.main()
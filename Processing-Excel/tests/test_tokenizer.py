@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单元格词法分析测试用例
+"""
+
+import unittest
+
+from schedule_fixtures import BUNDLED_WORKBOOKS
+from schedule_processor import tokenize_cell
+from benchmark_parser import collect_cells, legacy_parse
+
+
+class TestTokenizer(unittest.TestCase):
+    """单元格词法分析测试"""
+
+    def test_cell_fields(self):
+        """一次扫描识别教师、教室、课程类型和科目"""
+        names, parsed = tokenize_cell('Физика (лк)\nКузнецов Д.В. 4-23')
+        self.assertEqual(names, ('Кузнецов Д.В.',))
+        self.assertEqual(parsed, {'teacher': 'Кузнецов Д.В.', 'room': '4-23',
+                                  'subject': 'Физика', 'activity_type': 'лекция'})
+
+    def test_several_teachers_and_letter_room(self):
+        """多位教师全部返回；没有数字教室时使用字母教室"""
+        names, parsed = tokenize_cell('Программирование (лб)\nЧерепков А.В., Бунеев С.Д. ГК-300')
+        self.assertEqual(names, ('Черепков А.В.', 'Бунеев С.Д.'))
+        self.assertEqual((parsed['room'], parsed['activity_type']), ('ГК-300', 'лабораторная'))
+
+    def test_lecture_has_priority(self):
+        """同一单元格有多种课程类型时按 лекция、практическое、лабораторная 的顺序取"""
+        _, parsed = tokenize_cell('История (пз) (ЛЕКЦИЯ)\nЩукин Д.В. 4-27')
+        self.assertEqual(parsed['activity_type'], 'лекция')
+
+    @unittest.skipUnless(BUNDLED_WORKBOOKS, '缺少示例工作簿')
+    def test_matches_legacy_parser(self):
+        """示例工作簿中所有单元格的解析结果与旧的逐项正则实现一致"""
+        for cell in set(collect_cells(BUNDLED_WORKBOOKS)):
+            self.assertEqual(tokenize_cell.__wrapped__(cell), legacy_parse(cell), cell)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量转换模块
+在常驻的工作进程池中转换目录或通配符匹配的所有文档，
+每个文件单独计时和隔离失败，最后生成JSON汇总报告
+"""
+
+import os
+import io
+import glob
+import time
+import signal
+import contextlib
+import multiprocessing
+from multiprocessing.connection import wait
+from typing import Dict, List, Any, Optional, Tuple
+
+SUPPORTED_EXTENSIONS = ('.doc', '.docx', '.pdf')
+
+
+def collect_inputs(patterns: List[str]) -> List[Tuple[str, str]]:
+    """
+    展开目录、通配符和文件路径，保持顺序并去重
+
+    Args:
+        patterns: 目录、通配符或文件路径列表
+
+    Returns:
+        List[Tuple]: (输入文件路径, 相对名称) 列表；目录中的文件相对名称保留子目录结构
+    """
+    inputs = []
+    seen = set()
+
+    def add(path, relative):
+        key = os.path.abspath(path)
+        if key not in seen and path.lower().endswith(SUPPORTED_EXTENSIONS):
+            seen.add(key)
+            inputs.append((path, relative))
+
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, files in os.walk(pattern):
+                dirs.sort()
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    add(path, os.path.relpath(path, pattern))
+        else:
+            matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+            for path in matches:
+                if os.path.isfile(path):
+                    add(path, os.path.basename(path))
+    return inputs
+
+
+def batch_output_path(input_file: str, relative: str, output_dir: Optional[str] = None) -> str:
+    """
+    确定批量模式下的输出路径：指定输出目录时按相对名称放入该目录，否则放在输入文件旁边
+
+    Args:
+        input_file: 输入文件路径
+        relative: collect_inputs() 返回的相对名称
+        output_dir: 输出目录
+
+    Returns:
+        str: 输出文件路径
+    """
+    if output_dir:
+        return os.path.join(output_dir, os.path.splitext(relative)[0] + '_presentation.pptx')
+    return os.path.splitext(input_file)[0] + '_presentation.pptx'
+
+
+def _worker_main(conn, options: Dict[str, Any]):
+    """
+    工作进程：只导入一次依赖库并复用读取器、分析器和生成器，逐个处理父进程发送的文件
+
+    Args:
+        conn: 与父进程通信的管道
+        options: 转换选项（max_slides、style_options、cache_dir、cache_size、fast_docx），
+            可被每个任务附带的选项覆盖（max_slides、style_options）
+    """
+    from document_reader import DocumentReader
+    from content_analyzer import ContentAnalyzer
+    from presentation_generator import PresentationGenerator
+    from conversion_cache import ConversionCache
+
+    # Ctrl+C 由父进程处理（终止或替换工作进程），工作进程自身忽略
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    reader = DocumentReader(fast_docx=options.get('fast_docx', False))
+    analyzer = ContentAnalyzer()
+    generator = PresentationGenerator()
+    cache = None
+    if options.get('cache_dir'):
+        cache = ConversionCache(options['cache_dir'], options['cache_size'])
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+
+        input_file, output_file, overrides = task
+        job_options = dict(options, **(overrides or {}))
+        start = time.time()
+        result = {'status': 'ok', 'error': None}
+        try:
+            # 各模块的进度输出在批量模式下没有意义，丢弃
+            with contextlib.redirect_stdout(io.StringIO()):
+                file_hash = cache.file_hash(input_file) if cache else None
+                cached = cache.get(file_hash) if cache else None
+                if cached:
+                    content_blocks = cached[1]
+                else:
+                    document_data = reader.read(input_file)
+                    content_blocks = analyzer.analyze(document_data)
+                    if cache:
+                        cache.put(file_hash, document_data, content_blocks)
+
+                result['blocks'] = len(content_blocks)
+                content_blocks = content_blocks[:job_options['max_slides']]
+                output_dir = os.path.dirname(output_file)
+                if output_dir:
+                    os.makedirs(output_dir, exist_ok=True)
+                generator.generate(content_blocks, output_file, job_options.get('style_options'))
+        except Exception as e:
+            result = {'status': 'error', 'error': f"{type(e).__name__}: {str(e)}"}
+        result['seconds'] = round(time.time() - start, 3)
+        conn.send(result)
+
+
+class WorkerProcess:
+    """
+    一个常驻工作进程及其管道
+    """
+
+    def __init__(self, context, options: Dict[str, Any]):
+        self.context = context
+        self.options = options
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, options), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task = None     # 正在处理的文件记录
+        self.started = None  # 开始处理的时间
+
+    def stop(self, force: bool = False):
+        if force:
+            self.process.terminate()
+        else:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+    def send(self, input_file: str, output_file: str, job_options: Optional[Dict[str, Any]] = None):
+        """
+        把一个文件交给工作进程（不等待结果）
+        """
+        self.started = time.time()
+        self.conn.send((input_file, output_file, job_options))
+
+    def run(self, input_file: str, output_file: str, job_options: Optional[Dict[str, Any]] = None,
+            timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        转换一个文件并等待结果；超时或进程崩溃时替换为新的工作进程
+
+        Args:
+            input_file: 输入文件路径
+            output_file: 输出文件路径
+            job_options: 覆盖默认值的转换选项（max_slides、style_options）
+            timeout: 超时时间（秒），None表示不限制
+
+        Returns:
+            Dict: 结果（status为 ok/error/timeout/crashed，以及 seconds、error 等）
+        """
+        self.send(input_file, output_file, job_options)
+        ready = wait([self.conn, self.process.sentinel], timeout)
+        if self.conn in ready:
+            try:
+                return self.conn.recv()
+            except (EOFError, OSError):
+                pass
+        result = self.failure(bool(ready), timeout)
+        self.restart()
+        return result
+
+    def failure(self, crashed: bool, timeout: Optional[float]) -> Dict[str, Any]:
+        """
+        崩溃或超时的结果记录
+        """
+        if crashed:
+            return {'status': 'crashed', 'seconds': round(time.time() - self.started, 3),
+                    'error': f"工作进程异常退出 (exitcode={self.process.exitcode})"}
+        return {'status': 'timeout', 'seconds': timeout, 'error': f"超过 {timeout} 秒未完成"}
+
+    def restart(self):
+        """
+        强制终止当前进程并启动新的工作进程
+        """
+        self.stop(force=True)
+        self.__init__(self.context, self.options)
+
+
+def convert_batch(inputs: List[Tuple[str, str]], output_dir: Optional[str] = None, workers: Optional[int] = None,
+                  timeout: Optional[float] = 300, max_slides: int = 50, style_options: Dict[str, Any] = None,
+                  cache_dir: Optional[str] = None, cache_size: int = 500 * 1024 * 1024,
+                  fast_docx: bool = False, verbose: bool = False) -> Dict[str, Any]:
+    """
+    在工作进程池中批量转换文档
+
+    每个工作进程常驻并依次处理多个文件，避免重复导入python-docx、python-pptx等库。
+    单个文件超时或导致工作进程崩溃时，只记录该文件失败，终止并替换对应的工作进程，
+    其他文件继续转换。
+
+    Args:
+        inputs: collect_inputs() 返回的输入列表
+        output_dir: 输出目录，None时输出到输入文件旁边
+        workers: 工作进程数，默认为CPU核心数
+        timeout: 单个文件的超时时间（秒），None表示不限制
+        max_slides: 最大顶层内容块数量
+        style_options: 样式优化选项
+        cache_dir: 转换缓存目录，None表示不使用缓存
+        cache_size: 缓存总大小上限（字节）
+        fast_docx: 是否使用DOCX快速读取
+        verbose: 是否逐个打印文件结果
+
+    Returns:
+        Dict: 汇总报告（可直接序列化为JSON）
+    """
+    start = time.time()
+    workers = max(1, min(workers or os.cpu_count() or 1, len(inputs)))
+    options = {
+        'max_slides': max_slides,
+        'style_options': style_options,
+        'cache_dir': cache_dir,
+        'cache_size': cache_size,
+        'fast_docx': fast_docx,
+    }
+    context = multiprocessing.get_context()
+
+    records = [{'input': input_file, 'output': batch_output_path(input_file, relative, output_dir)}
+               for input_file, relative in inputs]
+    pending = list(reversed(records))
+    pool = [WorkerProcess(context, options) for _ in range(workers)] if records else []
+
+    def finish(worker, result):
+        worker.task.update(result)
+        if verbose:
+            mark = '✓' if result['status'] == 'ok' else '✗'
+            detail = f" - {result['error']}" if result.get('error') else ''
+            print(f"{mark} {worker.task['input']} ({result.get('seconds', 0):.2f} 秒){detail}")
+        worker.task = None
+
+    try:
+        while pending or any(worker.task for worker in pool):
+            # 给空闲的工作进程分配文件
+            for worker in pool:
+                if worker.task is None and pending:
+                    worker.task = pending.pop()
+                    worker.send(worker.task['input'], worker.task['output'])
+
+            busy = [worker for worker in pool if worker.task]
+            wait_time = None
+            if timeout:
+                wait_time = max(0.0, min(worker.started for worker in busy) + timeout - time.time())
+            ready = wait([worker.conn for worker in busy] + [worker.process.sentinel for worker in busy], wait_time)
+
+            now = time.time()
+            for worker in busy:
+                if worker.conn in ready:
+                    try:
+                        finish(worker, worker.conn.recv())
+                        continue
+                    except (EOFError, OSError):
+                        pass
+                crashed = worker.conn in ready or worker.process.sentinel in ready
+                if crashed or (timeout and now - worker.started >= timeout):
+                    finish(worker, worker.failure(crashed, timeout))
+                    worker.restart()
+    finally:
+        for worker in pool:
+            worker.stop(force=worker.task is not None)
+
+    counts = {}
+    for record in records:
+        counts[record['status']] = counts.get(record['status'], 0) + 1
+    return {
+        'total': len(records),
+        'succeeded': counts.get('ok', 0),
+        'failed': counts.get('error', 0),
+        'timed_out': counts.get('timeout', 0),
+        'crashed': counts.get('crashed', 0),
+        'workers': workers,
+        'elapsed_seconds': round(time.time() - start, 3),
+        'files': records,
+    }
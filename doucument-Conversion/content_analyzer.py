@@ -5,16 +5,32 @@
 负责识别文档中的标题、正文、图片、表格和公式，并进行组织
 """
 
-from typing import Dict, List, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+import bisect
+import heapq
+import math
 import re
 
+from text_summarizer import ExtractiveSummarizer
+
 
 class ContentAnalyzer:
     """
     内容分析器类，用于分析文档内容结构
     """
     
-    def __init__(self):
+    # 文本项少于该数量时不分片（进程间传输的开销大于并行的收益）
+    SHARD_MIN_ITEMS = 5000
+    
+    def __init__(self, workers: int = 1):
+        """
+        Args:
+            workers: 分析文本内容时并行处理分片的进程数，1为串行
+        """
+        self.workers = workers
+        self.summarizer = ExtractiveSummarizer()
         # 定义标题模式（用于PDF文档）
         self.title_patterns = [
             # 匹配类似 "1. 标题"、"2.1 子标题" 的格式
@@ -32,48 +48,184 @@ class ContentAnalyzer:
         ]
         # LaTeX公式提取模式
         self.latex_formula_pattern = re.compile(r'(\$[^$]*\$)')
+        # 数学符号：文本中出现两个及以上时视为公式
+        self.math_symbols = ['+', '-', '=', '×', '÷', 'π', '√', '∫', '∑', '∏', '^', '_']
+        
+        # 单次扫描的分类模式：标题模式合并为一个锚定的多选分支，
+        # 公式模式与"至少两个数学符号"（字符类）合并为一个搜索模式
+        self.heading_pattern = re.compile('|'.join(f'(?:{p.pattern})' for p in self.title_patterns))
+        symbol_class = '[' + ''.join(re.escape(symbol) for symbol in self.math_symbols) + ']'
+        self.formula_pattern = re.compile('|'.join(
+            [self.latex_formula_pattern.pattern]
+            + [p.pattern for p in self.formula_patterns]
+            + [f'{symbol_class}(?s:.*?){symbol_class}']
+        ))
     
     def analyze(self, document_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         分析文档内容，识别结构
         
+        文本、表格和图片分别生成内容块，三者各自已按阅读顺序排列，
+        按 DocumentReader 给出的阅读顺序编号（'order'）归并，不再整体排序。
+        
         Args:
             document_data: 从DocumentReader获取的文档数据
             
         Returns:
             List[Dict]: 结构化的内容块列表
         """
-        content_blocks = []
-        
-        # 分析文本内容
-        if 'content' in document_data:
-            content_blocks.extend(self._analyze_text_content(document_data['content']))
-        
         # 分析表格内容
-        if 'tables' in document_data and document_data['tables']:
-            content_blocks.extend(self._analyze_tables(document_data['tables']))
+        table_blocks = self._analyze_tables(document_data.get('tables') or [], document_data.get('table_orders'))
         
         # 分析图片内容
-        if 'images' in document_data and document_data['images']:
-            for img_idx, image_info in enumerate(document_data['images']):
-                content_blocks.append({
-                    'type': 'image',
-                    'path': image_info.get('path'),
-                    'description': image_info.get('description', ''),
-                    'position': image_info.get('position', len(content_blocks))
-                })
+        image_blocks = []
+        for image_info in document_data.get('images') or []:
+            image_blocks.append({
+                'type': 'image',
+                'path': image_info.get('path'),
+                'data': image_info.get('data'),  # 内存中的图片数据（DOCX/PDF），避免临时文件
+                'name': image_info.get('name'),
+                'page': image_info.get('page'),  # PDF图片所在页码
+                'description': image_info.get('description', ''),
+                'position': image_info.get('position'),
+                'order': image_info.get('order')
+            })
         
-        # 对内容块进行排序和组织
-        content_blocks = self._organize_content_blocks(content_blocks)
+        # 分析文本内容（表格和图片所在的位置结束正文段落）
+        content = document_data.get('content') or []
+        breaks = [block['order'] for block in heapq.merge(table_blocks, image_blocks, key=self._reading_order)
+                  if block['order'] is not None]
+        if self.workers > 1 and len(content) >= self.SHARD_MIN_ITEMS:
+            text_blocks = self._analyze_text_content_parallel(content, breaks)
+        else:
+            text_blocks = self._analyze_text_content(content, breaks)
         
-        return content_blocks
+        # 按阅读顺序归并并组织内容块
+        return self._organize_content_blocks(
+            heapq.merge(text_blocks, table_blocks, image_blocks, key=self._reading_order))
+    
+    @staticmethod
+    def _reading_order(block: Dict[str, Any]) -> float:
+        """
+        内容块的归并键：没有阅读顺序的内容块（手工构造的数据）排在最后，相互之间保持原顺序
+        """
+        order = block.get('order')
+        return math.inf if order is None else order
     
-    def _analyze_text_content(self, content: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def analyze_stream(self, elements: Iterable[Dict[str, Any]], window: int = 50) -> Iterator[Dict[str, Any]]:
+        """
+        流式分析：逐个消费 DocumentReader.iter_elements() 产生的元素，
+        每当一个章节（或章节外的内容块）完成时立即产出
+        
+        文本分组规则与 analyze() 相同（段落在标题、表格和图片处结束，公式不结束段落），
+        对同一文档，产出的内容块与 analyze() 的返回值只有以下区别：
+          - 连续超过 window 个正文段落时，每 window 个合并为一个段落块，而不是全部合并为一块；
+          - 单个章节超过 window 个内容块时先产出已完成的部分，
+            其余内容放入标记为 'continued' 的同名章节；
+          - 内容块不带阅读顺序编号（'order'）。
+        内存占用只与 window 有关。
+        
+        Args:
+            elements: 文档元素迭代器
+            window: 章节内缓存的最大内容块数（同时限制合并的段落数）
+            
+        Yields:
+            Dict: 组织后的内容块（章节或章节外的内容块）
+        """
+        current_section = None
+        current_title = None
+        current_paragraphs = []
+        ready = []  # 已完成、尚未产出的章节外内容块
+        table_index = 0
+        
+        def add_block(block):
+            if current_section is not None:
+                current_section['content'].append(block)
+            else:
+                ready.append(block)
+        
+        def flush_paragraphs():
+            if current_paragraphs:
+                add_block({
+                    'type': 'paragraph',
+                    'content': '\n'.join(current_paragraphs),
+                    'title': current_title
+                })
+                current_paragraphs.clear()
+        
+        for element in elements:
+            element_type = element.get('type')
+            
+            if element_type == 'table':
+                flush_paragraphs()
+                table_block = self._table_block(element['content'], table_index)
+                table_index += 1
+                if table_block:
+                    add_block(table_block)
+            elif element_type == 'image':
+                flush_paragraphs()
+                add_block({
+                    'type': 'image',
+                    'path': element.get('path'),
+                    'data': element.get('data'),
+                    'name': element.get('name'),
+                    'page': element.get('page'),
+                    'description': element.get('description', ''),
+                    'position': element.get('position')
+                })
+            elif (kind := self.classify(element)) == 'heading':
+                flush_paragraphs()
+                if current_section is not None and not self._is_empty_continuation(current_section):
+                    yield current_section
+                text = element['text']
+                current_title = text
+                current_section = {
+                    'type': 'section',
+                    'title': text,
+                    'level': self._determine_heading_level(text, element),
+                    'content': []
+                }
+            elif kind == 'formula':
+                # 与 _analyze_text_content 一致：公式不结束积累的段落
+                add_block(self._formula_block(element['text'], current_title))
+            else:
+                current_paragraphs.append(element['text'])
+                if len(current_paragraphs) >= window:
+                    flush_paragraphs()
+            
+            # 产出章节前已完成的内容块
+            while ready:
+                yield ready.pop(0)
+            
+            # 章节过大时先产出已完成部分
+            if current_section is not None and len(current_section['content']) >= window:
+                yield current_section
+                current_section = dict(current_section, content=[], continued=True)
+        
+        flush_paragraphs()
+        while ready:
+            yield ready.pop(0)
+        if current_section is not None and not self._is_empty_continuation(current_section):
+            yield current_section
+    
+    @staticmethod
+    def _is_empty_continuation(section: Dict[str, Any]) -> bool:
+        """
+        是否为没有内容的续接章节（不需要产出）
+        """
+        return section.get('continued', False) and not section['content']
+    
+    def _analyze_text_content(self, content: List[Dict[str, Any]],
+                              breaks: Optional[List[int]] = None) -> List[Dict[str, Any]]:
         """
         分析文本内容，识别标题和正文
         
+        每个内容块的 'order' 取其第一个文本项的阅读顺序。
+        
         Args:
             content: 文本内容列表
+            breaks: 表格和图片的阅读顺序（升序），积累的段落在这些位置结束，
+                使表格和图片能归并到正文之间
             
         Returns:
             List[Dict]: 分析后的内容块列表
@@ -81,69 +233,193 @@ class ContentAnalyzer:
         blocks = []
         current_paragraphs = []
         current_title = None
+        paragraph_order = None
+        breaks = breaks or []
+        next_break = 0
         
-        for item in content:
+        def flush_paragraphs():
+            if current_paragraphs:
+                blocks.append({
+                    'type': 'paragraph',
+                    'content': '\n'.join(current_paragraphs),
+                    'title': current_title,
+                    'order': paragraph_order
+                })
+                current_paragraphs.clear()
+        
+        for item, kind in zip(content, self.classify_batch(content)):
             text = item['text']
+            order = item.get('order')
             
-            # 检查是否包含公式
-            has_formula = self._contains_formula(text)
-            
-            # 判断是否为标题
-            is_heading = self._is_heading(item)
+            # 上一个文本项之后有表格或图片：先结束积累的段落
+            if order is not None and next_break < len(breaks) and breaks[next_break] < order:
+                flush_paragraphs()
+                next_break = bisect.bisect_left(breaks, order, next_break)
             
-            if is_heading:
+            if kind == 'heading':
                 # 如果当前有积累的段落，先将其添加为正文块
-                if current_paragraphs:
-                    blocks.append({
-                        'type': 'paragraph',
-                        'content': '\n'.join(current_paragraphs),
-                        'title': current_title
-                    })
-                    current_paragraphs = []
+                flush_paragraphs()
                 
                 # 将当前标题作为新的标题块
                 current_title = text
                 blocks.append({
                     'type': 'heading',
                     'content': text,
-                    'level': self._determine_heading_level(text, item)
+                    'level': self._determine_heading_level(text, item),
+                    'order': order
                 })
-            elif has_formula:
-                # 检查是否包含LaTeX公式
-                latex_matches = self.latex_formula_pattern.findall(text)
-                
-                if latex_matches:
-                    # 提取LaTeX公式
-                    formula_content = ' '.join(latex_matches)
-                    # 处理包含公式的内容
-                    blocks.append({
-                        'type': 'formula',
-                        'content': formula_content,
-                        'full_text': text,  # 保存完整文本
-                        'is_latex': True,
-                        'title': current_title
-                    })
-                else:
-                    # 处理包含其他类型公式的内容
-                    blocks.append({
-                        'type': 'formula',
-                        'content': text,
-                        'title': current_title
-                    })
+            elif kind == 'formula':
+                blocks.append(dict(self._formula_block(text, current_title), order=order))
             else:
                 # 积累正文段落
+                if not current_paragraphs:
+                    paragraph_order = order
                 current_paragraphs.append(text)
         
         # 添加最后积累的段落
-        if current_paragraphs:
-            blocks.append({
-                'type': 'paragraph',
-                'content': '\n'.join(current_paragraphs),
-                'title': current_title
-            })
+        flush_paragraphs()
+        
+        return blocks
+    
+    def _analyze_text_content_parallel(self, content: List[Dict[str, Any]],
+                                       breaks: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """
+        分片并行分析文本内容
+        
+        _analyze_text_content() 在遇到标题时会输出已积累的段落并重置当前标题，
+        所以从标题处切开的各分片互不依赖：按顺序拼接各分片的结果与串行分析完全一致。
         
+        Args:
+            content: 文本内容列表
+            breaks: 表格和图片的阅读顺序（升序）
+            
+        Returns:
+            List[Dict]: 分析后的内容块列表
+        """
+        shards = self._shard_content(content, math.ceil(len(content) / (self.workers * 4)))
+        if len(shards) < 2:
+            return self._analyze_text_content(content, breaks)
+        
+        blocks = []
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(shards))) as executor:
+            # map 按提交顺序返回结果，保证拼接顺序确定
+            for shard_blocks in executor.map(self._analyze_text_content, shards, repeat(breaks)):
+                blocks.extend(shard_blocks)
         return blocks
     
+    def _shard_content(self, content: List[Dict[str, Any]], shard_size: int) -> List[List[Dict[str, Any]]]:
+        """
+        在明确的标题处把文本内容切分为大约 shard_size 项的分片
+        
+        只使用不需要完整分类就能确定的标题（样式为标题、字号大于14或匹配编号标题模式）作为边界，
+        每个分片（除第一个外）都从标题开始。
+        
+        Args:
+            content: 文本内容列表
+            shard_size: 分片的目标大小
+            
+        Returns:
+            List[List[Dict]]: 分片列表，按顺序拼接即为原列表
+        """
+        heading_match = self.heading_pattern.match
+        shards = []
+        start = 0
+        for index in range(shard_size, len(content)):
+            if index - start < shard_size:
+                continue
+            item = content[index]
+            font_size = item.get('font_size')
+            if (item.get('type') == 'heading' or (font_size is not None and font_size > 14)
+                    or heading_match(item['text'])):
+                shards.append(content[start:index])
+                start = index
+        shards.append(content[start:])
+        return shards
+    
+    def _formula_block(self, text: str, current_title: str) -> Dict[str, Any]:
+        """
+        为包含公式的文本创建公式块
+        
+        Args:
+            text: 文本内容
+            current_title: 所属标题
+            
+        Returns:
+            Dict: 公式内容块
+        """
+        # 检查是否包含LaTeX公式
+        latex_matches = self.latex_formula_pattern.findall(text)
+        
+        if latex_matches:
+            # 提取LaTeX公式
+            formula_content = ' '.join(latex_matches)
+            # 处理包含公式的内容
+            return {
+                'type': 'formula',
+                'content': formula_content,
+                'full_text': text,  # 保存完整文本
+                'is_latex': True,
+                'title': current_title
+            }
+        
+        # 处理包含其他类型公式的内容
+        return {
+            'type': 'formula',
+            'content': text,
+            'title': current_title
+        }
+    
+    def classify(self, item: Dict[str, Any]) -> str:
+        """
+        一次判断文本项的类别，与先 _is_heading() 后 _contains_formula() 的结果相同
+        
+        标题只需一次锚定匹配（合并的标题模式）；其余文本只需一次搜索（合并的公式模式），
+        不再逐个执行多个正则并逐字符统计数学符号。
+        
+        Args:
+            item: 内容项
+            
+        Returns:
+            str: 'heading'、'formula' 或 'paragraph'
+        """
+        return self.classify_batch([item])[0]
+    
+    def classify_batch(self, items: List[Dict[str, Any]]) -> List[str]:
+        """
+        批量分类文本项
+        
+        Args:
+            items: 内容项列表
+            
+        Returns:
+            List[str]: 每一项的类别（'heading'、'formula' 或 'paragraph'）
+        """
+        heading_match = self.heading_pattern.match
+        formula_search = self.formula_pattern.search
+        kinds = []
+        append = kinds.append
+        for item in items:
+            text = item['text']
+            if item.get('type') == 'heading':
+                append('heading')
+                continue
+            font_size = item.get('font_size')
+            if font_size is not None and font_size > 14:
+                append('heading')
+                continue
+            if heading_match(text):
+                append('heading')
+                continue
+            # 标题通常较短且首字母大写：最多拆分出10个词即可判断
+            words = text.split(None, 9)
+            if 0 < len(words) < 10 and words[0].istitle():
+                capitalized = sum(1 for word in words if word.istitle())
+                if capitalized / len(words) > 0.7:
+                    append('heading')
+                    continue
+            append('formula' if formula_search(text) else 'paragraph')
+        return kinds
+    
     def _is_heading(self, item: Dict[str, Any]) -> bool:
         """
         判断是否为标题
@@ -241,9 +517,8 @@ class ContentAnalyzer:
                 return True
         
         # 检查是否包含数学符号
-        math_symbols = ['+', '-', '=', '×', '÷', 'π', '√', '∫', '∑', '∏', '^', '_']
         # 检查是否有多个数学符号连续出现，这可能是公式
-        symbol_count = sum(1 for char in text if char in math_symbols)
+        symbol_count = sum(1 for char in text if char in self.math_symbols)
         if symbol_count > 1:
             return True
             
@@ -278,12 +553,14 @@ class ContentAnalyzer:
             
         return text  # 如果没有找到明确的公式部分，返回原文本
     
-    def _analyze_tables(self, tables: List[List[List[str]]]) -> List[Dict[str, Any]]:
+    def _analyze_tables(self, tables: List[List[List[str]]],
+                        orders: Optional[List[int]] = None) -> List[Dict[str, Any]]:
         """
         分析表格内容
         
         Args:
             tables: 表格数据列表
+            orders: 各表格的阅读顺序（DocumentReader 返回的 'table_orders'）
             
         Returns:
             List[Dict]: 表格内容块列表
@@ -291,47 +568,51 @@ class ContentAnalyzer:
         table_blocks = []
         
         for i, table in enumerate(tables):
-            # 过滤空表格
-            non_empty_rows = [row for row in table if any(cell.strip() for cell in row)]
-            if not non_empty_rows:
-                continue
-            
-            # 为表格添加标题（可以从上下文推断）
-            table_title = f"表格{i+1}"
-            
-            table_blocks.append({
-                'type': 'table',
-                'content': non_empty_rows,
-                'title': table_title
-            })
+            table_block = self._table_block(table, i)
+            if table_block:
+                table_block['order'] = orders[i] if orders else None
+                table_blocks.append(table_block)
         
         return table_blocks
     
+    def _table_block(self, table: List[List[str]], index: int) -> Dict[str, Any]:
+        """
+        为单个表格创建表格块，空表格返回None
+        
+        Args:
+            table: 表格数据
+            index: 表格在文档中的序号（从0开始）
+            
+        Returns:
+            Dict: 表格内容块
+        """
+        # 过滤空表格
+        non_empty_rows = [row for row in table if any(cell.strip() for cell in row)]
+        if not non_empty_rows:
+            return None
+        
+        # 为表格添加标题（可以从上下文推断）
+        return {
+            'type': 'table',
+            'content': non_empty_rows,
+            'title': f"表格{index+1}"
+        }
+    
     def _organize_content_blocks(self, blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         组织内容块，建立层次结构
         
         Args:
-            blocks: 内容块列表
+            blocks: 已按阅读顺序排列的内容块
             
         Returns:
             List[Dict]: 组织后的内容块列表
         """
-        # 首先根据position属性排序内容块（如果存在）
-        blocks_with_position = [block for block in blocks if 'position' in block]
-        blocks_without_position = [block for block in blocks if 'position' not in block]
-        
-        # 对有position的块进行排序
-        blocks_with_position.sort(key=lambda x: x['position'])
-        
-        # 合并排序后的块和无position的块
-        sorted_blocks = blocks_with_position + blocks_without_position
-        
         # 组织内容到章节中
         organized_blocks = []
         current_section = None
         
-        for block in sorted_blocks:
+        for block in blocks:
             if block['type'] == 'heading':
                 # 开始新的节
                 current_section = {
@@ -350,10 +631,28 @@ class ContentAnalyzer:
         
         return organized_blocks
     
+    def prepare_summaries(self, content_blocks: Iterable[Dict[str, Any]]):
+        """
+        对内容块（包括章节中的内容块）的全部段落一次性计算摘要得分，
+        之后的 summarize_text() 直接使用这次评分的结果
+        
+        Args:
+            content_blocks: analyze() 或 analyze_stream() 返回的内容块
+        """
+        texts = []
+        for block in content_blocks:
+            for item in (block['content'] if block.get('type') == 'section' else [block]):
+                if item.get('type') == 'paragraph':
+                    texts.append(item['content'])
+        self.summarizer.fit(texts)
+    
     def summarize_text(self, text: str, max_length: int = 200) -> str:
         """
         文本摘要，用于简化演示文稿中的内容
         
+        抽取式摘要：按 TF-IDF 得分选取句子（见 text_summarizer.ExtractiveSummarizer），
+        结果按文本哈希缓存。
+        
         Args:
             text: 原始文本
             max_length: 最大长度
@@ -361,29 +660,7 @@ class ContentAnalyzer:
         Returns:
             str: 摘要后的文本
         """
-        # 简单的摘要逻辑，实际应用可能需要使用NLP库进行更智能的摘要
-        if len(text) <= max_length:
-            return text
-        
-        # 尝试在句子边界截断
-        sentences = re.split(r'(?<=[。！？.!?])\s+', text)
-        summary = []
-        current_length = 0
-        
-        for sentence in sentences:
-            if current_length + len(sentence) + 4 > max_length:  # +4 用于考虑省略号
-                break
-            summary.append(sentence)
-            current_length += len(sentence)
-        
-        if summary:
-            result = ' '.join(summary) + '...'
-            # 确保最终结果不超过最大长度
-            if len(result) > max_length:
-                return text[:max_length-3] + '...'  # 直接截断并添加省略号
-            return result
-        else:
-            return text[:max_length-3] + '...'  # 直接截断并添加省略号
+        return self.summarizer.summarize(text, max_length)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+转换缓存模块
+按输入文件内容哈希缓存 DocumentReader 的读取结果和 ContentAnalyzer 的内容块，
+只改变生成参数（--max-slides、--no-style、--decorations）的重复转换直接进入演示文稿生成
+"""
+
+import os
+import gzip
+import pickle
+import hashlib
+import tempfile
+from typing import Dict, List, Any, Optional, Tuple
+
+
+class ConversionCache:
+    """
+    基于内容寻址的磁盘缓存，总大小超过上限时按最近使用时间（LRU）淘汰
+
+    每个条目是一个 gzip 压缩的 pickle 文件，文件名为输入文件的 SHA-256；
+    命中时更新文件的修改时间，淘汰时删除修改时间最早的条目。
+    """
+
+    # 读取或分析逻辑变化时递增，使旧的缓存条目失效
+    CACHE_VERSION = 2
+    SUFFIX = '.pkl.gz'
+
+    def __init__(self, cache_dir: str, max_bytes: int = 500 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存总大小上限（字节）
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def file_hash(file_path: str) -> str:
+        """
+        计算文件内容的SHA-256
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            str: 十六进制哈希值
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _entry_path(self, file_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{file_hash}_v{self.CACHE_VERSION}{self.SUFFIX}")
+
+    def get(self, file_hash: str) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        读取缓存条目
+
+        Args:
+            file_hash: 输入文件的哈希值
+
+        Returns:
+            Optional[Tuple]: (读取结果, 内容块)，未命中或条目损坏时返回None
+        """
+        path = self._entry_path(file_hash)
+        try:
+            with gzip.open(path, 'rb') as f:
+                document_data, content_blocks = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"警告: 缓存条目损坏，已忽略: {str(e)}")
+            self._remove(path)
+            return None
+
+        # 记录最近使用时间
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return document_data, content_blocks
+
+    def put(self, file_hash: str, document_data: Dict[str, Any], content_blocks: List[Dict[str, Any]]):
+        """
+        写入缓存条目，然后按LRU淘汰超出大小上限的条目
+
+        先写入临时文件再替换，避免并发进程读到不完整的条目。
+
+        Args:
+            file_hash: 输入文件的哈希值
+            document_data: DocumentReader 的读取结果
+            content_blocks: ContentAnalyzer 的内容块
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._entry_path(file_hash)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                pickle.dump((document_data, content_blocks), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except Exception:
+            self._remove(temp_path)
+            raise
+        self.evict(keep=path)
+
+    def evict(self, keep: Optional[str] = None):
+        """
+        删除最久未使用的条目，直到总大小不超过上限
+
+        Args:
+            keep: 不删除的条目路径（刚写入的条目）
+        """
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(self.SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
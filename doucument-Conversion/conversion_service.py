@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+转换服务模块
+常驻的本地转换服务：通过HTTP（或Unix套接字）接收转换任务，
+在预先启动的工作进程中并发执行，支持排队上限、状态查询和结果保留
+"""
+
+import os
+import json
+import time
+import uuid
+import queue
+import shutil
+import threading
+import socketserver
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from typing import Dict, List, Any, Optional
+
+from batch_converter import SUPPORTED_EXTENSIONS, WorkerProcess
+
+# 任务对外公开的字段
+JOB_FIELDS = ('id', 'status', 'input', 'output', 'blocks', 'seconds', 'error',
+              'created', 'started', 'finished')
+
+
+class ConversionService:
+    """
+    转换服务
+
+    每个工作进程由一个调度线程负责，进程中的 DocumentReader、ContentAnalyzer、
+    PresentationGenerator（及其 StyleOptimizer）常驻复用，避免每个任务重新导入和初始化。
+    等待中的任务数量有上限，队列满时拒绝新任务（由调用方稍后重试）。
+    已完成的任务记录和服务生成的文件保留 retention 秒后删除。
+    """
+
+    def __init__(self, work_dir: str, workers: Optional[int] = None, queue_size: int = 32,
+                 timeout: Optional[float] = 300, retention: float = 3600, max_slides: int = 50,
+                 style_options: Dict[str, Any] = None, cache_dir: Optional[str] = None,
+                 cache_size: int = 500 * 1024 * 1024, fast_docx: bool = False,
+                 max_upload: int = 100 * 1024 * 1024, allowed_roots: Optional[List[str]] = None):
+        """
+        Args:
+            work_dir: 服务工作目录，保存上传的文档和生成的演示文稿
+            workers: 工作进程数，默认为CPU核心数
+            queue_size: 等待中的任务数量上限
+            timeout: 单个任务的超时时间（秒），None表示不限制
+            retention: 已完成任务的保留时间（秒）
+            max_slides: 默认最大顶层内容块数量
+            style_options: 默认样式优化选项
+            cache_dir: 转换缓存目录，None表示不使用缓存
+            cache_size: 缓存总大小上限（字节）
+            fast_docx: 是否使用DOCX快速读取
+            max_upload: 请求体大小上限（字节），超出时返回413
+            allowed_roots: 请求中 input/output 路径允许位于的目录，默认只允许工作目录
+        """
+        self.work_dir = work_dir
+        self.max_upload = max_upload
+        self.allowed_roots = [os.path.realpath(root) for root in (allowed_roots or [work_dir])]
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.timeout = timeout
+        self.retention = retention
+        self.options = {
+            'max_slides': max_slides,
+            'style_options': style_options,
+            'cache_dir': cache_dir,
+            'cache_size': cache_size,
+            'fast_docx': fast_docx,
+        }
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.pending = queue.Queue(maxsize=queue_size)
+        self.threads = []
+        self.stopping = threading.Event()
+        os.makedirs(os.path.join(work_dir, 'uploads'), exist_ok=True)
+        os.makedirs(os.path.join(work_dir, 'results'), exist_ok=True)
+
+    def start(self):
+        """
+        启动工作进程、调度线程和过期清理线程
+        """
+        context = multiprocessing.get_context()
+        for _ in range(self.workers):
+            worker = WorkerProcess(context, self.options)
+            thread = threading.Thread(target=self._dispatch, args=(worker,), daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        janitor = threading.Thread(target=self._expire_loop, daemon=True)
+        janitor.start()
+
+    def shutdown(self):
+        """
+        停止接收任务，取消排队中的任务，等待正在执行的任务完成后关闭工作进程
+        """
+        self.stopping.set()
+        while True:
+            try:
+                job = self.pending.get_nowait()
+            except queue.Empty:
+                break
+            with self.lock:
+                job['status'] = 'cancelled'
+                job['finished'] = time.time()
+        for _ in self.threads:
+            self.pending.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+    def submit(self, input_file: str, output_file: Optional[str] = None,
+               job_options: Optional[Dict[str, Any]] = None, owned_input: bool = False) -> Dict[str, Any]:
+        """
+        提交一个转换任务
+
+        Args:
+            input_file: 输入文件路径
+            output_file: 输出文件路径，None时保存到服务工作目录
+            job_options: 覆盖默认值的转换选项（max_slides、style_options）
+            owned_input: 输入文件是否由服务创建（上传的文件），过期时一并删除
+
+        Returns:
+            Dict: 任务信息
+
+        Raises:
+            ValueError: 输入文件不存在或格式不支持
+            queue.Full: 等待中的任务已达上限或服务正在停止
+        """
+        if not input_file.lower().endswith(SUPPORTED_EXTENSIONS):
+            raise ValueError(f"不支持的文件格式: {os.path.splitext(input_file)[1]}")
+        if not os.path.isfile(input_file):
+            raise ValueError(f"找不到文件: {input_file}")
+
+        if self.stopping.is_set():
+            raise queue.Full
+
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'status': 'queued',
+            'input': input_file,
+            'output': output_file or os.path.join(self.work_dir, 'results', f'{job_id}.pptx'),
+            'options': job_options,
+            'owned_input': owned_input,
+            'owned_output': output_file is None,
+            'created': time.time(),
+        }
+        with self.lock:
+            self.pending.put_nowait(job)
+            self.jobs[job_id] = job
+        return self.describe(job)
+
+    def is_allowed_path(self, path: str) -> bool:
+        """
+        路径（解析符号链接后）是否位于允许的目录之内
+        """
+        real_path = os.path.realpath(path)
+        return any(os.path.commonpath([root, real_path]) == root for root in self.allowed_roots)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        查询任务状态
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return self.describe(job) if job else None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """
+        列出所有保留中的任务
+        """
+        with self.lock:
+            return [self.describe(job) for job in self.jobs.values()]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        服务状态：工作进程数和各状态的任务数量
+        """
+        with self.lock:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+        return {'workers': self.workers, 'queue_limit': self.pending.maxsize, 'jobs': counts}
+
+    @staticmethod
+    def describe(job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        任务的公开信息（可序列化为JSON）
+        """
+        return {field: job.get(field) for field in JOB_FIELDS}
+
+    def _dispatch(self, worker: WorkerProcess):
+        """
+        调度线程：从队列取任务交给自己的工作进程执行
+        """
+        try:
+            while True:
+                job = self.pending.get()
+                if job is None:
+                    break
+                with self.lock:
+                    job['status'] = 'running'
+                    job['started'] = time.time()
+                result = worker.run(job['input'], job['output'], job['options'], self.timeout)
+                with self.lock:
+                    job.update(result)
+                    job['finished'] = time.time()
+        finally:
+            worker.stop()
+
+    def _expire_loop(self):
+        """
+        定期删除超过保留时间的已完成任务
+        """
+        while not self.stopping.wait(min(60, max(1, self.retention / 4))):
+            self.expire()
+
+    def expire(self, now: Optional[float] = None):
+        """
+        删除超过保留时间的已完成任务及服务为其创建的文件
+
+        Args:
+            now: 当前时间，默认为 time.time()
+        """
+        now = now or time.time()
+        with self.lock:
+            expired = [job for job in self.jobs.values()
+                       if job.get('finished') and now - job['finished'] >= self.retention]
+            for job in expired:
+                del self.jobs[job['id']]
+        for job in expired:
+            for key, owned in (('input', 'owned_input'), ('output', 'owned_output')):
+                if job[owned] and os.path.exists(job[key]):
+                    os.remove(job[key])
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """
+    转换服务的HTTP接口
+
+    - POST /jobs: 提交任务。JSON请求体 {"input": 路径, "output": 可选路径, "max_slides": 数量,
+      "no_style": 布尔, "decorations": 布尔}；或直接上传文档内容，用 ?filename= 指定文件名（及格式），
+      其他选项同样通过查询参数传递。input/output 路径必须位于允许的目录之内（否则返回403）。
+      请求体超过 max_upload 时返回413
+    - GET /jobs: 列出任务
+    - GET /jobs/<id>: 查询任务状态
+    - GET /jobs/<id>/result: 下载生成的演示文稿
+    - GET /health: 服务状态
+    """
+
+    service = None  # 由 make_server() 设置
+
+    def address_string(self):
+        # Unix套接字没有客户端地址
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def _send_json(self, status: int, payload: Any, headers: Dict[str, str] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = [part for part in urlparse(self.path).path.split('/') if part]
+        if parts == ['health']:
+            self._send_json(200, self.service.stats())
+        elif parts == ['jobs']:
+            self._send_json(200, self.service.list())
+        elif len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.service.get(parts[1])
+            if job is None:
+                self._send_json(404, {'error': '任务不存在或已过期'})
+            elif len(parts) == 2:
+                self._send_json(200, job)
+            elif parts[2] != 'result':
+                self._send_json(404, {'error': '未知路径'})
+            elif job['status'] != 'ok':
+                self._send_json(409, {'error': '任务尚未成功完成', 'status': job['status']})
+            else:
+                self._send_file(job['output'])
+        else:
+            self._send_json(404, {'error': '未知路径'})
+
+    def _send_file(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            with open(path, 'rb') as f:
+                self.send_response(200)
+                self.send_header('Content-Type',
+                                 'application/vnd.openxmlformats-officedocument.presentationml.presentation')
+                self.send_header('Content-Length', str(size))
+                self.send_header('Content-Disposition', f'attachment; filename="{os.path.basename(path)}"')
+                self.end_headers()
+                shutil.copyfileobj(f, self.wfile)
+        except FileNotFoundError:
+            self._send_json(410, {'error': '结果文件已不存在'})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != '/jobs':
+            self._send_json(404, {'error': '未知路径'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            self._send_json(400, {'error': 'Content-Length 无效'})
+            return
+        if length > self.service.max_upload:
+            # 不读取请求体，发送响应后关闭连接
+            self.close_connection = True
+            self._send_json(413, {'error': f'请求体超过上限 {self.service.max_upload} 字节'})
+            return
+        body = self.rfile.read(length)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        owned_input = False
+        upload = not self.headers.get('Content-Type', '').startswith('application/json')
+        try:
+            if upload:
+                params = query
+                filename = os.path.basename(params.get('filename', ''))
+                if not filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                    raise ValueError("上传文档需要用 ?filename= 指定 .doc/.docx/.pdf 文件名")
+                input_file = os.path.join(self.service.work_dir, 'uploads', f'{uuid.uuid4().hex}_{filename}')
+            else:
+                params = json.loads(body or b'{}')
+                if not isinstance(params, dict):
+                    raise ValueError("请求体需要是JSON对象")
+                input_file = params.get('input')
+                if not input_file or not isinstance(input_file, str):
+                    raise ValueError("缺少 input 参数")
+            output_file = params.get('output')
+            if output_file is not None and not isinstance(output_file, str):
+                raise ValueError("output 参数需要是路径")
+
+            # 两种提交方式的 output（以及JSON方式的 input）都必须位于允许的目录之内
+            for path in filter(None, (None if upload else input_file, output_file)):
+                if not self.service.is_allowed_path(path):
+                    raise PermissionError(f"路径不在允许的目录中: {path}")
+
+            if upload:
+                # 上传的文档保存到服务工作目录
+                with open(input_file, 'wb') as f:
+                    f.write(body)
+                owned_input = True
+
+            job = self.service.submit(input_file, output_file, _job_options(params), owned_input)
+        except queue.Full:
+            if owned_input:
+                os.remove(input_file)
+            self._send_json(503, {'error': '任务队列已满，请稍后重试'}, {'Retry-After': '1'})
+            return
+        except PermissionError as e:
+            self._send_json(403, {'error': str(e)})
+            return
+        except (TypeError, ValueError) as e:
+            if owned_input and os.path.exists(input_file):
+                os.remove(input_file)
+            self._send_json(400, {'error': str(e)})
+            return
+        self._send_json(202, job, {'Location': f"/jobs/{job['id']}"})
+
+
+def _is_true(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+
+def _job_options(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    从请求参数中提取覆盖默认值的转换选项
+    """
+    options = {}
+    if 'max_slides' in params:
+        try:
+            options['max_slides'] = int(params['max_slides'])
+        except (TypeError, ValueError):
+            raise ValueError("max_slides 需要是整数")
+    if 'no_style' in params or 'decorations' in params:
+        if _is_true(params.get('no_style')):
+            options['style_options'] = None
+        else:
+            options['style_options'] = {'add_decorations': _is_true(params.get('decorations'))}
+    return options
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    监听Unix套接字的多线程HTTP服务器
+    """
+    daemon_threads = True
+
+
+def make_server(service: ConversionService, host: str = '127.0.0.1', port: int = 8765,
+                socket_path: Optional[str] = None):
+    """
+    创建绑定到服务的HTTP服务器
+
+    Args:
+        service: 转换服务
+        host: 监听地址（默认只监听本机）
+        port: 监听端口
+        socket_path: Unix套接字路径，指定时忽略 host 和 port
+
+    Returns:
+        服务器对象（调用 serve_forever() 开始处理请求）
+    """
+    handler = type('BoundServiceRequestHandler', (ServiceRequestHandler,), {'service': service})
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        return UnixHTTPServer(socket_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
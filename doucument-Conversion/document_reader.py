@@ -6,23 +6,39 @@
 """
 
 import os
-import zipfile
-import shutil
-import tempfile
-from typing import Dict, List, Any
+import io
+import math
+import time
+import bisect
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from docx import Document
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from docx_fast_reader import iter_docx_elements
 import pdfplumber
 import PyPDF2
+from pdfminer.pdftypes import resolve1, LITERALS_DCT_DECODE, LITERALS_JPX_DECODE
 
 
 class DocumentReader:
     """
     文档读取器类，支持多种格式的文档读取
     """
-      
-    def __init__(self):
-          self.temp_dirs = []  # 跟踪所有创建的临时目录，以便后续清理
-      
+    
+    def __init__(self, pdf_workers: int = 1, verbose: bool = False, fast_docx: bool = False):
+        """
+        Args:
+            pdf_workers: 读取PDF时并行处理页面的进程数，1为串行
+            verbose: 是否输出PDF每页的处理耗时
+            fast_docx: 是否用流式XML解析读取DOCX（不构建python-docx对象模型，适合大文件）
+        """
+        self.pdf_workers = pdf_workers
+        self.verbose = verbose
+        self.fast_docx = fast_docx
+    
     def read(self, file_path: str) -> Dict[str, Any]:
         """
         读取文档内容
@@ -42,10 +58,54 @@ class DocumentReader:
         else:
             raise ValueError(f"不支持的文件格式: {file_ext}")
     
+    def iter_elements(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        流式读取文档，按阅读顺序逐个产出元素，供 ContentAnalyzer.analyze_stream() 使用
+        
+        PDF逐页读取，处理完一页即产出该页的文本行、表格和新出现的图片并释放页面缓存；
+        DOCX逐个产出正文段落、表格和图片。
+        
+        Args:
+            file_path: 文件路径
+            
+        Yields:
+            Dict: 文本项（type为paragraph/heading）、表格（type为table）或图片（type为image）
+        """
+        file_ext = os.path.splitext(file_path)[1].lower()
+        
+        if file_ext in ['.doc', '.docx']:
+            if self.fast_docx:
+                yield from iter_docx_elements(file_path)
+            else:
+                yield from self._iter_docx_body(Document(file_path))
+        elif file_ext == '.pdf':
+            with pdfplumber.open(file_path) as pdf:
+                images = PdfImageCollector(pdf.doc)
+                position = 0
+                order = 0
+                for page_num in range(1, len(pdf.pages) + 1):
+                    content, tables, table_orders, image_refs = _extract_pdf_pages(
+                        pdf, page_num, page_num, self.verbose, order)
+                    order += len(content) + len(tables) + len(image_refs)
+                    yield from content
+                    position += len(content)
+                    for table, table_order in zip(tables, table_orders):
+                        yield {'type': 'table', 'content': table, 'page': page_num, 'order': table_order}
+                    for ref in image_refs:
+                        image = images.add(ref, position)
+                        if image is not None:
+                            yield image
+        else:
+            raise ValueError(f"不支持的文件格式: {file_ext}")
+    
     def _read_docx(self, file_path: str) -> Dict[str, Any]:
         """
         读取docx文件
         
+        文档包只打开一次（python-docx一次性读入各部件），正文XML按阅读顺序
+        只遍历一次，同时得到段落、表格和内嵌图片；图片直接取自关系部件，
+        不再重复解压docx。
+        
         Args:
             file_path: 文件路径
             
@@ -53,10 +113,87 @@ class DocumentReader:
             Dict: 包含文档内容的字典
         """
         try:
-            doc = Document(file_path)
-            content = []
+            if self.fast_docx:
+                elements = iter_docx_elements(file_path)
+            else:
+                elements = self._iter_docx_body(Document(file_path))
+            content, tables, table_orders, images_info = self._collect_docx_elements(elements)
+            
+            return {
+                'content': content,
+                'tables': tables,
+                'table_orders': table_orders,
+                'images': images_info,
+                'format': 'docx',
+                'file_path': file_path
+            }
+            
+        except Exception as e:
+            raise Exception(f"读取DOCX文件失败: {str(e)}")
+    
+    def _walk_docx_body(self, doc) -> Tuple[List[Dict[str, Any]], List[List[List[str]]], List[int], List[Dict[str, Any]]]:
+        """
+        按阅读顺序遍历正文，返回 (文本内容, 表格, 表格阅读顺序, 图片信息)
+        
+        Args:
+            doc: python-docx 文档对象
             
-            for paragraph in doc.paragraphs:
+        Returns:
+            Tuple: 文本内容列表、表格数据列表、表格阅读顺序列表、图片信息列表
+        """
+        return self._collect_docx_elements(self._iter_docx_body(doc))
+    
+    @staticmethod
+    def _collect_docx_elements(elements: Iterator[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[List[List[str]]], List[int], List[Dict[str, Any]]]:
+        """
+        把正文元素分为文本内容、表格和图片信息
+        
+        每个元素按产出顺序编号为阅读顺序（文本项和图片记在 'order' 中，
+        表格记在单独的列表中），ContentAnalyzer 据此归并三类内容块。
+        
+        Args:
+            elements: _iter_docx_body() 或 iter_docx_elements() 产出的元素
+            
+        Returns:
+            Tuple: 文本内容列表、表格数据列表、表格阅读顺序列表、图片信息列表
+        """
+        content = []
+        tables = []
+        table_orders = []
+        images_info = []
+        for order, element in enumerate(elements):
+            if element['type'] == 'table':
+                tables.append(element['content'])
+                table_orders.append(order)
+            else:
+                element['order'] = order
+                if element['type'] == 'image':
+                    images_info.append(element)
+                else:
+                    content.append(element)
+        return content, tables, table_orders, images_info
+    
+    def _iter_docx_body(self, doc) -> Iterator[Dict[str, Any]]:
+        """
+        按阅读顺序逐个产出正文元素：文本项、表格（{'type': 'table', 'content': 行列表}）
+        和图片（{'type': 'image', 'data': 字节数据, ...}）
+        
+        图片以内存中的字节数据（'data'）返回，不写临时文件；
+        paragraph_index / position 为其所在正文段落的下标
+        （表格中的图片取表格之前的段落数），与 doc.paragraphs 的编号一致。
+        
+        Args:
+            doc: python-docx 文档对象
+            
+        Yields:
+            Dict: 文档元素
+        """
+        paragraph_index = 0
+        
+        body = doc.element.body
+        for child in body.iterchildren():
+            if child.tag == qn('w:p'):
+                paragraph = Paragraph(child, doc)
                 text = paragraph.text.strip()
                 if text:
                     # 判断是否为标题（根据样式名称或字体大小）
@@ -70,39 +207,47 @@ class DocumentReader:
                     if paragraph.runs:
                         font_size = paragraph.runs[0].font.size
                     
-                    content.append({
+                    yield {
                         'text': text,
                         'type': 'heading' if is_heading else 'paragraph',
                         'font_size': font_size.pt if font_size else None
-                    })
-            
-            # 提取表格
-            tables = []
-            for table in doc.tables:
+                    }
+                position = paragraph_index
+                paragraph_index += 1
+            elif child.tag == qn('w:tbl'):
+                table = Table(child, doc)
                 table_data = []
                 for row in table.rows:
                     row_data = [cell.text.strip() for cell in row.cells]
                     table_data.append(row_data)
-                tables.append(table_data)
-            
-            # 提取图片信息
-            images_info = self.get_document_images_with_positions(file_path)
+                position = paragraph_index
+                yield {'type': 'table', 'content': table_data, 'position': position}
+            else:
+                continue
             
-            return {
-                'content': content,
-                'tables': tables,
-                'images': images_info,
-                'format': 'docx',
-                'file_path': file_path
-            }
-            
-        except Exception as e:
-            raise Exception(f"读取DOCX文件失败: {str(e)}")
+            # 内嵌图片: a:blip 的 r:embed 指向图片部件，图片数据直接取自内存中的部件
+            for rel_id in child.xpath('.//a:blip/@r:embed'):
+                image_part = doc.part.related_parts.get(rel_id)
+                if image_part is None:
+                    continue
+                yield {
+                    'data': image_part.blob,
+                    'name': os.path.basename(str(image_part.partname)),
+                    'paragraph_index': position,
+                    'type': 'image',
+                    'position': position  # 用于排序
+                }
     
     def _read_pdf(self, file_path: str) -> Dict[str, Any]:
         """
         读取PDF文件
         
+        pdf_workers > 1 时把页面范围分片交给进程池并行提取，结果按页码顺序合并，
+        与串行提取完全一致。
+        
+        页面只收集图片对象的引用，图片在主进程中按对象解码一次并按内容哈希去重，
+        重复出现的徽标、背景等只保留第一次出现的一份（'pages' 记录出现的所有页码）。
+        
         Args:
             file_path: 文件路径
             
@@ -110,261 +255,332 @@ class DocumentReader:
             Dict: 包含文档内容的字典
         """
         try:
-            content = []
-            tables = []
-            
             with pdfplumber.open(file_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    # 提取文本
-                    text = page.extract_text()
-                    if text:
-                        # 简单的段落分割
-                        paragraphs = text.split('\n\n')
-                        for para in paragraphs:
-                            para = para.strip()
-                            if para:
-                                # 简单的标题判断（基于字体大小和位置）
-                                # 这是一个简化的实现，实际应用可能需要更复杂的逻辑
-                                lines = para.split('\n')
-                                for line in lines:
-                                    line = line.strip()
-                                    if line:
-                                        content.append({
-                                            'text': line,
-                                            'type': 'paragraph',  # 默认类型，后续分析会更新
-                                            'page': page_num
-                                        })
-                    
-                    # 提取表格
-                    page_tables = page.extract_tables()
-                    for table in page_tables:
-                        # 过滤空行
-                        filtered_table = [row for row in table if any(cell for cell in row)]
-                        if filtered_table:
-                            tables.append(filtered_table)
+                page_count = len(pdf.pages)
+                if self.pdf_workers > 1 and page_count >= 2:
+                    content, tables, table_orders, image_refs = self._read_pdf_parallel(file_path, page_count)
+                else:
+                    content, tables, table_orders, image_refs = _extract_pdf_pages(pdf, 1, page_count, self.verbose)
+                
+                # 图片位于其所在页的文本之后
+                content_pages = [item['page'] for item in content]
+                collector = PdfImageCollector(pdf.doc)
+                images = []
+                for ref in image_refs:
+                    image = collector.add(ref, bisect.bisect_right(content_pages, ref['page']))
+                    if image is not None:
+                        images.append(image)
             
             return {
                 'content': content,
                 'tables': tables,
+                'table_orders': table_orders,
+                'images': images,
                 'format': 'pdf',
                 'file_path': file_path,
-                'page_count': len(pdf.pages) if 'pdf' in locals() else 0
+                'page_count': page_count
             }
             
         except Exception as e:
             raise Exception(f"读取PDF文件失败: {str(e)}")
     
-    def __init__(self):
-        self.temp_dirs = []  # 跟踪所有创建的临时目录，以便后续清理
+    def _read_pdf_parallel(self, file_path: str, page_count: int) -> Tuple[List[Dict[str, Any]], List[List[List[Any]]], List[int], List[Dict[str, Any]]]:
+        """
+        在进程池中按页面范围并行提取PDF
+        
+        每个工作进程分多个较小的分片，以平衡不同页面的耗时差异。
+        
+        Args:
+            file_path: 文件路径
+            page_count: 总页数
+            
+        Returns:
+            Tuple: 按页码顺序合并的文本内容、表格、表格阅读顺序和图片引用
+        """
+        workers = min(self.pdf_workers, page_count)
+        shard_size = max(1, math.ceil(page_count / (workers * 4)))
+        shards = [(start, min(start + shard_size - 1, page_count))
+                  for start in range(1, page_count + 1, shard_size)]
+        
+        content = []
+        tables = []
+        table_orders = []
+        image_refs = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_extract_pdf_range, file_path, start, end, self.verbose) for start, end in shards]
+            # 按提交顺序取结果，保证页码顺序；各分片的阅读顺序从0开始，依次加上之前分片的元素数
+            offset = 0
+            for future in futures:
+                shard_content, shard_tables, shard_table_orders, shard_images = future.result()
+                for element in shard_content + shard_images:
+                    element['order'] += offset
+                content.extend(shard_content)
+                tables.extend(shard_tables)
+                table_orders.extend(order + offset for order in shard_table_orders)
+                image_refs.extend(shard_images)
+                offset += len(shard_content) + len(shard_tables) + len(shard_images)
+        return content, tables, table_orders, image_refs
     
-    def extract_images(self, file_path: str) -> List[str]:
+    def get_document_images_with_positions(self, file_path: str) -> List[Dict[str, Any]]:
         """
-        从文档中提取图片
+        从文档中提取图片及其在文档中的位置信息
         
         Args:
             file_path: 文件路径
             
         Returns:
-            List[str]: 临时图片文件路径列表
+            List[Dict]: 包含图片数据和位置信息的列表
         """
-        print(f"开始提取图片: {file_path}")
-        temp_images = []
         file_ext = os.path.splitext(file_path)[1].lower()
-        print(f"文件格式: {file_ext}")
-        
-        if file_ext == '.pdf':
+        if file_ext in ['.docx']:
             try:
-                with pdfplumber.open(file_path) as pdf:
-                    for page_num, page in enumerate(pdf.pages, 1):
-                        images = page.images
-                        print(f"在PDF第{page_num}页找到{len(images)}个图片")
-                        for img_idx, img in enumerate(images):
-                            # 这里可以保存图片到临时文件
-                            # 简化实现，实际应用需要提取图片数据
-                            print(f"  图片{img_idx+1}: {img}")
-                            pass
+                return self._walk_docx_body(Document(file_path))[3]
             except Exception as e:
-                print(f"提取PDF图片失败: {str(e)}")
-                import traceback
-                traceback.print_exc()
-        
-        elif file_ext in ['.docx']:
+                print(f"获取DOCX图片位置失败: {str(e)}")
+        elif file_ext == '.pdf':
             try:
-                print("处理DOCX文件，准备提取图片...")
-                # 创建临时目录来存储提取的图片
-                temp_dir = tempfile.mkdtemp()
-                print(f"创建临时目录: {temp_dir}")
-                self.temp_dirs.append(temp_dir)  # 保存临时目录路径，以便后续清理
-                
-                # 打开docx文件（实际上是zip文件）
-                print(f"打开DOCX文件: {file_path}")
-                with zipfile.ZipFile(file_path, 'r') as z:  
-                    # 获取所有文件列表用于调试
-                    all_files = z.namelist()
-                    print(f"DOCX文件中包含{len(all_files)}个文件")
-                    
-                    # 获取所有图片文件
-                    image_files = [name for name in all_files 
-                                  if name.startswith('word/media/')]
-                    print(f"找到{len(image_files)}个图片文件")
-                    
-                    # 提取每个图片文件
-                    for img_idx, img_name in enumerate(image_files):
-                        print(f"\n处理图片{img_idx+1}: {img_name}")
-                        # 获取图片文件的扩展名
-                        ext = os.path.splitext(img_name)[1]
-                        print(f"图片扩展名: {ext}")
-                        # 创建临时文件路径
-                        temp_file_path = os.path.join(temp_dir, f'image_{img_idx}{ext}')
-                        print(f"目标临时文件: {temp_file_path}")
-                        
-                        # 提取图片到临时文件
-                        try:
-                            print(f"提取图片数据到临时文件...")
-                            with z.open(img_name) as source, open(temp_file_path, 'wb') as target:
-                                shutil.copyfileobj(source, target)
-                            
-                            # 验证提取的文件
-                            if os.path.exists(temp_file_path):
-                                file_size = os.path.getsize(temp_file_path)
-                                print(f"图片提取成功，文件大小: {file_size} 字节")
-                                temp_images.append(temp_file_path)
-                                print(f"已添加到临时图片列表: {temp_file_path}")
-                            else:
-                                print(f"警告: 图片文件创建失败: {temp_file_path}")
-                        except Exception as img_err:
-                            print(f"提取单个图片失败 {img_name}: {str(img_err)}")
-                            import traceback
-                            traceback.print_exc()
-                
-                print(f"\n图片提取完成，共提取{len(temp_images)}个图片")
-            
+                return self._read_pdf(file_path)['images']
             except Exception as e:
-                print(f"提取DOCX图片失败: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                # 清理临时目录
-                if 'temp_dir' in locals() and os.path.exists(temp_dir):
-                    print(f"清理失败的临时目录: {temp_dir}")
-                    shutil.rmtree(temp_dir)
-                    if temp_dir in self.temp_dirs:
-                        self.temp_dirs.remove(temp_dir)
-        
-        print(f"图片提取函数返回{len(temp_images)}个图片路径")
-        return temp_images
+                print(f"获取PDF图片位置失败: {str(e)}")
+        return []
+
+
+def _may_contain_table(page) -> bool:
+    """
+    根据页面的线条和矩形快速判断是否值得运行表格检测
+    
+    pdfplumber默认按线条检测表格，至少需要两条水平边和两条竖直边才能构成单元格；
+    纯文字页面没有这样的边，可以跳过代价最高的 extract_tables()。
     
-    def cleanup_temp_files(self):
+    Args:
+        page: pdfplumber 页面对象
+        
+    Returns:
+        bool: 是否可能包含表格
+    """
+    horizontal = vertical = 0
+    for edge in page.edges:
+        if edge['orientation'] == 'h':
+            horizontal += 1
+        else:
+            vertical += 1
+        if horizontal >= 2 and vertical >= 2:
+            return True
+    return False
+
+
+class PdfImageCollector:
+    """
+    PDF图片收集器：每个图片对象只解码一次，并按内容哈希去重
+    
+    同一个XObject被多页引用（如信纸抬头）时按对象编号直接识别为重复；
+    内容相同但对象不同的图片解码后按SHA-256识别。
+    """
+    
+    def __init__(self, doc):
         """
-        清理所有创建的临时目录
+        Args:
+            doc: pdfminer 文档对象（pdfplumber 的 pdf.doc）
         """
-        for temp_dir in self.temp_dirs:
-            if os.path.exists(temp_dir):
-                try:
-                    shutil.rmtree(temp_dir)
-                    print(f"已清理临时目录: {temp_dir}")
-                except Exception as e:
-                    print(f"清理临时目录失败 {temp_dir}: {str(e)}")
-        self.temp_dirs = []
+        self.doc = doc
+        self._by_objid = {}  # 对象编号 -> 图片（解码失败时为None）
+        self._by_hash = {}   # 内容哈希 -> 图片
     
-    def get_document_images_with_positions(self, file_path: str) -> List[Dict[str, Any]]:
+    def add(self, ref: Dict[str, Any], position: int) -> Optional[Dict[str, Any]]:
         """
-        从文档中提取图片及其在文档中的位置信息
+        登记一次图片引用
         
         Args:
-            file_path: 文件路径
+            ref: _extract_pdf_pages() 返回的图片引用（objid、page、bbox、order）
+            position: 图片在文本内容中的位置，用于排序
             
         Returns:
-            List[Dict]: 包含图片路径和位置信息的列表
+            Optional[Dict]: 第一次出现的图片；重复或无法解码时返回None
         """
-        print(f"开始获取文档图片位置信息: {file_path}")
-        images_info = []
-        file_ext = os.path.splitext(file_path)[1].lower()
-        print(f"文件格式: {file_ext}")
+        objid = ref['objid']
+        if objid in self._by_objid:
+            image = self._by_objid[objid]
+            if image is not None and ref['page'] not in image['pages']:
+                image['pages'].append(ref['page'])
+            return None
         
-        if file_ext in ['.docx']:
-            try:
-                print("开始提取图片及其位置信息...")
-                # 提取所有图片
-                print("调用extract_images提取所有图片...")
-                temp_images = self.extract_images(file_path)
-                print(f"extract_images返回{len(temp_images)}个图片")
-                
-                # 创建临时目录来解压docx文件
-                temp_dir = tempfile.mkdtemp()
-                print(f"创建临时解压目录: {temp_dir}")
-                
-                # 打开docx文件并解压
-                print(f"解压DOCX文件到临时目录...")
-                with zipfile.ZipFile(file_path, 'r') as z:
-                    z.extractall(temp_dir)
-                print("DOCX文件解压完成")
-                
-                # 解析document.xml来确定图片位置
-                print("打开文档对象进行图片位置分析...")
-                doc = Document(file_path)
-                print(f"文档包含{len(doc.paragraphs)}个段落")
-                current_paragraph = 0
-                image_found_count = 0
-                
-                # 遍历所有段落，检测是否包含图片
-                print("遍历段落查找图片位置...")
-                for para_idx, paragraph in enumerate(doc.paragraphs):
-                    try:
-                        # 检查段落是否包含图片
-                        has_image = any(shape for shape in paragraph._element.xpath('.//a:blip') 
-                                      for ns in paragraph._element.nsmap.values() if ns == 'http://schemas.openxmlformats.org/drawingml/2006/main')
-                        
-                        if has_image:
-                            image_found_count += 1
-                            print(f"在段落{para_idx}中发现图片")
-                            # 这个段落包含图片
-                            if temp_images and current_paragraph < len(temp_images):
-                                image_path = temp_images[current_paragraph]
-                                print(f"  关联图片: {image_path}")
-                                images_info.append({
-                                    'path': image_path,
-                                    'paragraph_index': para_idx,
-                                    'type': 'image',
-                                    'position': para_idx  # 用于排序
-                                })
-                                current_paragraph += 1
-                                print(f"  已添加到images_info，当前索引: {current_paragraph-1}")
-                    except Exception as para_err:
-                        print(f"分析段落{para_idx}时出错: {str(para_err)}")
-                
-                print(f"\n段落遍历完成，发现{image_found_count}个图片位置")
-                print(f"已关联{len(images_info)}个图片，还有{len(temp_images) - current_paragraph}个未关联图片")
-                
-                # 如果还有未匹配的图片，添加到末尾
-                if current_paragraph < len(temp_images):
-                    print(f"处理{len(temp_images) - current_paragraph}个未关联的图片...")
-                    while current_paragraph < len(temp_images):
-                        image_path = temp_images[current_paragraph]
-                        print(f"  添加未关联图片: {image_path}")
-                        images_info.append({
-                            'path': image_path,
-                            'paragraph_index': len(doc.paragraphs),
-                            'type': 'image',
-                            'position': len(doc.paragraphs)
-                        })
-                        current_paragraph += 1
-                
-                print(f"\n图片位置信息收集完成，共{len(images_info)}个图片信息")
-                # 打印images_info详情用于调试
-                for idx, img_info in enumerate(images_info):
-                    print(f"  图片{idx+1}: 路径={img_info['path']}, 段落索引={img_info['paragraph_index']}")
-                
-            except Exception as e:
-                print(f"获取DOCX图片位置失败: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                # 清理临时目录
-                if 'temp_dir' in locals() and os.path.exists(temp_dir):
-                    print(f"清理临时解压目录: {temp_dir}")
-                    shutil.rmtree(temp_dir)
-        
-        print(f"get_document_images_with_positions函数返回{len(images_info)}个图片信息")
-        return images_info
+        decoded = _decode_pdf_image(resolve1(self.doc.getobj(objid)))
+        if decoded is None:
+            self._by_objid[objid] = None
+            return None
+        
+        ext, data = decoded
+        digest = hashlib.sha256(data).hexdigest()
+        image = self._by_hash.get(digest)
+        if image is not None:
+            self._by_objid[objid] = image
+            if ref['page'] not in image['pages']:
+                image['pages'].append(ref['page'])
+            return None
+        
+        image = {
+            'data': data,
+            'name': f"page{ref['page']}_{objid}{ext}",
+            'page': ref['page'],
+            'pages': [ref['page']],
+            'bbox': ref['bbox'],
+            'type': 'image',
+            'position': position,
+            'order': ref['order']  # 阅读顺序，用于与文本和表格归并
+        }
+        self._by_objid[objid] = image
+        self._by_hash[digest] = image
+        return image
+
+
+def _decode_pdf_image(stream) -> Optional[Tuple[str, bytes]]:
+    """
+    把PDF图片流转换为图片文件数据
+    
+    JPEG/JPEG2000 直接返回原始数据；其他滤镜解码为像素后用Pillow编码为PNG。
+    不支持的颜色空间返回None。
+    
+    Args:
+        stream: pdfminer 图片流对象
+        
+    Returns:
+        Optional[Tuple]: (扩展名, 图片数据)
+    """
+    try:
+        filters = [name for name, _ in stream.get_filters()]
+        if filters and filters[-1] in LITERALS_DCT_DECODE:
+            return '.jpg', stream.get_data()
+        if filters and filters[-1] in LITERALS_JPX_DECODE:
+            return '.jp2', stream.get_data()
+        
+        from PIL import Image
+        
+        width = resolve1(stream.get('Width'))
+        height = resolve1(stream.get('Height'))
+        bits = resolve1(stream.get('BitsPerComponent', 8))
+        color_space = resolve1(stream.get('ColorSpace'))
+        if isinstance(color_space, list) and color_space:
+            # ICCBased 按分量数确定颜色空间
+            if getattr(color_space[0], 'name', None) == 'ICCBased':
+                components = resolve1(resolve1(color_space[1]).get('N'))
+                color_space = {1: 'DeviceGray', 3: 'DeviceRGB', 4: 'DeviceCMYK'}.get(components)
+            else:
+                color_space = None
+        name = getattr(color_space, 'name', color_space)
+        
+        if bits == 1 and name in ('DeviceGray', None):
+            mode = '1'
+        elif bits == 8 and name in ('DeviceGray', 'DeviceRGB', 'DeviceCMYK'):
+            mode = {'DeviceGray': 'L', 'DeviceRGB': 'RGB', 'DeviceCMYK': 'CMYK'}[name]
+        else:
+            return None
+        
+        image = Image.frombytes(mode, (width, height), stream.get_data())
+        if mode == 'CMYK':
+            image = image.convert('RGB')
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG')
+        return '.png', buffer.getvalue()
+    except Exception as e:
+        print(f"解码PDF图片失败: {str(e)}")
+        return None
+
+
+def _extract_pdf_pages(pdf, start: int, end: int, verbose: bool = False,
+                       order: int = 0) -> Tuple[List[Dict[str, Any]], List[List[List[Any]]], List[int], List[Dict[str, Any]]]:
+    """
+    提取已打开PDF中第start到第end页（从1开始，含end）的文本、表格和图片引用
+    
+    图片只记录对象编号、页码和位置（bbox），不在这里解码，
+    以便由 PdfImageCollector 对整个文档去重。内嵌图片（没有对象编号）被忽略。
+    
+    每页依次为文本、表格、图片，所有元素按此顺序从 order 开始编号为阅读顺序
+    （文本项和图片引用记在 'order' 中，表格记在单独的列表中）。
+    
+    Args:
+        pdf: pdfplumber 文档对象
+        start: 起始页码
+        end: 结束页码
+        verbose: 是否输出每页的处理耗时
+        order: 第一个元素的阅读顺序编号
+        
+    Returns:
+        Tuple: 文本内容列表、表格数据列表、表格阅读顺序列表和图片引用列表
+    """
+    content = []
+    tables = []
+    table_orders = []
+    image_refs = []
+    
+    for page_num in range(start, end + 1):
+        page = pdf.pages[page_num - 1]
+        page_start = time.perf_counter()
+        # 提取文本
+        text = page.extract_text()
+        if text:
+            # 简单的段落分割
+            paragraphs = text.split('\n\n')
+            for para in paragraphs:
+                para = para.strip()
+                if para:
+                    # 简单的标题判断（基于字体大小和位置）
+                    # 这是一个简化的实现，实际应用可能需要更复杂的逻辑
+                    lines = para.split('\n')
+                    for line in lines:
+                        line = line.strip()
+                        if line:
+                            content.append({
+                                'text': line,
+                                'type': 'paragraph',  # 默认类型，后续分析会更新
+                                'page': page_num,
+                                'order': order
+                            })
+                            order += 1
+        
+        text_time = time.perf_counter() - page_start
+        
+        # 提取表格（只在有候选线条的页面上运行表格检测）
+        table_start = time.perf_counter()
+        checked = _may_contain_table(page)
+        page_tables = page.extract_tables() if checked else []
+        for table in page_tables:
+            # 过滤空行
+            filtered_table = [row for row in table if any(cell for cell in row)]
+            if filtered_table:
+                tables.append(filtered_table)
+                table_orders.append(order)
+                order += 1
+        
+        # 按阅读顺序（从上到下、从左到右）记录图片引用
+        for image in sorted(page.images, key=lambda image: (image['top'], image['x0'])):
+            objid = getattr(image.get('stream'), 'objid', None)
+            if objid is not None:
+                image_refs.append({
+                    'objid': objid,
+                    'page': page_num,
+                    'bbox': (image['x0'], image['top'], image['x1'], image['bottom']),
+                    'order': order
+                })
+                order += 1
+        
+        if verbose:
+            table_time = time.perf_counter() - table_start
+            table_note = f"表格 {table_time:.3f}s ({len(page_tables)}个)" if checked else "跳过表格检测"
+            print(f"第{page_num}页: 文本 {text_time:.3f}s, {table_note}")
+        
+        # 释放页面缓存的对象，避免长文档占用过多内存
+        page.flush_cache()
+    
+    return content, tables, table_orders, image_refs
+
+
+def _extract_pdf_range(file_path: str, start: int, end: int,
+                       verbose: bool = False) -> Tuple[List[Dict[str, Any]], List[List[List[Any]]], List[int], List[Dict[str, Any]]]:
+    """
+    进程池任务：在工作进程中打开PDF并提取一个页面范围
+    """
+    with pdfplumber.open(file_path) as pdf:
+        return _extract_pdf_pages(pdf, start, end, verbose)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DOCX快速读取模块
+不经过python-docx的对象模型，直接用iterparse流式解析 word/document.xml 和 styles.xml，
+产出与 DocumentReader._iter_docx_body() 完全相同的元素，适合很大的DOCX文件
+"""
+
+import posixpath
+import zipfile
+from typing import Dict, List, Any, Iterator, Optional
+
+from lxml import etree
+from docx.oxml.simpletypes import ST_HpsMeasure
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+A_NS = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+OFFICE_DOCUMENT_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+
+def _w(tag: str) -> str:
+    return f'{{{W_NS}}}{tag}'
+
+
+W_BODY = _w('body')
+W_P = _w('p')
+W_R = _w('r')
+W_TBL = _w('tbl')
+W_TR = _w('tr')
+W_TC = _w('tc')
+W_HYPERLINK = _w('hyperlink')
+W_VAL = _w('val')
+A_BLIP = f'{{{A_NS}}}blip'
+R_EMBED = f'{{{R_NS}}}embed'
+
+# 与 python-docx 的 Run.text 一致的文本元素映射
+_RUN_TEXT = {
+    _w('t'): lambda e: e.text or '',
+    _w('tab'): lambda e: '\t',
+    _w('ptab'): lambda e: '\t',
+    _w('cr'): lambda e: '\n',
+    _w('noBreakHyphen'): lambda e: '-',
+    _w('br'): lambda e: '\n' if e.get(_w('type'), 'textWrapping') == 'textWrapping' else '',
+}
+
+_ON_VALUES = ('1', 'true', 'on')
+
+
+def _run_text(run) -> str:
+    return ''.join(_RUN_TEXT[child.tag](child) for child in run if child.tag in _RUN_TEXT)
+
+
+def _paragraph_text(paragraph) -> str:
+    """
+    段落文本：直接子元素中的 w:r 以及超链接中的 w:r（与 python-docx 的 Paragraph.text 一致）
+    """
+    parts = []
+    for child in paragraph:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(run) for run in child if run.tag == W_R)
+    return ''.join(parts)
+
+
+def _child(element, tag: str):
+    return element.find(tag) if element is not None else None
+
+
+def _grid_span(tc) -> int:
+    span = _child(_child(tc, _w('tcPr')), _w('gridSpan'))
+    return int(span.get(W_VAL)) if span is not None else 1
+
+
+def _grid_before(tr) -> int:
+    before = _child(_child(tr, _w('trPr')), _w('gridBefore'))
+    return int(before.get(W_VAL)) if before is not None else 0
+
+
+def _is_vmerge_continue(tc) -> bool:
+    merge = _child(_child(tc, _w('tcPr')), _w('vMerge'))
+    return merge is not None and merge.get(W_VAL, 'continue') == 'continue'
+
+
+def _table_rows(table) -> List[List[str]]:
+    """
+    表格单元格文本，合并单元格按 python-docx 的方式展开：
+    横向合并的单元格重复 gridSpan 次，纵向合并的后续单元格取上方起始单元格的文本
+    """
+    rows = []
+    previous = None  # 上一行：网格起始列 -> (单元格文本, gridSpan)
+    for tr in table.iterchildren(W_TR):
+        row = []
+        cells = {}
+        offset = _grid_before(tr)
+        for tc in tr.iterchildren(W_TC):
+            span = _grid_span(tc)
+            if _is_vmerge_continue(tc) and previous and offset in previous:
+                text, span = previous[offset]
+            else:
+                text = '\n'.join(_paragraph_text(p) for p in tc.iterchildren(W_P)).strip()
+            cells[offset] = (text, span)
+            row.extend([text] * span)
+            offset += span
+        rows.append(row)
+        previous = cells
+    return rows
+
+
+def _first_run_font_size(paragraph) -> Optional[float]:
+    """
+    第一个直接子 w:r 的字号（磅），与 paragraph.runs[0].font.size 一致
+    """
+    run = paragraph.find(W_R)
+    size = _child(_child(run, _w('rPr')), _w('sz'))
+    if size is None or size.get(W_VAL) is None:
+        return None
+    length = ST_HpsMeasure.convert_from_xml(size.get(W_VAL))
+    return length.pt if length else None
+
+
+class _StyleTable:
+    """
+    段落样式表：每个样式只解析一次，段落只需按样式ID查表
+
+    样式ID不存在或不是段落样式时使用默认段落样式，与 python-docx 的 paragraph.style 一致。
+    """
+
+    def __init__(self, styles_xml):
+        self.headings = {}  # 样式ID -> 是否为标题样式
+        self.default = False
+        if styles_xml is None:
+            return
+        for _, style in etree.iterparse(styles_xml, events=('end',), tag=_w('style')):
+            if style.get(_w('type')) == 'paragraph':
+                name_element = style.find(_w('name'))
+                name = (name_element.get(W_VAL) if name_element is not None else None) or ''
+                is_heading = any(heading in name.lower() for heading in ['heading', '标题'])
+                style_id = style.get(_w('styleId'))
+                if style_id is not None and style_id not in self.headings:
+                    self.headings[style_id] = is_heading
+                if style.get(_w('default'), '').lower() in _ON_VALUES:
+                    self.default = is_heading  # 规范要求取文档中最后一个默认样式
+            style.clear()
+
+    def is_heading(self, paragraph) -> bool:
+        style = _child(_child(paragraph, _w('pPr')), _w('pStyle'))
+        style_id = style.get(W_VAL) if style is not None else None
+        return self.headings.get(style_id, self.default)
+
+
+def _document_part(package) -> str:
+    """
+    主文档部件的路径（通常为 word/document.xml）
+    """
+    with package.open('_rels/.rels') as rels:
+        for rel in etree.parse(rels).getroot():
+            if rel.get('Type') == OFFICE_DOCUMENT_TYPE:
+                return rel.get('Target').lstrip('/')
+    return 'word/document.xml'
+
+
+def _part_relationships(package, part_name: str) -> Dict[str, str]:
+    """
+    部件的内部关系：关系ID -> 目标部件路径
+    """
+    base, name = posixpath.split(part_name)
+    rels_name = posixpath.join(base, '_rels', name + '.rels')
+    targets = {}
+    if rels_name not in package.namelist():
+        return targets
+    with package.open(rels_name) as rels:
+        for rel in etree.parse(rels).getroot():
+            if rel.get('TargetMode') == 'External':
+                continue
+            target = rel.get('Target')
+            if target.startswith('/'):
+                targets[rel.get('Id')] = target.lstrip('/')
+            else:
+                targets[rel.get('Id')] = posixpath.normpath(posixpath.join(base, target))
+    return targets
+
+
+def iter_docx_elements(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    流式读取DOCX正文，按阅读顺序产出文本项、表格和图片
+
+    正文的每个顶层段落或表格解析完成后立即处理并释放，图片部件在被引用时才读取，
+    内存占用与单个表格或图片相关，与文档大小无关。
+
+    Args:
+        file_path: 文件路径
+
+    Yields:
+        Dict: 与 DocumentReader._iter_docx_body() 相同的文档元素
+    """
+    with zipfile.ZipFile(file_path) as package:
+        names = set(package.namelist())
+        document_part = _document_part(package)
+        relationships = _part_relationships(package, document_part)
+
+        styles_part = next((target for target in relationships.values()
+                            if posixpath.basename(target) == 'styles.xml'), None)
+        if styles_part in names:
+            with package.open(styles_part) as styles_xml:
+                styles = _StyleTable(styles_xml)
+        else:
+            styles = _StyleTable(None)
+
+        paragraph_index = 0
+        with package.open(document_part) as document_xml:
+            for _, element in etree.iterparse(document_xml, events=('end',), tag=(W_P, W_TBL), huge_tree=True):
+                parent = element.getparent()
+                if parent is None or parent.tag != W_BODY:
+                    continue  # 表格中的段落随表格一起处理
+
+                if element.tag == W_P:
+                    text = _paragraph_text(element).strip()
+                    if text:
+                        yield {
+                            'text': text,
+                            'type': 'heading' if styles.is_heading(element) else 'paragraph',
+                            'font_size': _first_run_font_size(element)
+                        }
+                    position = paragraph_index
+                    paragraph_index += 1
+                else:
+                    position = paragraph_index
+                    yield {'type': 'table', 'content': _table_rows(element), 'position': position}
+
+                for blip in element.iter(A_BLIP):
+                    target = relationships.get(blip.get(R_EMBED))
+                    if target is None or target not in names:
+                        continue
+                    # 每次引用时才读取图片部件，不在整个文档期间保留已读过的图片
+                    yield {
+                        'data': package.read(target),
+                        'name': posixpath.basename(target),
+                        'paragraph_index': position,
+                        'type': 'image',
+                        'position': position  # 用于排序
+                    }
+
+                # 释放已处理的元素
+                element.clear()
+                while element.getprevious() is not None:
+                    del parent[0]
@@ -7,11 +7,18 @@
 
 import os
 import sys
+import json
+import signal
 import argparse
+import threading
 import time
 from document_reader import DocumentReader
 from content_analyzer import ContentAnalyzer
 from presentation_generator import PresentationGenerator
+from conversion_cache import ConversionCache
+from batch_converter import collect_inputs, convert_batch
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'doc2ppt')
 
 
 def parse_arguments():
@@ -22,13 +29,49 @@ def parse_arguments():
         argparse.Namespace: 解析后的参数
     """
     parser = argparse.ArgumentParser(description='将文档转换为演示文稿')
-    parser.add_argument('-i', '--input', required=True, help='输入文档文件路径 (支持 .doc, .docx, .pdf)')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('-i', '--input', help='输入文档文件路径 (支持 .doc, .docx, .pdf)')
+    source.add_argument('--batch', nargs='+', metavar='PATH',
+                        help='批量模式: 目录（递归查找文档）、通配符或文件，在工作进程池中转换')
+    source.add_argument('--serve', action='store_true',
+                        help='服务模式: 作为常驻服务通过本地HTTP或Unix套接字接收转换任务')
     parser.add_argument('-o', '--output', help='输出演示文稿文件路径 (默认为输入文件名 + .pptx)')
     parser.add_argument('--verbose', action='store_true', help='显示详细处理信息')
     parser.add_argument('--max-slides', type=int, default=50, help='最大幻灯片数量')
     parser.add_argument('--no-style', action='store_false', dest='optimize_style', 
                         help='不应用样式优化')
     parser.add_argument('--decorations', action='store_true', help='添加装饰元素')
+    parser.add_argument('--pdf-workers', type=int, default=1,
+                        help='读取PDF时并行处理页面的进程数 (默认为1，即串行)')
+    parser.add_argument('--analyze-workers', type=int, default=1,
+                        help='在标题处分片并行分析文本内容的进程数 (默认为1，即串行；结果与串行完全相同)')
+    parser.add_argument('--fast-docx', action='store_true',
+                        help='用流式XML解析读取DOCX，不构建python-docx对象模型（大文件更快、更省内存）')
+    parser.add_argument('--stream', action='store_true',
+                        help='流式转换：边读取边分析边生成幻灯片，内存占用不随文档大小增长')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help='读取和分析结果的缓存目录，按文件内容哈希索引 (默认: ~/.cache/doc2ppt)')
+    parser.add_argument('--cache-size', type=int, default=500,
+                        help='缓存总大小上限，单位MB，超出时淘汰最久未使用的条目 (默认: 500)')
+    parser.add_argument('--no-cache', action='store_true', help='不使用读取和分析结果缓存')
+    parser.add_argument('--output-dir', help='批量模式的输出目录 (默认输出到各输入文件旁边)')
+    parser.add_argument('--jobs', type=int, help='批量和服务模式的工作进程数 (默认为CPU核心数)')
+    parser.add_argument('--timeout', type=float, default=300,
+                        help='批量和服务模式下单个文件的超时时间，单位秒 (默认: 300，0表示不限制)')
+    parser.add_argument('--report', help='批量模式的JSON汇总报告路径 (默认: 输出目录或当前目录下的 batch_report.json)')
+    parser.add_argument('--host', default='127.0.0.1', help='服务模式的监听地址 (默认: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='服务模式的监听端口 (默认: 8765)')
+    parser.add_argument('--socket', help='服务模式改为监听该Unix套接字路径')
+    parser.add_argument('--queue-size', type=int, default=32,
+                        help='服务模式下等待中的任务数量上限，队列满时返回503 (默认: 32)')
+    parser.add_argument('--retention', type=float, default=3600,
+                        help='服务模式下已完成任务及其结果的保留时间，单位秒 (默认: 3600)')
+    parser.add_argument('--work-dir', default=os.path.join(DEFAULT_CACHE_DIR, 'service'),
+                        help='服务模式保存上传文档和生成结果的目录 (默认: ~/.cache/doc2ppt/service)')
+    parser.add_argument('--allow-root', action='append', metavar='DIR',
+                        help='服务模式下JSON请求中的 input/output 路径允许位于的目录，可多次指定 (默认只允许 --work-dir)')
+    parser.add_argument('--max-upload', type=int, default=100,
+                        help='服务模式下请求体大小上限，单位MB，超出时返回413 (默认: 100)')
     
     return parser.parse_args()
 
@@ -77,7 +120,8 @@ def determine_output_path(input_path, output_path=None):
         return f"{base_name}_presentation.pptx"
 
 def convert_document_to_presentation(input_file, output_file, verbose=False, max_slides=50, 
-                                    optimize_style=True, add_decorations=False):
+                                    optimize_style=True, add_decorations=False, pdf_workers=1,
+                                    stream=False, cache=None, fast_docx=False, analyze_workers=1):
     """
     将文档转换为演示文稿
     
@@ -86,36 +130,61 @@ def convert_document_to_presentation(input_file, output_file, verbose=False, max
         output_file: 输出文件路径
         verbose: 是否显示详细信息
         max_slides: 最大幻灯片数量
+        pdf_workers: 读取PDF时的并行进程数
+        stream: 是否使用流式转换
+        cache: ConversionCache 实例，命中时跳过读取和分析（流式转换不使用缓存）
+        fast_docx: 是否使用DOCX快速读取
+        analyze_workers: 分片并行分析文本内容的进程数
         
     Returns:
         bool: 转换是否成功
     """
     start_time = time.time()
     
+    if stream:
+        style_options = {'add_decorations': add_decorations} if optimize_style else None
+        return convert_document_streaming(input_file, output_file, verbose, max_slides,
+                                          style_options, start_time, fast_docx)
+    
     try:
-        # 1. 读取文档
-        if verbose:
-            print(f"正在读取文档: {input_file}")
-        
-        reader = DocumentReader()
-        document_data = reader.read(input_file)
-        
-        if verbose:
-            print(f"成功读取文档，检测到 {len(document_data.get('content', []))} 个文本元素")
-            if 'tables' in document_data:
-                print(f"检测到 {len(document_data['tables'])} 个表格")
-            if 'images' in document_data:
-                print(f"检测到 {len(document_data['images'])} 个图片")
-        
-        # 2. 分析内容
-        if verbose:
-            print("正在分析文档内容...")
-        
-        analyzer = ContentAnalyzer()
-        content_blocks = analyzer.analyze(document_data)
+        file_hash = cache.file_hash(input_file) if cache else None
+        cached = cache.get(file_hash) if cache else None
         
-        if verbose:
-            print(f"内容分析完成，生成 {len(content_blocks)} 个内容块")
+        if cached:
+            document_data, content_blocks = cached
+            if verbose:
+                print(f"命中缓存，跳过读取和分析: {file_hash[:12]}")
+                print(f"缓存中有 {len(content_blocks)} 个内容块")
+        else:
+            # 1. 读取文档
+            if verbose:
+                print(f"正在读取文档: {input_file}")
+            
+            reader = DocumentReader(pdf_workers=pdf_workers, verbose=verbose, fast_docx=fast_docx)
+            document_data = reader.read(input_file)
+            
+            if verbose:
+                print(f"成功读取文档，检测到 {len(document_data.get('content', []))} 个文本元素")
+                if 'tables' in document_data:
+                    print(f"检测到 {len(document_data['tables'])} 个表格")
+                if 'images' in document_data:
+                    print(f"检测到 {len(document_data['images'])} 个图片")
+            
+            # 2. 分析内容
+            if verbose:
+                print("正在分析文档内容...")
+            
+            analyzer = ContentAnalyzer(workers=analyze_workers)
+            content_blocks = analyzer.analyze(document_data)
+            
+            if verbose:
+                print(f"内容分析完成，生成 {len(content_blocks)} 个内容块")
+            
+            if cache:
+                try:
+                    cache.put(file_hash, document_data, content_blocks)
+                except Exception as e:
+                    print(f"警告: 写入缓存失败: {str(e)}")
         
         # 生成演示文稿
         if verbose:
@@ -157,6 +226,129 @@ def convert_document_to_presentation(input_file, output_file, verbose=False, max
             traceback.print_exc()
         return False
 
+def convert_document_streaming(input_file, output_file, verbose, max_slides, style_options, start_time,
+                               fast_docx=False):
+    """
+    流式转换：DocumentReader逐个产出元素，ContentAnalyzer每完成一个章节即产出，
+    PresentationGenerator随即生成对应的幻灯片
+    
+    Args:
+        input_file: 输入文件路径
+        output_file: 输出文件路径
+        verbose: 是否显示详细信息
+        max_slides: 最大顶层内容块数量（与非流式模式的截断方式一致）
+        style_options: 样式优化选项
+        start_time: 开始时间
+        fast_docx: 是否使用DOCX快速读取
+        
+    Returns:
+        bool: 转换是否成功
+    """
+    try:
+        if verbose:
+            print(f"正在流式转换文档: {input_file}")
+        
+        reader = DocumentReader(verbose=verbose, fast_docx=fast_docx)
+        analyzer = ContentAnalyzer()
+        generator = PresentationGenerator()
+        
+        elements = reader.iter_elements(input_file)
+        blocks = analyzer.analyze_stream(elements)
+        output_path = generator.generate_stream(blocks, output_file, style_options, max_blocks=max_slides)
+        
+        processing_time = time.time() - start_time
+        print(f"✓ 转换完成！")
+        print(f"输出文件: {output_path}")
+        print(f"处理时间: {processing_time:.2f} 秒")
+        return True
+        
+    except Exception as e:
+        print(f"错误: {str(e)}")
+        if verbose:
+            import traceback
+            traceback.print_exc()
+        return False
+
+def run_batch(args):
+    """
+    批量转换并写入JSON汇总报告
+    
+    Args:
+        args: 命令行参数
+        
+    Returns:
+        bool: 是否所有文件都转换成功
+    """
+    inputs = collect_inputs(args.batch)
+    if not inputs:
+        print(f"错误: 没有找到可转换的文档 {' '.join(args.batch)}")
+        return False
+    
+    print(f"批量转换 {len(inputs)} 个文档...")
+    style_options = {'add_decorations': args.decorations} if args.optimize_style else None
+    report = convert_batch(
+        inputs,
+        output_dir=args.output_dir,
+        workers=args.jobs,
+        timeout=args.timeout or None,
+        max_slides=args.max_slides,
+        style_options=style_options,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        cache_size=args.cache_size * 1024 * 1024,
+        fast_docx=args.fast_docx,
+        verbose=True
+    )
+    
+    report_path = args.report or os.path.join(args.output_dir or '.', 'batch_report.json')
+    report_dir = os.path.dirname(report_path)
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    
+    print(f"\n完成: 成功 {report['succeeded']}, 失败 {report['failed']}, "
+          f"超时 {report['timed_out']}, 崩溃 {report['crashed']} "
+          f"({report['workers']} 个工作进程, {report['elapsed_seconds']:.2f} 秒)")
+    print(f"汇总报告: {report_path}")
+    return report['succeeded'] == report['total']
+
+def run_service(args):
+    """
+    启动常驻转换服务，直到收到中断信号
+    
+    Args:
+        args: 命令行参数
+    """
+    from conversion_service import ConversionService, make_server
+    
+    service = ConversionService(
+        args.work_dir,
+        workers=args.jobs,
+        queue_size=args.queue_size,
+        timeout=args.timeout or None,
+        retention=args.retention,
+        max_slides=args.max_slides,
+        style_options={'add_decorations': args.decorations} if args.optimize_style else None,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        cache_size=args.cache_size * 1024 * 1024,
+        fast_docx=args.fast_docx,
+        max_upload=args.max_upload * 1024 * 1024,
+        allowed_roots=args.allow_root
+    )
+    service.start()
+    server = make_server(service, args.host, args.port, args.socket)
+    # SIGTERM 与 Ctrl+C 一样正常停止服务（shutdown() 需要在其他线程中调用）
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    address = args.socket or f"http://{args.host}:{args.port}"
+    print(f"转换服务已启动: {address} ({service.workers} 个工作进程)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n正在停止服务...")
+    finally:
+        server.server_close()
+        service.shutdown()
+
 def main():
     """
     主函数
@@ -169,6 +361,15 @@ def main():
     # 解析命令行参数
     args = parse_arguments()
     
+    if args.batch:
+        if not run_batch(args):
+            sys.exit(1)
+        return
+    
+    if args.serve:
+        run_service(args)
+        return
+    
     # 验证输入文件
     if not validate_input_file(args.input):
         sys.exit(1)
@@ -176,28 +377,23 @@ def main():
     # 确定输出路径
     output_file = determine_output_path(args.input, args.output)
     
-    # 初始化读取器，用于后续可能的清理操作
-    reader = None
-    try:
-        # 创建读取器实例
-        reader = DocumentReader()
-        
-        # 转换文档
-        success = convert_document_to_presentation(
-            input_file=args.input,
-            output_file=output_file,
-            verbose=args.verbose,
-            max_slides=args.max_slides,
-            optimize_style=args.optimize_style,
-            add_decorations=args.decorations
-        )
-        
-        if not success:
-            sys.exit(1)
-    finally:
-        # 清理临时文件
-        if reader and hasattr(reader, 'cleanup_temp_files'):
-            reader.cleanup_temp_files()
+    # 转换文档
+    success = convert_document_to_presentation(
+        input_file=args.input,
+        output_file=output_file,
+        verbose=args.verbose,
+        max_slides=args.max_slides,
+        optimize_style=args.optimize_style,
+        add_decorations=args.decorations,
+        pdf_workers=args.pdf_workers,
+        stream=args.stream,
+        cache=None if args.no_cache else ConversionCache(args.cache_dir, args.cache_size * 1024 * 1024),
+        fast_docx=args.fast_docx,
+        analyze_workers=args.analyze_workers
+    )
+    
+    if not success:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
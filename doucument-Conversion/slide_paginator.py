@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+幻灯片分页模块
+用字形宽度估计文本的换行和行数，把长文本按行容量、长表格按行高拆分到多张幻灯片，
+不需要实际渲染，耗时与文本长度成线性关系
+"""
+
+import unicodedata
+from functools import lru_cache
+from typing import List, Tuple
+
+LINE_SPACING = 1.2          # 行高与字号之比
+CELL_MARGIN_X = 0.1 * 72    # 表格单元格左右内边距（磅），与python-pptx默认值一致
+CELL_MARGIN_Y = 0.05 * 72   # 表格单元格上下内边距（磅）
+
+# 常见窄字符的宽度（以字号为单位）
+_NARROW_GLYPHS = dict.fromkeys('.,;:!|\'"`()[]{}ilIjtf', 0.3)
+
+
+@lru_cache(maxsize=4096)
+def glyph_width(char: str) -> float:
+    """
+    估计单个字符的宽度（以字号为单位）
+
+    全角字符（中日韩文字和标点）为1，其余按常见比例字体的平均宽度估计。
+
+    Args:
+        char: 字符
+
+    Returns:
+        float: 字符宽度与字号之比
+    """
+    if char in _NARROW_GLYPHS:
+        return _NARROW_GLYPHS[char]
+    if char.isspace():
+        return 0.28
+    if unicodedata.east_asian_width(char) in ('W', 'F'):
+        return 1.0
+    if char.isupper():
+        return 0.65
+    if char.isdigit():
+        return 0.55
+    return 0.52
+
+
+def text_width(text: str, font_size: float) -> float:
+    """
+    估计一行文本的宽度（磅）
+
+    Args:
+        text: 文本
+        font_size: 字号（磅）
+
+    Returns:
+        float: 文本宽度（磅）
+    """
+    return sum(glyph_width(char) for char in text) * font_size
+
+
+def wrap_text(text: str, font_size: float, width: float) -> List[Tuple[int, int]]:
+    """
+    按估计的字形宽度自动换行
+
+    优先在空白之后或全角字符之间换行，一个词比整行还宽时在字符处断开；
+    文本中的换行符总是开始新行。
+
+    Args:
+        text: 文本
+        font_size: 字号（磅）
+        width: 可用行宽（磅）
+
+    Returns:
+        List[Tuple]: 每一行在文本中的 (起始下标, 结束下标)
+    """
+    limit = width / font_size
+    lines = []
+    start = 0
+    while start <= len(text):
+        end = text.find('\n', start)
+        if end < 0:
+            end = len(text)
+
+        line_start = start
+        used = 0.0
+        break_at = None      # 最近的可换行位置
+        after_break = 0.0    # 可换行位置之后的字符宽度
+        for index in range(start, end):
+            char = text[index]
+            char_width = glyph_width(char)
+            while used + char_width > limit and index > line_start:
+                if break_at is not None and break_at > line_start:
+                    lines.append((line_start, break_at))
+                    line_start = break_at
+                    used = after_break
+                else:
+                    lines.append((line_start, index))
+                    line_start = index
+                    used = 0.0
+                break_at = None
+                after_break = 0.0
+            used += char_width
+            after_break += char_width
+            if char.isspace() or char_width == 1.0:
+                break_at = index + 1
+                after_break = 0.0
+        lines.append((line_start, end))
+        start = end + 1
+    return lines
+
+
+def count_lines(text: str, font_size: float, width: float) -> int:
+    """
+    估计文本换行后的行数
+
+    Args:
+        text: 文本
+        font_size: 字号（磅）
+        width: 可用行宽（磅）
+
+    Returns:
+        int: 行数
+    """
+    return len(wrap_text(text, font_size, width))
+
+
+def paginate_text(text: str, font_size: float, width: float, height: float) -> List[str]:
+    """
+    把文本按文本框的行容量拆分为多页，只在行边界处拆分
+
+    Args:
+        text: 文本
+        font_size: 字号（磅）
+        width: 文本框可用宽度（磅）
+        height: 文本框可用高度（磅）
+
+    Returns:
+        List[str]: 每页的文本（至少一页）
+    """
+    lines = wrap_text(text, font_size, width)
+    per_page = max(1, int(height // (font_size * LINE_SPACING)))
+    pages = []
+    for first in range(0, len(lines), per_page):
+        last = lines[min(first + per_page, len(lines)) - 1]
+        page = text[lines[first][0]:last[1]].strip()
+        if page:
+            pages.append(page)
+    return pages or [text.strip()]
+
+
+def table_row_heights(rows: List[List[str]], font_size: float, column_width: float) -> List[float]:
+    """
+    估计表格每一行的高度：行中换行后最多的单元格决定行高
+
+    Args:
+        rows: 表格数据
+        font_size: 字号（磅）
+        column_width: 列宽（磅）
+
+    Returns:
+        List[float]: 每一行的高度（磅）
+    """
+    text_width_limit = max(column_width - 2 * CELL_MARGIN_X, font_size)
+    line_height = font_size * LINE_SPACING
+    return [max((count_lines(str(cell or ''), font_size, text_width_limit) for cell in row), default=1)
+            * line_height + 2 * CELL_MARGIN_Y
+            for row in rows]
+
+
+def paginate_rows(heights: List[float], height: float) -> List[Tuple[int, int]]:
+    """
+    按行高把表格正文行拆分为多页，每页的总高度不超过 height
+    （比 height 还高的单行单独占一页）
+
+    Args:
+        heights: 正文各行的高度（磅），不含表头
+        height: 每页正文可用的高度（磅），已扣除重复的表头
+
+    Returns:
+        List[Tuple]: 每页正文行的 (起始下标, 结束下标)，没有正文行时为一个空页
+    """
+    pages = []
+    start = 0
+    used = 0.0
+    for index, row_height in enumerate(heights):
+        if used + row_height > height and index > start:
+            pages.append((start, index))
+            start = index
+            used = 0.0
+        used += row_height
+    pages.append((start, len(heights)))
+    return pages
@@ -6,6 +6,7 @@
 
 import os
 import sys
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 import tempfile
@@ -17,6 +18,10 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from document_reader import DocumentReader
 from content_analyzer import ContentAnalyzer
 from presentation_generator import PresentationGenerator
+from conversion_cache import ConversionCache
+from batch_converter import collect_inputs, convert_batch
+from conversion_service import ConversionService, make_server
+from slide_paginator import paginate_text, paginate_rows, wrap_text, text_width
 
 
 class TestDocumentConverter(unittest.TestCase):
@@ -91,6 +96,397 @@ class TestDocumentConverter(unittest.TestCase):
             self.assertEqual(result['format'], 'docx')
             self.assertEqual(len(result['content']), 1)
     
+    def _create_docx_with_image(self, path):
+        """
+        创建包含段落、图片和表格的docx文件
+        """
+        from docx import Document
+        from docx.shared import Inches
+        from PIL import Image
+        import io
+        
+        image_stream = io.BytesIO()
+        Image.new('RGB', (40, 30), (200, 0, 0)).save(image_stream, format='PNG')
+        
+        doc = Document()
+        doc.add_heading('第一章', level=1)
+        doc.add_paragraph('图片之前的段落')
+        image_stream.seek(0)
+        doc.add_picture(image_stream, width=Inches(1))
+        doc.add_paragraph('图片之后的段落')
+        table = doc.add_table(rows=2, cols=2)
+        table.cell(0, 0).text = 'A'
+        table.cell(0, 1).text = 'B'
+        table.cell(1, 0).text = '1'
+        table.cell(1, 1).text = '2'
+        doc.save(path)
+    
+    def test_read_docx_single_pass(self):
+        """
+        测试DOCX单次遍历读取：段落、表格和图片位置
+        """
+        docx_path = os.path.join(self.temp_dir, "images.docx")
+        self._create_docx_with_image(docx_path)
+        
+        result = self.reader.read(docx_path)
+        self.assertEqual([item['text'] for item in result['content']],
+                         ['第一章', '图片之前的段落', '图片之后的段落'])
+        self.assertEqual(result['content'][0]['type'], 'heading')
+        self.assertEqual(result['tables'], [[['A', 'B'], ['1', '2']]])
+        
+        # 图片位于第3个正文段落（下标2），数据保存在内存中
+        self.assertEqual(len(result['images']), 1)
+        self.assertEqual(result['images'][0]['paragraph_index'], 2)
+        self.assertTrue(result['images'][0]['data'].startswith(b'\x89PNG'))
+    
+    def test_fast_docx_reader_matches_python_docx(self):
+        """
+        测试DOCX快速读取与python-docx读取的结果完全一致（含合并单元格、图片和字号）
+        """
+        from docx import Document
+        from docx.shared import Pt
+        
+        docx_path = os.path.join(self.temp_dir, 'merged.docx')
+        self._create_docx_with_image(docx_path)
+        doc = Document(docx_path)
+        paragraph = doc.add_paragraph()
+        run = paragraph.add_run('Sized\ttext')
+        run.font.size = Pt(16)
+        run.add_break()
+        paragraph.add_run('next line')
+        table = doc.add_table(rows=4, cols=3)
+        for i, row in enumerate(table.rows):
+            for j, cell in enumerate(row.cells):
+                cell.text = f'r{i}c{j}'
+        table.cell(0, 0).merge(table.cell(0, 1))
+        table.cell(1, 2).merge(table.cell(3, 2))
+        table.cell(2, 0).merge(table.cell(3, 1))
+        doc.add_heading('第二章', 2)
+        doc.save(docx_path)
+        
+        expected = DocumentReader().read(docx_path)
+        result = DocumentReader(fast_docx=True).read(docx_path)
+        self.assertEqual(result, expected)
+        self.assertEqual(result['tables'][-1][3], ['r2c0\nr2c1\nr3c0\nr3c1'] * 2 + ['r1c2\nr2c2\nr3c2'])
+        self.assertEqual(len(result['images']), 1)
+    
+    def test_image_slide_from_memory(self):
+        """
+        测试内存中的图片数据直接生成图片幻灯片
+        """
+        from pptx import Presentation
+        
+        docx_path = os.path.join(self.temp_dir, "images.docx")
+        self._create_docx_with_image(docx_path)
+        blocks = self.analyzer.analyze(self.reader.read(docx_path))
+        
+        output_path = os.path.join(self.temp_dir, "images.pptx")
+        self.generator.generate(blocks, output_path)
+        
+        prs = Presentation(output_path)
+        pictures = [shape for slide in prs.slides for shape in slide.shapes if shape.shape_type == 13]
+        self.assertEqual(len(pictures), 1)
+    
+    def _create_pdf(self, path, pages=6, table_pages=None):
+        """
+        创建每页包含文本和一个表格的PDF文件，table_pages指定只有哪些页（从1开始）包含表格
+        """
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+        
+        c = canvas.Canvas(path, pagesize=A4)
+        for page in range(pages):
+            c.drawString(72, 800, f'Page {page + 1} title')
+            c.drawString(72, 780, f'Body text on page {page + 1}')
+            if table_pages is not None and page + 1 not in table_pages:
+                c.showPage()
+                continue
+            for r in range(3):
+                for k in range(3):
+                    c.rect(72 + k * 80, 600 - r * 20, 80, 20)
+                    c.drawString(75 + k * 80, 605 - r * 20, f'r{r}c{k}')
+            c.showPage()
+        c.save()
+    
+    def test_read_pdf_parallel_matches_serial(self):
+        """
+        测试并行页面提取与串行提取结果一致
+        """
+        pdf_path = os.path.join(self.temp_dir, "pages.pdf")
+        self._create_pdf(pdf_path)
+        
+        serial = DocumentReader().read(pdf_path)
+        parallel = DocumentReader(pdf_workers=2).read(pdf_path)
+        
+        self.assertEqual(serial['page_count'], 6)
+        self.assertEqual(len(serial['tables']), 6)
+        self.assertEqual(parallel, serial)
+        self.assertEqual([item['page'] for item in parallel['content']],
+                         sorted(item['page'] for item in parallel['content']))
+    
+    def test_read_pdf_skips_table_detection_on_text_pages(self):
+        """
+        测试纯文字页面跳过表格检测，带表格的页面仍然提取表格
+        """
+        from pdfplumber.page import Page
+        
+        pdf_path = os.path.join(self.temp_dir, 'mixed.pdf')
+        self._create_pdf(pdf_path, pages=5, table_pages={2, 4})
+        
+        with patch.object(Page, 'extract_tables', autospec=True,
+                          side_effect=Page.extract_tables) as mock_extract:
+            result = DocumentReader().read(pdf_path)
+        
+        self.assertEqual(mock_extract.call_count, 2)
+        self.assertEqual(len(result['tables']), 2)
+        self.assertEqual(result['tables'][0][0], ['r0c0', 'r0c1', 'r0c2'])
+        self.assertEqual({item['page'] for item in result['content']}, {1, 2, 3, 4, 5})
+    
+    def test_read_pdf_images_deduplicated(self):
+        """
+        测试PDF图片被提取为内存数据，重复的抬头图片只保留一份
+        """
+        from io import BytesIO
+        from PIL import Image
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+        
+        logo_path = os.path.join(self.temp_dir, 'logo.png')
+        figure_path = os.path.join(self.temp_dir, 'figure.png')
+        Image.new('RGB', (40, 20), (200, 10, 10)).save(logo_path)
+        Image.new('RGB', (30, 30), (10, 10, 200)).save(figure_path)
+        
+        pdf_path = os.path.join(self.temp_dir, 'letterhead.pdf')
+        c = canvas.Canvas(pdf_path, pagesize=A4)
+        for page in range(3):
+            c.drawImage(logo_path, 72, 780, 40, 20)
+            c.drawString(72, 700, f'Body text on page {page + 1}')
+            if page == 1:
+                c.drawImage(figure_path, 72, 400, 60, 60)
+            c.showPage()
+        c.save()
+        
+        result = DocumentReader().read(pdf_path)
+        images = result['images']
+        self.assertEqual(len(images), 2)
+        self.assertEqual(images[0]['pages'], [1, 2, 3])
+        self.assertEqual(images[1]['page'], 2)
+        self.assertEqual(Image.open(BytesIO(images[0]['data'])).size, (40, 20))
+        
+        blocks = self.analyzer.analyze(result)
+        image_blocks = [block for block in blocks if block['type'] == 'image']
+        self.assertEqual([block['page'] for block in image_blocks], [1, 2])
+        self.assertTrue(all(block['data'] for block in image_blocks))
+    
+    def test_conversion_cache_roundtrip_and_eviction(self):
+        """
+        测试转换缓存按内容哈希命中，并在超出大小上限时淘汰最久未使用的条目
+        """
+        cache_dir = os.path.join(self.temp_dir, 'cache')
+        cache = ConversionCache(cache_dir, max_bytes=10 ** 9)
+        
+        paths = []
+        for i in range(3):
+            path = os.path.join(self.temp_dir, f'doc{i}.txt')
+            with open(path, 'wb') as f:
+                f.write(os.urandom(2048))
+            paths.append(path)
+        hashes = [ConversionCache.file_hash(path) for path in paths]
+        
+        document_data = {'content': [{'text': 'A', 'type': 'paragraph'}], 'images': [{'data': b'png'}]}
+        blocks = [{'type': 'paragraph', 'content': 'A', 'title': None}]
+        self.assertIsNone(cache.get(hashes[0]))
+        cache.put(hashes[0], document_data, blocks)
+        self.assertEqual(cache.get(hashes[0]), (document_data, blocks))
+        
+        # 上限只够保存两个条目：写入第三个时淘汰最久未使用的条目
+        entry_size = os.path.getsize(cache._entry_path(hashes[0]))
+        cache.max_bytes = entry_size * 2
+        cache.put(hashes[1], document_data, blocks)
+        os.utime(cache._entry_path(hashes[0]), (1, 1))
+        os.utime(cache._entry_path(hashes[1]), (2, 2))
+        cache.get(hashes[0])  # 命中后成为最近使用
+        cache.put(hashes[2], document_data, blocks)
+        
+        self.assertIsNotNone(cache.get(hashes[0]))
+        self.assertIsNone(cache.get(hashes[1]))
+        self.assertIsNotNone(cache.get(hashes[2]))
+    
+    def test_convert_batch_isolates_failures(self):
+        """
+        测试批量转换：损坏的文件和超时的文件只影响自身，其他文件正常输出
+        """
+        input_dir = os.path.join(self.temp_dir, 'batch')
+        os.makedirs(os.path.join(input_dir, 'sub'))
+        self._create_docx_with_image(os.path.join(input_dir, 'good.docx'))
+        self._create_pdf(os.path.join(input_dir, 'sub', 'report.pdf'))
+        with open(os.path.join(input_dir, 'broken.pdf'), 'w') as f:
+            f.write('not a pdf')
+        with open(os.path.join(input_dir, 'notes.txt'), 'w') as f:
+            f.write('ignored')
+        
+        inputs = collect_inputs([input_dir])
+        self.assertEqual([relative for _, relative in inputs],
+                         ['broken.pdf', 'good.docx', os.path.join('sub', 'report.pdf')])
+        
+        output_dir = os.path.join(self.temp_dir, 'out')
+        report = convert_batch(inputs, output_dir, workers=2)
+        statuses = {os.path.basename(record['input']): record['status'] for record in report['files']}
+        self.assertEqual(statuses, {'broken.pdf': 'error', 'good.docx': 'ok', 'report.pdf': 'ok'})
+        self.assertEqual((report['total'], report['succeeded'], report['failed']), (3, 2, 1))
+        self.assertTrue(os.path.exists(os.path.join(output_dir, 'sub', 'report_presentation.pptx')))
+        
+        report = convert_batch(inputs[2:], output_dir, workers=1, timeout=0.001)
+        self.assertEqual(report['files'][0]['status'], 'timeout')
+    
+    def test_conversion_service_jobs(self):
+        """
+        测试转换服务：提交任务、轮询状态、下载结果，以及队列满时拒绝任务
+        """
+        import json
+        import queue
+        import threading
+        import http.client
+        import urllib.error
+        import urllib.request
+        
+        docx_path = os.path.join(self.temp_dir, 'service.docx')
+        self._create_docx_with_image(docx_path)
+        
+        # 没有启动调度线程时任务只会排队：超过上限的提交被拒绝
+        idle = ConversionService(os.path.join(self.temp_dir, 'idle'), workers=1, queue_size=1)
+        idle.submit(docx_path)
+        with self.assertRaises(queue.Full):
+            idle.submit(docx_path)
+        
+        service = ConversionService(os.path.join(self.temp_dir, 'service'), workers=1, retention=60,
+                                    max_upload=1024 * 1024, allowed_roots=[self.temp_dir])
+        service.start()
+        server = make_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            request = urllib.request.Request(
+                f"{base_url}/jobs", data=json.dumps({'input': docx_path, 'max_slides': 2}).encode('utf-8'),
+                headers={'Content-Type': 'application/json'})
+            with urllib.request.urlopen(request) as response:
+                self.assertEqual(response.status, 202)
+                job_id = json.load(response)['id']
+            
+            for _ in range(200):
+                with urllib.request.urlopen(f"{base_url}/jobs/{job_id}") as response:
+                    job = json.load(response)
+                if job['status'] not in ('queued', 'running'):
+                    break
+                time.sleep(0.05)
+            self.assertEqual(job['status'], 'ok', job['error'])
+            
+            with urllib.request.urlopen(f"{base_url}/jobs/{job_id}/result") as response:
+                self.assertTrue(response.read().startswith(b'PK'))
+            
+            # 无效参数返回400，允许目录之外的路径返回403，超过大小上限的请求体返回413
+            for payload, status in (({'input': docx_path, 'max_slides': None}, 400),
+                                    ({'input': docx_path, 'max_slides': 'many'}, 400),
+                                    (['not', 'an', 'object'], 400),
+                                    ({'input': '/etc/passwd.docx'}, 403),
+                                    ({'input': docx_path, 'output': '/tmp/../etc/out.pptx'}, 403)):
+                request = urllib.request.Request(
+                    f"{base_url}/jobs", data=json.dumps(payload).encode('utf-8'),
+                    headers={'Content-Type': 'application/json'})
+                with self.assertRaises(urllib.error.HTTPError) as context:
+                    urllib.request.urlopen(request)
+                self.assertEqual(context.exception.code, status, payload)
+            # 上传方式通过查询参数指定的 output 同样受限，且不保存上传的文档
+            request = urllib.request.Request(
+                f"{base_url}/jobs?filename=a.docx&output=/tmp/../etc/out.pptx", data=b'PK')
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                urllib.request.urlopen(request)
+            self.assertEqual(context.exception.code, 403)
+            self.assertEqual(os.listdir(os.path.join(service.work_dir, 'uploads')), [])
+            # 只发送请求头：服务根据 Content-Length 直接拒绝，不读取请求体
+            connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+            connection.putrequest('POST', '/jobs?filename=big.pdf')
+            connection.putheader('Content-Length', str(1024 * 1024 + 1))
+            connection.endheaders()
+            self.assertEqual(connection.getresponse().status, 413)
+            connection.close()
+            
+            # 超过保留时间后删除任务和服务生成的结果文件
+            service.expire(now=time.time() + 61)
+            self.assertIsNone(service.get(job_id))
+            self.assertFalse(os.path.exists(job['output']))
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.shutdown()
+    
+    def test_analyze_stream_matches_analyze(self):
+        """
+        测试窗口足够大时流式分析与 analyze() 的结果相同（不含阅读顺序编号）
+        """
+        texts = [('1. 第一章', 'heading'), ('段落一', 'paragraph'), ('E = mc^2', 'paragraph'),
+                 ('段落二', 'paragraph'), (None, 'table'), ('段落三', 'paragraph'),
+                 ('2. 第二章', 'heading'), ('段落四', 'paragraph')]
+        elements = []
+        document_data = {'content': [], 'tables': [], 'table_orders': [], 'images': []}
+        for order, (text, element_type) in enumerate(texts):
+            if element_type == 'table':
+                table = [['A', 'B'], ['1', '2']]
+                elements.append({'type': 'table', 'content': table})
+                document_data['tables'].append(table)
+                document_data['table_orders'].append(order)
+            else:
+                item = {'text': text, 'type': element_type, 'font_size': None}
+                elements.append(item)
+                document_data['content'].append(dict(item, order=order))
+        
+        def strip_order(blocks):
+            return [{key: (strip_order(value) if key == 'content' and isinstance(value, list)
+                           and value and isinstance(value[0], dict) else value)
+                     for key, value in block.items() if key != 'order'} for block in blocks]
+        
+        expected = strip_order(self.analyzer.analyze(document_data))
+        self.assertEqual(strip_order(self.analyzer.analyze_stream(iter(elements))), expected)
+        # 公式不结束段落：公式块在其前后段落合并成的段落块之前
+        self.assertEqual([block['type'] for block in expected[0]['content']],
+                         ['formula', 'paragraph', 'table', 'paragraph'])
+    
+    def test_analyze_stream_windows(self):
+        """
+        测试流式分析：章节完成即产出，超过窗口的章节拆分为续接章节
+        """
+        elements = [{'text': '1. 第一章', 'type': 'heading', 'font_size': None}]
+        elements += [{'text': f'段落{i}', 'type': 'paragraph', 'font_size': None} for i in range(5)]
+        elements.append({'type': 'table', 'content': [['A', 'B'], ['1', '2']]})
+        elements.append({'text': '2. 第二章', 'type': 'heading', 'font_size': None})
+        
+        blocks = list(self.analyzer.analyze_stream(iter(elements), window=2))
+        
+        self.assertEqual([block['title'] for block in blocks], ['1. 第一章', '1. 第一章', '2. 第二章'])
+        self.assertNotIn('continued', blocks[0])
+        self.assertTrue(blocks[1]['continued'])
+        # 表格按阅读顺序位于段落之后
+        self.assertEqual([item['type'] for item in blocks[0]['content']], ['paragraph', 'paragraph'])
+        self.assertEqual([item['type'] for item in blocks[1]['content']], ['paragraph', 'table'])
+    
+    def test_generate_stream_stops_reading_early(self):
+        """
+        测试流式生成达到最大内容块数量后不再读取后续元素
+        """
+        consumed = []
+        
+        def elements():
+            for i in range(100):
+                consumed.append(i)
+                yield {'text': f'{i + 1}. 章节', 'type': 'heading', 'font_size': None}
+                yield {'text': f'章节{i + 1}的内容', 'type': 'paragraph', 'font_size': None}
+        
+        output_path = os.path.join(self.temp_dir, "stream.pptx")
+        self.generator.generate_stream(self.analyzer.analyze_stream(elements()), output_path, max_blocks=3)
+        
+        self.assertTrue(os.path.exists(output_path))
+        self.assertLess(len(consumed), 10)
+    
     def test_content_analyzer_summarize_text(self):
         """
         测试文本摘要功能
@@ -99,7 +495,27 @@ class TestDocumentConverter(unittest.TestCase):
         summarized = self.analyzer.summarize_text(long_text, max_length=50)
         self.assertTrue(len(summarized) <= 50)
         self.assertTrue(summarized.endswith('...'))
-    
+
+    def test_extractive_summary_uses_document_scores(self):
+        """
+        测试摘要选取包含本段特有词语的句子、保持原文顺序，并按文本哈希缓存
+        """
+        filler = 'The report covers the project. '
+        target = (filler * 3 + 'Turbine blade erosion reduced turbine output sharply. ' + filler * 2
+                  + 'Blade coatings stopped the erosion.')
+        other = filler * 6
+        self.analyzer.prepare_summaries([
+            {'type': 'section', 'title': 'A', 'content': [{'type': 'paragraph', 'content': target}]},
+            {'type': 'paragraph', 'content': other},
+        ])
+
+        summary = self.analyzer.summarize_text(target, max_length=100)
+        self.assertLessEqual(len(summary), 100)
+        self.assertEqual(summary, 'Turbine blade erosion reduced turbine output sharply. '
+                                  'Blade coatings stopped the erosion....')
+        self.assertIs(self.analyzer.summarize_text(target, max_length=100), summary)
+        self.assertEqual(self.analyzer.summarize_text('short', max_length=100), 'short')
+
     def test_is_heading(self):
         """
         测试标题识别功能
@@ -132,6 +548,148 @@ class TestDocumentConverter(unittest.TestCase):
         normal_text = "这是一个不包含公式的普通文本。"
         self.assertFalse(self.analyzer._contains_formula(normal_text))
     
+    def test_classify_batch_matches_legacy_checks(self):
+        """
+        测试单次扫描分类与逐项判断（_is_heading 后 _contains_formula）的结果一致
+        """
+        texts = [
+            '1. Введение', '2.1 Scope', 'SUMMARY', 'Results And Discussion', 'Résumé Of Work',
+            'one two three', 'E = mc^2', 'a - b', 'x+y', 'price: $5 and $6', '$$', '\\[ x \\]',
+            '\\( y \\)', 'line one +\nline two =', '\\[ split\nline \\]', '1St Place Winners',
+            'Many Capitalized Words Here But Just Too Many Words For A Heading', 'обычный текст абзаца',
+            '', '   ', '12', 'UPPER lower', 'a_b', '√2 ≈ 1.41',
+        ]
+        items = [{'text': text, 'type': 'paragraph', 'font_size': size}
+                 for text in texts for size in (None, 12, 16)]
+        items.append({'text': 'x = y + 1', 'type': 'heading', 'font_size': None})
+        
+        expected = []
+        for item in items:
+            if self.analyzer._is_heading(item):
+                expected.append('heading')
+            elif self.analyzer._contains_formula(item['text']):
+                expected.append('formula')
+            else:
+                expected.append('paragraph')
+        
+        self.assertEqual(self.analyzer.classify_batch(items), expected)
+        self.assertEqual(self.analyzer.classify(items[0]), 'heading')
+
+    def test_sharded_analysis_matches_serial(self):
+        """
+        测试在标题处分片并行分析的结果与串行分析完全一致
+        """
+        texts = ['Данные были собраны и обработаны стандартными методами.', 'Площадь круга S = π r^2',
+                 'Results And Discussion', 'see the appendix for details', '$E = mc^2$']
+        content = []
+        for section in range(40):
+            content.append({'text': f'{section + 1}. Раздел {section}', 'type': 'paragraph', 'font_size': None})
+            content.extend({'text': texts[(section + i) % len(texts)], 'type': 'paragraph', 'font_size': 12}
+                           for i in range(section % 7 + 3))
+
+        parallel = ContentAnalyzer(workers=2)
+        shards = parallel._shard_content(content, 20)
+        self.assertGreater(len(shards), 2)
+        self.assertEqual([item for shard in shards for item in shard], content)
+        for shard in shards[1:]:
+            self.assertEqual(parallel.classify(shard[0]), 'heading')
+
+        parallel.SHARD_MIN_ITEMS = 10
+        document_data = {'content': content, 'tables': [], 'images': []}
+        self.assertEqual(parallel.analyze(document_data), self.analyzer.analyze(document_data))
+
+    def test_analyze_merges_tables_and_images_in_reading_order(self):
+        """
+        测试表格和图片按阅读顺序归并到正文之间，而不是排在最后
+        """
+        docx_path = os.path.join(self.temp_dir, "order.docx")
+        self._create_docx_with_image(docx_path)
+
+        for fast_docx in (False, True):
+            document_data = DocumentReader(fast_docx=fast_docx).read(docx_path)
+            blocks = self.analyzer.analyze(document_data)
+            self.assertEqual(len(blocks), 1)
+            self.assertEqual(blocks[0]['title'], '第一章')
+            section = blocks[0]['content']
+            self.assertEqual([block['type'] for block in section], ['paragraph', 'image', 'paragraph', 'table'])
+            self.assertEqual(section[0]['content'], '图片之前的段落')
+            self.assertEqual(section[2]['content'], '图片之后的段落')
+            orders = [block['order'] for block in section]
+            self.assertEqual(orders, sorted(orders))
+
+        # 没有阅读顺序的数据：表格和图片保持在正文之后
+        blocks = self.analyzer.analyze({
+            'content': [{'text': '正文', 'type': 'paragraph'}],
+            'tables': [[['A', 'B']]],
+            'images': [{'data': b'', 'name': 'x.png'}]
+        })
+        self.assertEqual([block['type'] for block in blocks], ['paragraph', 'table', 'image'])
+
+    def test_paginate_text_by_line_capacity(self):
+        """
+        测试按估计行宽换行，并只在行边界处拆分页面
+        """
+        text = ' '.join(f'word{i}' for i in range(300)) + '\n' + '中文分页测试。' * 30
+        lines = wrap_text(text, 24, 400)
+        for start, end in lines:
+            self.assertLessEqual(text_width(text[start:end].rstrip(), 24), 400)
+
+        pages = paginate_text(text, 24, 400, 24 * 1.2 * 5)
+        self.assertGreater(len(pages), 1)
+        self.assertEqual(''.join(''.join(pages).split()), ''.join(text.split()))
+        for page in pages:
+            self.assertLessEqual(len(wrap_text(page, 24, 400)), 5)
+
+        self.assertEqual(paginate_rows([10, 10, 10, 25, 10], 30), [(0, 3), (3, 4), (4, 5)])
+        self.assertEqual(paginate_rows([], 30), [(0, 0)])
+
+    def test_long_table_split_across_slides_with_header(self):
+        """
+        测试长表格按行拆分到多张幻灯片，每页重复表头且不丢行
+        """
+        from pptx import Presentation
+        rows = [['ID', 'Name']] + [[str(i), f'Item {i}'] for i in range(100)]
+        output_path = os.path.join(self.temp_dir, "table.pptx")
+        self.generator.generate([{'type': 'table', 'content': rows, 'title': '表格1'}], output_path)
+
+        prs = Presentation(output_path)
+        slides = list(prs.slides)
+        self.assertGreater(len(slides), 1)
+        body = []
+        for index, slide in enumerate(slides):
+            self.assertEqual(slide.shapes.title.text, f'表格1（{index + 1}/{len(slides)}）')
+            frame = next(shape for shape in slide.shapes if shape.has_table)
+            self.assertLessEqual(frame.left + frame.width, prs.slide_width)
+            self.assertLessEqual(frame.top + frame.height, prs.slide_height)
+            table = frame.table
+            self.assertEqual([cell.text for cell in table.rows[0].cells], ['ID', 'Name'])
+            body.extend([cell.text for cell in row.cells] for row in list(table.rows)[1:])
+        self.assertEqual(body, rows[1:])
+    
+    def test_long_paragraph_split_across_slides(self):
+        """
+        测试摘要后仍超出文本框行容量的段落拆分到续页，每页都放得下且不丢字
+        """
+        from pptx import Presentation
+        from slide_paginator import LINE_SPACING
+        text = ''.join(f'第{i}条测试内容说明文档转换的分页效果。' for i in range(60))
+        output_path = os.path.join(self.temp_dir, "paragraph.pptx")
+        self.generator.generate([{'type': 'paragraph', 'content': text, 'title': '段落'}], output_path)
+
+        summary = self.analyzer.summarize_text(text, max_length=500)
+        slides = list(Presentation(output_path).slides)
+        self.assertGreater(len(slides), 1)
+        pages = []
+        for index, slide in enumerate(slides):
+            self.assertEqual(slide.shapes.title.text, f'段落（{index + 1}/{len(slides)}）')
+            placeholder = slide.placeholders[1]
+            width, height = self.generator._text_area(placeholder, self.generator.text_font_size)
+            page = placeholder.text_frame.text.strip()
+            font_size = self.generator.text_font_size.pt
+            self.assertLessEqual(len(wrap_text(page, font_size, width)) * font_size * LINE_SPACING, height)
+            pages.append(page)
+        self.assertEqual(''.join(pages), summary)
+
     @patch('presentation_generator.Presentation')
     def test_presentation_generation_mock(self, mock_presentation):
         """
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文本摘要模块
+离线的抽取式摘要：对整个文档的所有段落一次性计算 TF-IDF，
+为每个段落挑选得分最高的句子，结果按文本哈希缓存
+"""
+
+import re
+import hashlib
+from collections import Counter
+from typing import Dict, List, Iterable, Tuple
+
+import numpy as np
+
+# 中文句末标点后直接分句；英文句末标点后需要有空白（避免拆开 3.14、e.g. 等）
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[。！？])\s*|(?<=[.!?])\s+')
+# 中文按单字计词，其他文字按连续的字母数字计词
+TOKEN_PATTERN = re.compile(r'[\u4e00-\u9fff]|[^\W_\u4e00-\u9fff]+')
+CJK_SENTENCE_END = ('。', '！', '？')
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    把文本切分为句子
+
+    Args:
+        text: 文本
+
+    Returns:
+        List[str]: 非空句子列表
+    """
+    return [sentence.strip() for sentence in SENTENCE_SPLIT_PATTERN.split(text) if sentence.strip()]
+
+
+def join_sentences(sentences: Iterable[str]) -> str:
+    """
+    连接句子：中文句子直接相连，其他句子之间加空格
+    """
+    result = ''
+    for sentence in sentences:
+        if result and not result.endswith(CJK_SENTENCE_END):
+            result += ' '
+        result += sentence
+    return result
+
+
+class ExtractiveSummarizer:
+    """
+    抽取式摘要器
+
+    fit() 对文档的全部段落做一次向量化评分：词频取词在所在段落中出现次数的对数（1 + ln tf），
+    逆文档频率以整个文档的句子为单位计算（在很多句子中重复的套话得分低），
+    句子得分为其各词 TF-IDF 的平均值。分词、建词表和评分都只遍历一次全部词，
+    耗时与文档长度成线性关系。
+    """
+
+    def __init__(self):
+        self._sentences: Dict[str, Tuple[List[str], np.ndarray]] = {}  # 文本哈希 -> (句子, 得分)
+        self._summaries: Dict[Tuple[str, int], str] = {}  # (文本哈希, 最大长度) -> 摘要
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def fit(self, texts: Iterable[str]):
+        """
+        为一个文档的全部段落计算句子得分，替换之前文档的结果
+
+        Args:
+            texts: 文档中所有需要摘要的段落文本
+        """
+        self._sentences.clear()
+        self._summaries.clear()
+        self._score(texts)
+
+    def _score(self, texts: Iterable[str]):
+        """
+        对一组段落（相同文本只计一次）计算句子得分并缓存
+        """
+        blocks = {}
+        for text in texts:
+            blocks.setdefault(self.text_hash(text), text)
+        if not blocks:
+            return
+
+        vocabulary = {}
+        token_terms = []      # 每个词的词表编号
+        token_sentences = []  # 每个词所在句子的全局编号
+        token_tf = []         # 每个词在所在段落中的出现次数
+        sentence_terms = []   # 每个句子的不同词（用于计算文档频率）
+        spans = []            # (文本哈希, 句子列表, 第一个句子的全局编号)
+        sentence_count = 0
+
+        for key, text in blocks.items():
+            sentences = split_sentences(text)
+            counts = Counter()
+            start = len(token_terms)
+            for index, sentence in enumerate(sentences, sentence_count):
+                ids = [vocabulary.setdefault(token, len(vocabulary))
+                       for token in TOKEN_PATTERN.findall(sentence.lower())]
+                counts.update(ids)
+                token_terms.extend(ids)
+                token_sentences.extend([index] * len(ids))
+                sentence_terms.extend(set(ids))
+            token_tf.extend(counts[term] for term in token_terms[start:])
+            spans.append((key, sentences, sentence_count))
+            sentence_count += len(sentences)
+
+        terms = np.asarray(token_terms, dtype=np.int64)
+        sentence_ids = np.asarray(token_sentences, dtype=np.int64)
+        document_frequency = np.bincount(np.asarray(sentence_terms, dtype=np.int64), minlength=len(vocabulary))
+        idf = np.log((1 + sentence_count) / (1 + document_frequency)) + 1
+
+        weights = (1 + np.log(np.asarray(token_tf, dtype=np.float64))) * idf[terms]
+        totals = np.bincount(sentence_ids, weights=weights, minlength=sentence_count)
+        lengths = np.bincount(sentence_ids, minlength=sentence_count)
+        scores = np.divide(totals, lengths, out=np.zeros(sentence_count), where=lengths > 0)
+
+        for key, sentences, first in spans:
+            self._sentences[key] = (sentences, scores[first:first + len(sentences)])
+
+    def summarize(self, text: str, max_length: int = 200) -> str:
+        """
+        生成不超过 max_length 个字符的摘要
+
+        按得分从高到低选取能放下的句子，再按原文顺序连接；
+        没有通过 fit() 评分的文本单独评分。
+
+        Args:
+            text: 原始文本
+            max_length: 最大长度
+
+        Returns:
+            str: 摘要后的文本
+        """
+        if len(text) <= max_length:
+            return text
+
+        key = self.text_hash(text)
+        summary = self._summaries.get((key, max_length))
+        if summary is not None:
+            return summary
+
+        if key not in self._sentences:
+            self._score([text])
+        sentences, scores = self._sentences[key]
+
+        budget = max_length - 3  # 为省略号留出位置
+        chosen = []
+        used = 0
+        for index in np.argsort(-scores, kind='stable'):
+            length = len(sentences[index]) + (1 if chosen else 0)  # 句间可能的空格
+            if used + length <= budget:
+                chosen.append(index)
+                used += length
+
+        summary = join_sentences(sentences[index] for index in sorted(chosen)) + '...'
+        if not chosen or len(summary) > max_length:
+            summary = text[:max_length - 3] + '...'  # 直接截断并添加省略号
+        self._summaries[(key, max_length)] = summary
+        return summary